@@ -8,6 +8,18 @@ from newsletter_agent import newsletter_agent
 from agency_swarm.tools.send_message import SendMessageHandoff
 from builder_tom_agent import builder_tom_agent
 from script_writer_agent import script_writer_agent
+from common.tracing import setup_tracing
+from common.scheduler import start_prefetch
+from common.transcripts import prefetch_watchlist_transcripts
+from title_generation_agent.frameworks_index import prefetch as prefetch_frameworks
+from script_writer_agent.style_profile import CHECK_INTERVAL_SECONDS, prefetch as prefetch_style_profile
+
+# Keep the research caches warm so the first turn of a session does not wait on cold upstream calls
+PREFETCH_JOBS = {
+    "title_frameworks": prefetch_frameworks,
+    "style_profile": (prefetch_style_profile, CHECK_INTERVAL_SECONDS),
+    "watchlist_transcripts": prefetch_watchlist_transcripts,
+}
 
 # do not remove this method, it is used in the main.py file to deploy the agency (it has to be a method)
 def create_agency(load_threads_callback=None):
@@ -29,6 +41,10 @@ def create_agency(load_threads_callback=None):
     return agency
 
 if __name__ == "__main__":
+    # Per-request latency, token and cost breakdown (plus OTLP export when configured)
+    setup_tracing()
+    start_prefetch(PREFETCH_JOBS)
+
     agency = create_agency()
 
     # test 1 message
@@ -0,0 +1,5 @@
+"""
+Offline performance benchmarks: recorded API fixtures replayed through local stand-in servers.
+
+Run with: python -m benchmarks.run
+"""
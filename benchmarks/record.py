@@ -0,0 +1,124 @@
+# record.py
+"""
+Record fresh fixtures from the live APIs into benchmarks/fixtures.
+
+Uses the same API keys as the agency (.env). Each response is saved under the path
+the stand-in server replays it from, so re-recording never requires code changes.
+
+Usage (from the repository root):
+    python -m benchmarks.record --video-id VIDEO_ID [--query "AI agents"] [--notion] [--readwise]
+
+Recording costs ~104 YouTube quota units (one search plus four list calls).
+Review recorded Notion and Readwise data before committing it.
+"""
+import argparse
+import json
+import os
+import sys
+import urllib.request
+
+from dotenv import load_dotenv
+
+from benchmarks.standin import FIXTURES_DIR
+
+load_dotenv()
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def save(relative_path, payload):
+    path = os.path.join(FIXTURES_DIR, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=1, ensure_ascii=False)
+        f.write("\n")
+    print(f"✅ {relative_path}")
+
+
+def record_youtube(video_id, query, language):
+    from googleapiclient.discovery import build
+    from youtube_transcript_api import YouTubeTranscriptApi
+
+    youtube = build("youtube", "v3", developerKey=os.environ["YOUTUBE_API_KEY"])
+
+    search = youtube.search().list(part="snippet", q=query, type="video", maxResults=5).execute()
+    save("youtube/search.json", search)
+
+    video_ids = [video_id] + [item["id"]["videoId"] for item in search.get("items", []) if item["id"].get("videoId")]
+    videos = youtube.videos().list(part="snippet,contentDetails,statistics", id=",".join(dict.fromkeys(video_ids))).execute()
+    save("youtube/videos.json", videos)
+
+    channel_id = videos["items"][0]["snippet"]["channelId"]
+    save("youtube/channels.json", youtube.channels().list(part="snippet,statistics", id=channel_id).execute())
+    save("youtube/commentThreads.json",
+         youtube.commentThreads().list(part="snippet", videoId=video_id, maxResults=20, order="relevance").execute())
+
+    transcript = YouTubeTranscriptApi().fetch(video_id, languages=[language])
+    save(f"transcripts/{video_id}.{transcript.language_code}.json", {
+        "video_id": video_id,
+        "language_code": transcript.language_code,
+        "is_generated": transcript.is_generated,
+        "snippets": [{"text": s.text, "start": s.start, "duration": s.duration} for s in transcript.snippets],
+    })
+
+
+def record_notion():
+    sys.path.insert(0, REPO_ROOT)
+    from script_writer_agent import style_profile
+    from title_generation_agent import frameworks_index
+
+    notion = frameworks_index.get_notion_client()
+    if not notion:
+        print("⚠️  NOTION_API_KEY not set, skipping Notion")
+        return
+
+    for database_id in (frameworks_index.DATABASE_ID, style_profile.DATABASE_ID):
+        database = notion.databases.retrieve(database_id)
+        save(f"notion/databases/{database_id}.json", database)
+
+        # Replay serves a single page of results, so record everything as one page
+        data_source_id = database["data_sources"][0]["id"]
+        results, cursor = [], None
+        while True:
+            params = {"page_size": 100, **({"start_cursor": cursor} if cursor else {})}
+            response = notion.data_sources.query(data_source_id, **params)
+            results.extend(response.get("results", []))
+            if not response.get("has_more"):
+                break
+            cursor = response.get("next_cursor")
+        save(f"notion/data_sources/{data_source_id}/query.json", dict(response, results=results, has_more=False, next_cursor=None))
+
+    for page in style_profile.list_script_pages(notion):
+        blocks = style_profile.fetch_page_blocks(notion, page["id"])
+        save(f"notion/blocks/{page['id']}/children.json",
+             {"object": "list", "results": blocks, "next_cursor": None, "has_more": False, "type": "block"})
+
+
+def record_readwise():
+    token = os.getenv("READWISE_TOKEN")
+    if not token:
+        print("⚠️  READWISE_TOKEN not set, skipping Readwise")
+        return
+
+    for endpoint, fixture in (("list/?location=feed", "readwise/list.json"), ("tags/", "readwise/tags.json")):
+        request = urllib.request.Request(f"https://readwise.io/api/v3/{endpoint}", headers={"Authorization": f"Token {token}"})
+        with urllib.request.urlopen(request, timeout=30) as response:
+            payload = json.load(response)
+        save(fixture, dict(payload, nextPageCursor=None))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record benchmark fixtures from the live APIs")
+    parser.add_argument("--video-id", required=True, help="Video used for details, comments and transcript")
+    parser.add_argument("--query", default="AI agents", help="Search query to record")
+    parser.add_argument("--language", default="en", help="Transcript language")
+    parser.add_argument("--notion", action="store_true", help="Also record the Notion databases")
+    parser.add_argument("--readwise", action="store_true", help="Also record Readwise Reader")
+    args = parser.parse_args()
+
+    record_youtube(args.video_id, args.query, args.language)
+    if args.notion:
+        record_notion()
+    if args.readwise:
+        record_readwise()
+    print("\nUpdate VIDEO_ID / CHANNEL_ID in benchmarks/scenarios.py if you recorded a different video.")
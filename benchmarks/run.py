@@ -0,0 +1,330 @@
+# run.py
+"""
+Offline benchmark runner.
+
+Starts the stand-in APIs, points the YouTube toolbox, the Notion-backed agency tools
+and the Readwise MCP server at them, then runs every tool and scenario and reports
+p50/p95 latency, API calls and YouTube quota units per run.
+
+Usage (from the repository root):
+    python -m benchmarks.run
+    python -m benchmarks.run --iterations 50 --latency-ms 120 --jitter-ms 40
+    python -m benchmarks.run --rate-limit 5 --quota 500        # throttling / quota exhaustion
+    python -m benchmarks.run --json bench.json                 # save results
+    python -m benchmarks.run --baseline bench.json             # exit 1 on regression
+
+Targets whose dependencies are missing (e.g. agency_swarm, or an unbuilt
+readwise-reader-mcp) are reported as skipped.
+"""
+import argparse
+import asyncio
+import contextlib
+import glob
+import importlib.util
+import inspect
+import io
+import json
+import logging
+import math
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import AsyncExitStack
+
+from benchmarks.scenarios import SCENARIOS, TOOLS
+from benchmarks.standin import Behaviour, ReplayTranscriptApi, StandIn
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOOLBOX_DIR = os.path.join(REPO_ROOT, "py-mcp-youtube-toolbox")
+READWISE_SERVER = os.path.join(REPO_ROOT, "readwise-reader-mcp", "dist", "index.js")
+
+
+class Targets:
+    """
+    The code under test, loaded against the stand-in servers.
+    """
+
+    def __init__(self, standin):
+        self.standin = standin
+        self.toolbox = None
+        self.agency = {}
+        self.readwise_session = None
+        self.skipped = {}
+        self._stack = AsyncExitStack()
+
+    async def load(self):
+        for name, loader in (("toolbox", self._load_toolbox), ("agency", self._load_agency),
+                             ("readwise", self._load_readwise)):
+            try:
+                await loader()
+            except Exception as e:
+                self.skipped[name] = f"{type(e).__name__}: {e}"
+
+    async def close(self):
+        await self._stack.aclose()
+
+    async def _load_toolbox(self):
+        sys.path.insert(0, TOOLBOX_DIR)
+        import server
+
+        server.youtube_service.transcript_api = ReplayTranscriptApi(self.standin)
+        self.toolbox = server
+
+    async def _load_agency(self):
+        sys.path.insert(0, REPO_ROOT)
+        from script_writer_agent.tools.NotionScriptExamplesTool import NotionScriptExamplesTool
+        from title_generation_agent.tools.NotionTitleFrameworksTool import NotionTitleFrameworksTool
+
+        # Loaded by path: importing the yt_content_strategy_agent package would start its MCP server setup
+        spec = importlib.util.spec_from_file_location("YouTubeTranscriptTool", os.path.join(
+            REPO_ROOT, "yt_content_strategy_agent", "tools", "YouTubeTranscriptTool.py"))
+        transcript_tool_module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(transcript_tool_module)
+
+        # The tool builds its own YouTubeTranscriptApi inside run()
+        transcript_tool_module.YouTubeTranscriptApi = lambda **kwargs: ReplayTranscriptApi(self.standin)
+        self.agency = {
+            "YouTubeTranscriptTool": transcript_tool_module.YouTubeTranscriptTool,
+            "NotionTitleFrameworksTool": NotionTitleFrameworksTool,
+            "NotionScriptExamplesTool": NotionScriptExamplesTool,
+        }
+
+    async def _load_readwise(self):
+        if not os.path.exists(READWISE_SERVER):
+            raise FileNotFoundError(f"{READWISE_SERVER} (run `npm run build` in readwise-reader-mcp)")
+        if not shutil.which("node"):
+            raise FileNotFoundError("node is not installed")
+
+        from mcp import ClientSession, StdioServerParameters
+        from mcp.client.stdio import stdio_client
+
+        params = StdioServerParameters(command="node", args=[READWISE_SERVER], env={
+            "PATH": os.environ.get("PATH", ""),
+            "READWISE_TOKEN": "benchmark",
+            "READWISE_BASE_URL": self.standin.url,
+        })
+        read, write = await self._stack.enter_async_context(stdio_client(params))
+        self.readwise_session = await self._stack.enter_async_context(ClientSession(read, write))
+        await self.readwise_session.initialize()
+
+    def readwise(self, tool_name, arguments):
+        return self.readwise_session.call_tool(tool_name, arguments)
+
+    def available(self, target):
+        return target not in self.skipped
+
+    def reset_guards(self):
+        """
+        Reset rate limiters, circuit breakers and API key quotas so throttling in one benchmark does not leak into the next.
+        """
+        from common import resilience
+        resilience.reset()
+        if self.toolbox:
+            sys.modules["resilience"].reset()
+            self.toolbox.youtube_service.key_pool.reset()
+
+    def reset_caches(self):
+        """
+        Drop every in-process and on-disk cache so the next call runs cold.
+        """
+        if self.toolbox:
+            self.toolbox.youtube_service._transcript_cache.clear()
+            self.toolbox.youtube_service._response_cache.clear()
+        from common import CACHE_DIR
+        for path in glob.glob(os.path.join(CACHE_DIR, "*.json")):
+            os.remove(path)
+
+
+def is_error(result):
+    if isinstance(result, dict):
+        return "error" in result
+    if isinstance(result, str):
+        return result.lstrip().startswith(("❌", "Error"))
+    return bool(getattr(result, "isError", False))
+
+
+def percentile(values, q):
+    """
+    Nearest-rank percentile.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class Result:
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []
+        self.api_calls = []
+        self.quota_units = []
+        self.errors = 0
+        self.throttled = 0
+
+    def summary(self):
+        runs = len(self.latencies)
+        return {
+            "runs": runs,
+            "p50_ms": round(percentile(self.latencies, 50), 2),
+            "p95_ms": round(percentile(self.latencies, 95), 2),
+            "mean_ms": round(statistics.fmean(self.latencies), 2) if runs else 0.0,
+            "api_calls": round(statistics.fmean(self.api_calls), 2) if runs else 0.0,
+            "quota_units": round(statistics.fmean(self.quota_units), 2) if runs else 0.0,
+            "errors": self.errors,
+            "throttled": self.throttled,
+        }
+
+
+async def run_step(step, targets):
+    """
+    Run one step and return (elapsed ms, stand-in calls it made, error flag).
+    """
+    calls_before = len(targets.standin.calls)
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = step.call(targets)
+            if inspect.isawaitable(result):
+                result = await result
+        error = is_error(result)
+    except Exception:
+        error = True
+    elapsed = (time.perf_counter() - start) * 1000
+    return elapsed, targets.standin.calls[calls_before:], error
+
+
+async def measure(name, steps, targets, args):
+    result = Result(name)
+    for iteration in range(args.warmup + args.iterations):
+        if args.cold:
+            targets.reset_caches()
+
+        elapsed, calls, error = 0.0, [], False
+        for step in steps:
+            step_elapsed, step_calls, step_error = await run_step(step, targets)
+            elapsed += step_elapsed
+            calls += step_calls
+            error = error or step_error
+
+        if iteration < args.warmup:
+            continue
+        result.latencies.append(elapsed)
+        result.api_calls.append(len(calls))
+        result.quota_units.append(sum(call.units for call in calls))
+        result.errors += int(error)
+        result.throttled += sum(1 for call in calls if call.status in (403, 429))
+    return result
+
+
+def print_table(title, summaries):
+    print(f"\n{title}")
+    header = f"{'name':<42} {'runs':>5} {'p50 ms':>9} {'p95 ms':>9} {'calls':>7} {'quota':>7} {'errors':>7} {'429/403':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, s in summaries.items():
+        print(f"{name:<42} {s['runs']:>5} {s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} {s['api_calls']:>7.1f} "
+              f"{s['quota_units']:>7.1f} {s['errors']:>7} {s['throttled']:>8}")
+
+
+def compare(results, baseline, tolerance):
+    """
+    Return regressions against a saved baseline: slower p95 beyond the tolerance,
+    or more API calls / quota per run.
+    """
+    regressions = []
+    for section in ("tools", "scenarios"):
+        for name, current in results.get(section, {}).items():
+            previous = baseline.get(section, {}).get(name)
+            if not previous:
+                continue
+            if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance) and current["p95_ms"] - previous["p95_ms"] > 1:
+                regressions.append(f"{name}: p95 {previous['p95_ms']:.1f} -> {current['p95_ms']:.1f} ms")
+            for metric in ("api_calls", "quota_units"):
+                if current[metric] > previous[metric]:
+                    regressions.append(f"{name}: {metric} {previous[metric]} -> {current[metric]}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks against recorded API fixtures")
+    parser.add_argument("--iterations", type=int, default=20, help="Measured runs per tool / scenario")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured runs before measuring")
+    parser.add_argument("--cold", action="store_true", help="Clear all caches before every run")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Injected latency per API request")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="Uniform jitter around the latency")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests/second per service before 429 (0 = off)")
+    parser.add_argument("--quota", type=int, default=0, help="YouTube quota units before 403 quotaExceeded (0 = off)")
+    parser.add_argument("--only", choices=["tools", "scenarios"], help="Run only tools or only scenarios")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against a previous --json file and exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative p95 slowdown vs the baseline")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None):
+    args = parse_args(argv)
+    # Keep the report readable; the code under test logs every call, and failures are counted in the report
+    logging.disable(logging.ERROR)
+    behaviour = Behaviour(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                          rate_limit=args.rate_limit, quota=args.quota)
+
+    with StandIn(behaviour) as standin, tempfile.TemporaryDirectory(prefix="agency-bench-") as cache_dir:
+        # Must be set before the code under test is imported; load_dotenv() never overrides them
+        os.environ.update({
+            "YOUTUBE_API_KEY": "benchmark",
+            "YOUTUBE_API_BASE_URL": f"{standin.url}/",
+            "NOTION_API_KEY": "benchmark",
+            "NOTION_BASE_URL": standin.url,
+            "AGENCY_CACHE_DIR": cache_dir,
+            "YOUTUBE_DATASET_DIR": os.path.join(cache_dir, "dataset"),
+        })
+
+        targets = Targets(standin)
+        await targets.load()
+        for target, reason in targets.skipped.items():
+            print(f"⚠️  Skipping {target} benchmarks: {reason}")
+
+        results = {"config": vars(args), "tools": {}, "scenarios": {}}
+        try:
+            if args.only != "scenarios":
+                for step in TOOLS:
+                    if args.filter in step.name and targets.available(step.target):
+                        standin.reset()
+                        targets.reset_guards()
+                        results["tools"][step.name] = (await measure(step.name, [step], targets, args)).summary()
+                print_table("Tools (per call)", results["tools"])
+
+            if args.only != "tools":
+                for name, steps in SCENARIOS.items():
+                    if args.filter in name and all(targets.available(step.target) for step in steps):
+                        standin.reset()
+                        targets.reset_guards()
+                        results["scenarios"][name] = (await measure(name, steps, targets, args)).summary()
+                print_table("Scenarios (end to end)", results["scenarios"])
+        finally:
+            await targets.close()
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results written to {args.json_path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\n❌ Regressions against baseline:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\n✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
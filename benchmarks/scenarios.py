@@ -0,0 +1,94 @@
+# scenarios.py
+"""
+What the benchmark runs.
+
+TOOLS are single tool calls. SCENARIOS are scripted tool sequences that mirror how the
+agency works through a typical request (the LLM turns themselves are not replayed,
+only the tool traffic they generate). Every step receives the loaded Targets and
+returns the tool result, or an awaitable for the async MCP tools.
+"""
+from dataclasses import dataclass
+from typing import Any, Callable
+
+# Ids present in benchmarks/fixtures
+VIDEO_ID = "bm1AgntMCP0"
+SECOND_VIDEO_ID = "bm2RagEval0"
+CHANNEL_ID = "UCbenchAgencyChannel0001"
+TOPIC = "deploying AI agents to the cloud"
+
+
+@dataclass
+class Step:
+    name: str
+    # Which target the step needs: "toolbox", "agency" or "readwise"
+    target: str
+    call: Callable[[Any], Any]
+
+
+TOOLS = [
+    Step("toolbox.search_videos", "toolbox",
+         lambda t: t.toolbox.search_videos(query="AI agents", max_results=5)),
+    Step("toolbox.get_video_details", "toolbox",
+         lambda t: t.toolbox.get_video_details(video_id=VIDEO_ID)),
+    Step("toolbox.get_channel_details", "toolbox",
+         lambda t: t.toolbox.get_channel_details(channel_id=CHANNEL_ID)),
+    Step("toolbox.get_video_comments", "toolbox",
+         lambda t: t.toolbox.get_video_comments(video_id=VIDEO_ID, max_results=20)),
+    Step("toolbox.get_related_videos", "toolbox",
+         lambda t: t.toolbox.get_related_videos(video_id=VIDEO_ID, max_results=5)),
+    Step("toolbox.get_trending_videos", "toolbox",
+         lambda t: t.toolbox.get_trending_videos(region_code="US", max_results=5)),
+    Step("toolbox.get_video_transcript", "toolbox",
+         lambda t: t.toolbox.get_video_transcript(video_id=VIDEO_ID, language="en")),
+    Step("toolbox.get_video_enhanced_transcript", "toolbox",
+         lambda t: t.toolbox.get_video_enhanced_transcript(
+             video_ids=[VIDEO_ID, SECOND_VIDEO_ID], language="en", segment_method="smart", segment_count=3)),
+    Step("toolbox.get_video_chapters", "toolbox",
+         lambda t: t.toolbox.get_video_chapters(video_id=VIDEO_ID, language="en", query="token costs")),
+    Step("agency.YouTubeTranscriptTool", "agency",
+         lambda t: t.agency["YouTubeTranscriptTool"](video_url=VIDEO_ID, include_timestamps=True).run()),
+    Step("agency.NotionTitleFrameworksTool", "agency",
+         lambda t: t.agency["NotionTitleFrameworksTool"](query=TOPIC, top_k=10).run()),
+    Step("agency.NotionScriptExamplesTool", "agency",
+         lambda t: t.agency["NotionScriptExamplesTool"](topic=TOPIC).run()),
+    Step("readwise.readwise_list_documents", "readwise",
+         lambda t: t.readwise("readwise_list_documents", {"location": "feed", "withFullContent": False})),
+    Step("readwise.readwise_list_tags", "readwise",
+         lambda t: t.readwise("readwise_list_tags", {})),
+]
+
+_TOOLS_BY_NAME = {step.name: step for step in TOOLS}
+
+
+def _steps(*names):
+    return [_TOOLS_BY_NAME[name] for name in names]
+
+
+SCENARIOS = {
+    # "Analyze competitor performance this week"
+    "competitor_research": _steps(
+        "toolbox.search_videos",
+        "toolbox.get_video_details",
+        "toolbox.get_channel_details",
+        "toolbox.get_video_comments",
+        "toolbox.get_video_chapters",
+    ),
+    # "Generate titles for a video about [topic]"
+    "title_ideation": _steps(
+        "toolbox.search_videos",
+        "toolbox.get_video_details",
+        "agency.NotionTitleFrameworksTool",
+    ),
+    # "Write a script based on video [URL]"
+    "script_drafting": _steps(
+        "agency.YouTubeTranscriptTool",
+        "toolbox.get_video_chapters",
+        "agency.NotionScriptExamplesTool",
+    ),
+    # "Generate video ideas based on the latest AI news"
+    "news_to_ideas": _steps(
+        "readwise.readwise_list_documents",
+        "toolbox.search_videos",
+        "toolbox.get_video_details",
+    ),
+}
@@ -0,0 +1,333 @@
+# standin.py
+"""
+Local stand-in for the YouTube Data API, Notion and Readwise Reader.
+
+A threaded HTTP server replays the JSON fixtures in benchmarks/fixtures,
+laid out by request path:
+
+    /youtube/v3/<resource>            -> youtube/<resource>.json
+    /v1/<path>                        -> notion/<path>.json
+    /api/v3/<path>/                   -> readwise/<path>.json
+
+YouTube transcripts are scraped from youtube.com over TLS by youtube-transcript-api,
+so they cannot be pointed at a local server; ReplayTranscriptApi replays them in-process
+with the same latency and accounting instead.
+
+Every request is recorded (service, route, status, quota units) so the runner can
+attribute API calls and quota to each tool call. Latency, rate limiting (429 with
+Retry-After) and YouTube quota exhaustion (403 quotaExceeded) are injectable.
+"""
+import json
+import math
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# YouTube Data API quota cost per list call (https://developers.google.com/youtube/v3/determine_quota_cost)
+YOUTUBE_QUOTA_COSTS = {
+    "search": 100,
+    "videos": 1,
+    "channels": 1,
+    "commentThreads": 1,
+    "playlistItems": 1,
+}
+
+
+@dataclass
+class Behaviour:
+    """
+    Injected service behaviour.
+    """
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    # Requests per second per service before answering 429 (0 disables)
+    rate_limit: float = 0.0
+    # YouTube quota units available before answering 403 quotaExceeded (0 disables)
+    quota: int = 0
+
+
+@dataclass
+class Call:
+    service: str
+    route: str
+    status: int
+    units: int = 0
+    at: float = field(default_factory=time.perf_counter)
+
+
+class StandIn:
+    """
+    Fixture-replaying HTTP server plus request accounting.
+    """
+
+    def __init__(self, behaviour=None, fixtures_dir=FIXTURES_DIR, host="127.0.0.1", port=0):
+        self.behaviour = behaviour or Behaviour()
+        self.fixtures_dir = fixtures_dir
+        self.calls = []
+        self.quota_used = 0
+        self._lock = threading.Lock()
+        self._windows = {}
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset(self):
+        """
+        Forget recorded calls, rate-limit windows and used quota.
+        """
+        with self._lock:
+            self.calls.clear()
+            self._windows.clear()
+            self.quota_used = 0
+
+    # ------------------------------------------------------------------
+    # Behaviour
+    # ------------------------------------------------------------------
+
+    def delay(self):
+        """
+        Sleep for the configured latency plus uniform jitter.
+        """
+        latency = self.behaviour.latency_ms + random.uniform(-1, 1) * self.behaviour.jitter_ms
+        if latency > 0:
+            time.sleep(latency / 1000)
+
+    def admit(self, service, units=0):
+        """
+        Apply rate limiting and quota. Returns None if the request is admitted,
+        or a (status, headers, body) error response.
+        """
+        with self._lock:
+            limit = self.behaviour.rate_limit
+            if limit > 0:
+                now = time.monotonic()
+                window = [t for t in self._windows.get(service, []) if now - t < 1.0]
+                if len(window) >= limit:
+                    self._windows[service] = window
+                    retry_after = max(1, math.ceil(1.0 - (now - window[0])))
+                    return 429, {"Retry-After": str(retry_after)}, _error_body(service, 429, "rateLimitExceeded")
+                window.append(now)
+                self._windows[service] = window
+
+            if units and self.behaviour.quota and self.quota_used + units > self.behaviour.quota:
+                return 403, {}, _error_body(service, 403, "quotaExceeded")
+            self.quota_used += units
+        return None
+
+    def record(self, service, route, status, units=0):
+        with self._lock:
+            self.calls.append(Call(service, route, status, units if status < 400 else 0))
+
+    # ------------------------------------------------------------------
+    # Fixtures
+    # ------------------------------------------------------------------
+
+    def resolve(self, path, query):
+        """
+        Map a request path onto (service, route, fixture file, quota units).
+        """
+        parts = [p for p in path.split("/") if p]
+        if parts[:2] == ["youtube", "v3"] and len(parts) == 3:
+            resource = parts[2]
+            return "youtube", f"{resource}.list", f"youtube/{resource}.json", YOUTUBE_QUOTA_COSTS.get(resource, 1)
+        if parts[:1] == ["v1"]:
+            return "notion", "/".join(parts[1:2]), "notion/" + "/".join(parts[1:]) + ".json", 0
+        if parts[:2] == ["api", "v3"]:
+            return "readwise", "/".join(parts[2:]), "readwise/" + "/".join(parts[2:]) + ".json", 0
+        if parts[:2] == ["api", "v2"]:
+            return "readwise", "/".join(parts[2:]), None, 0
+        return None, path, None, 0
+
+    def load_fixture(self, relative_path, query):
+        with open(os.path.join(self.fixtures_dir, relative_path), encoding="utf-8") as f:
+            payload = json.load(f)
+
+        # YouTube list calls select by id and cap by maxResults, like the real API
+        if relative_path.startswith("youtube/") and isinstance(payload.get("items"), list):
+            ids = set(",".join(query.get("id", [])).split(",")) - {""}
+            items = payload["items"]
+            if ids:
+                items = [item for item in items if item.get("id") in ids]
+            if query.get("maxResults"):
+                items = items[:int(query["maxResults"][0])]
+            payload = dict(payload, items=items)
+        return payload
+
+    # ------------------------------------------------------------------
+    # Transcripts
+    # ------------------------------------------------------------------
+
+    def transcript(self, video_id, languages=None):
+        """
+        Replay a recorded transcript (fixtures/transcripts/<video_id>.<language>.json).
+        """
+        self.delay()
+        rejected = self.admit("transcript")
+        if rejected:
+            self.record("transcript", "timedtext", rejected[0])
+            raise RuntimeError(f"Too many requests (HTTP {rejected[0]})")
+
+        for language in list(languages or []) + ["en"]:
+            path = os.path.join(self.fixtures_dir, "transcripts", f"{video_id}.{language}.json")
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    self.record("transcript", "timedtext", 200)
+                    return FetchedTranscript(json.load(f))
+
+        self.record("transcript", "timedtext", 404)
+        raise LookupError(f"No recorded transcript for video {video_id}")
+
+
+class FetchedTranscript:
+    """
+    Minimal FetchedTranscript look-alike: iterable snippets with attribute access.
+    """
+
+    def __init__(self, recorded):
+        self.video_id = recorded.get("video_id")
+        self.language_code = recorded.get("language_code")
+        self.is_generated = recorded.get("is_generated", False)
+        self.snippets = [SimpleNamespace(**snippet) for snippet in recorded.get("snippets", [])]
+
+    def __iter__(self):
+        return iter(self.snippets)
+
+    def __len__(self):
+        return len(self.snippets)
+
+    def fetch(self):
+        return self
+
+
+class ReplayTranscriptApi:
+    """
+    Drop-in for YouTubeTranscriptApi (fetch / list) that replays fixtures through a StandIn.
+    """
+
+    def __init__(self, standin):
+        self.standin = standin
+
+    def fetch(self, video_id, languages=("en",), **kwargs):
+        return self.standin.transcript(video_id, languages)
+
+    def list(self, video_id):
+        api = self
+
+        class _TranscriptList:
+            def find_transcript(self, languages):
+                return api.standin.transcript(video_id, languages)
+
+            find_generated_transcript = find_transcript
+            find_manually_created_transcript = find_transcript
+
+        return _TranscriptList()
+
+
+def _error_body(service, status, reason):
+    if service == "youtube":
+        return {"error": {"code": status, "message": reason, "errors": [{"reason": reason, "domain": "youtube.quota"}]}}
+    if service == "notion":
+        return {"object": "error", "status": status, "code": "rate_limited", "message": reason}
+    return {"detail": reason}
+
+
+def _make_handler(standin):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately; without this Nagle + delayed ACK add ~40 ms per request
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def _respond(self, status, payload=None, headers=None):
+            body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=UTF-8")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _handle(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                self.rfile.read(length)
+
+            parsed = urlparse(self.path)
+            query = parse_qs(parsed.query)
+            service, route, fixture, units = standin.resolve(parsed.path, query)
+
+            standin.delay()
+            if service is None:
+                standin.record("unknown", route, 404)
+                return self._respond(404, {"error": f"No stand-in route for {parsed.path}"})
+
+            rejected = standin.admit(service, units)
+            if rejected:
+                status, headers, payload = rejected
+                standin.record(service, route, status)
+                return self._respond(status, payload, headers)
+
+            if fixture is None:
+                standin.record(service, route, 204)
+                return self._respond(204)
+
+            try:
+                payload = standin.load_fixture(fixture, query)
+            except FileNotFoundError:
+                standin.record(service, route, 404)
+                return self._respond(404, {"error": f"No fixture {fixture}"})
+
+            standin.record(service, route, 200, units)
+            self._respond(200, payload)
+
+        do_GET = _handle
+        do_POST = _handle
+        do_PATCH = _handle
+        do_DELETE = _handle
+
+    return Handler
+
+
+if __name__ == "__main__":
+    # Serve the fixtures for manual testing: python -m benchmarks.standin [port]
+    import sys
+
+    standin = StandIn(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8765)
+    print(f"Stand-in APIs at {standin.url} (Ctrl+C to stop)")
+    print(f"  YOUTUBE_API_BASE_URL={standin.url}/")
+    print(f"  NOTION_BASE_URL={standin.url}")
+    print(f"  READWISE_BASE_URL={standin.url}")
+    try:
+        standin._server.serve_forever()
+    except KeyboardInterrupt:
+        standin.stop()
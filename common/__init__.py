@@ -0,0 +1,4 @@
+from .cache import load_json, save_json, CACHE_DIR
+from .text_index import tokenize, BM25Index
+
+__all__ = ["load_json", "save_json", "CACHE_DIR", "tokenize", "BM25Index"]
@@ -0,0 +1,53 @@
+# cache.py
+import json
+import os
+import tempfile
+
+# Local cache directory shared by all agents (override with AGENCY_CACHE_DIR)
+CACHE_DIR = os.getenv(
+    "AGENCY_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache"),
+)
+
+# The YouTube toolbox's local dataset (see py-mcp-youtube-toolbox/dataset.py); the agency reads
+# its tables and shares its watchlist feed state
+YOUTUBE_DATASET_DIR = os.getenv(
+    "YOUTUBE_DATASET_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "py-mcp-youtube-toolbox", "data"),
+)
+
+
+def cache_path(name):
+    """
+    Return the absolute path of a cache file, creating the cache directory if needed.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, name)
+
+
+def load_json(name, default=None):
+    """
+    Load a JSON cache file. Returns `default` if the file is missing or unreadable.
+    """
+    path = cache_path(name)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(name, data):
+    """
+    Atomically write a JSON cache file so concurrent readers never see a partial file.
+    """
+    path = cache_path(name)
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,34 @@
+# notion.py
+"""
+Notion API client for the agency's agents.
+"""
+import os
+
+from .resilience import guard
+
+
+def notion_client(auth, base_url=None):
+    """
+    Notion client whose requests all go through the "notion" guard.
+    """
+    from notion_client import Client
+
+    options = {"auth": auth, **({"base_url": base_url} if base_url else {})}
+    try:
+        # notion-client >= 2.5 retries on its own; let the guard do it once, consistently
+        client = Client(retry=False, **options)
+    except TypeError:
+        client = Client(**options)
+    client.request = guard("notion").wrap(client.request)
+    return client
+
+
+def get_notion_client():
+    """
+    Create a rate-limited, retrying Notion client from NOTION_API_KEY. Returns None if the key is missing.
+    NOTION_BASE_URL overrides the API root (e.g. the benchmark stand-in server).
+    """
+    notion_api_key = os.getenv("NOTION_API_KEY")
+    if not notion_api_key:
+        return None
+    return notion_client(notion_api_key, os.getenv("NOTION_BASE_URL"))
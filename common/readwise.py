@@ -0,0 +1,77 @@
+# readwise.py
+"""
+Readwise Reader document metadata for local processing (story merging).
+
+The newsletter agent reads Readwise through the readwise-reader-mcp server; this
+module lists the same later/email feed directly from the Reader API so Python
+tools can work on titles and summaries without a model in the loop. Listings are
+cached on disk for READWISE_LIST_TTL seconds.
+"""
+import os
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+from .cache import load_json, save_json
+from .resilience import guard
+
+# READWISE_BASE_URL overrides the API root (e.g. the benchmark stand-in server)
+READWISE_API_ROOT = (os.getenv("READWISE_BASE_URL") or "https://readwise.io").rstrip("/") + "/api/v3"
+
+READWISE_LIST_TTL = int(os.getenv("READWISE_LIST_TTL", "600"))
+
+# The newsletter digest feed (see the newsletter agent's instructions)
+DEFAULT_LOCATION = "later"
+DEFAULT_CATEGORY = "email"
+
+FIELDS = ("id", "url", "source_url", "title", "author", "site_name", "summary", "published_date", "updated_at")
+
+
+def _published_at(document):
+    """
+    published_date comes as an ISO date or epoch milliseconds.
+    """
+    value = document.get("published_date")
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000, timezone.utc).isoformat()
+    return value or document.get("updated_at")
+
+
+def list_documents(days=7, location=DEFAULT_LOCATION, category=DEFAULT_CATEGORY):
+    """
+    Metadata of the documents updated in the last `days` days (no content).
+
+    Returns:
+        list: dicts with FIELDS plus published_at; empty if READWISE_TOKEN is not set
+    """
+    token = os.getenv("READWISE_TOKEN")
+    if not token:
+        return []
+
+    cache_file = f"readwise-{location}-{category}-{days}d.json"
+    cached = load_json(cache_file)
+    if cached and time.time() - cached.get("fetched_at", 0) < READWISE_LIST_TTL:
+        return cached["documents"]
+
+    updated_after = datetime.fromtimestamp(time.time() - days * 86400, timezone.utc).isoformat()
+    params = {"location": location, "category": category, "updatedAfter": updated_after}
+    documents = []
+
+    def fetch(client, page_params):
+        response = client.get(f"{READWISE_API_ROOT}/list/", params=page_params)
+        response.raise_for_status()
+        return response.json()
+
+    with httpx.Client(headers={"Authorization": f"Token {token}"}, timeout=30) as client:
+        while True:
+            page = guard("readwise").call(fetch, client, params)
+            for document in page.get("results", []):
+                documents.append({**{field: document.get(field) for field in FIELDS},
+                                  "published_at": _published_at(document)})
+            if not page.get("nextPageCursor"):
+                break
+            params = {**params, "pageCursor": page["nextPageCursor"]}
+
+    save_json(cache_file, {"fetched_at": time.time(), "documents": documents})
+    return documents
@@ -0,0 +1,433 @@
+# resilience.py
+"""
+Client-side rate limiting, retries and circuit breaking for upstream APIs.
+
+Every upstream service (YouTube Data API, transcripts, Notion, Readwise, xAI) gets a Guard:
+
+- an adaptive token bucket that paces requests below the service's rate limit and
+  halves its rate whenever the service answers 429 (recovering slowly on success),
+- retries with jittered exponential backoff that honour Retry-After, and
+- a circuit breaker that fails fast after repeated failures, or until the daily quota
+  resets after a YouTube quotaExceeded, instead of letting every tool call hit a
+  failing API.
+
+Transient failures are absorbed here, below the agent, instead of surfacing as error
+strings that make the LLM re-call the tool at full turn cost.
+
+    from common.resilience import guard      # in the toolbox: from resilience import guard
+    response = guard("youtube").call(request.execute)
+
+Shared module: common/resilience.py is the source and py-mcp-youtube-toolbox/resilience.py
+an exact copy, since the toolbox deploys on its own. Edit the source and copy it over;
+tests/test_shared_modules.py fails while the two differ.
+"""
+import email.utils
+import logging
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying: rate limited, request timeout, server errors
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+# YouTube 403 reasons that are per-second/per-user throttling rather than the daily quota
+THROTTLE_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+QUOTA_REASONS = {"quotaExceeded", "dailyLimitExceeded"}
+
+# The YouTube Data API quota resets at midnight Pacific time
+try:
+    QUOTA_RESET_TZ = ZoneInfo("America/Los_Angeles")
+except ZoneInfoNotFoundError:
+    # No tz database (e.g. slim containers without tzdata); off by an hour during DST at worst
+    QUOTA_RESET_TZ = timezone(timedelta(hours=-8))
+
+
+@dataclass
+class Policy:
+    """
+    Per-service limits. Rates are requests per second; 0 disables the rate limiter.
+    """
+    rate: float = 5.0
+    burst: int = 5
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+    # Give up retrying once this much time has been spent on one call
+    deadline: float = 60.0
+    failure_threshold: int = 5
+    cooldown: float = 30.0
+
+
+def _env_float(name, default):
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+# Defaults follow each service's documented limits; override the rate with <SERVICE>_RATE_LIMIT
+POLICIES = {
+    "youtube": Policy(rate=_env_float("YOUTUBE_RATE_LIMIT", 10.0), burst=10),
+    "transcript": Policy(rate=_env_float("TRANSCRIPT_RATE_LIMIT", 2.0), burst=4, max_attempts=3),
+    "notion": Policy(rate=_env_float("NOTION_RATE_LIMIT", 3.0), burst=3),
+    # Reader API list endpoint: 20 requests per minute
+    "readwise": Policy(rate=_env_float("READWISE_RATE_LIMIT", 0.3), burst=3),
+    # Live Search calls take tens of seconds; allow fewer retries within a longer deadline
+    "xai": Policy(rate=_env_float("XAI_RATE_LIMIT", 1.0), burst=2, max_attempts=3, deadline=240.0),
+}
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised without calling the service while its circuit breaker is open.
+    """
+
+    def __init__(self, service, retry_in, reason):
+        self.service = service
+        self.retry_in = retry_in
+        super().__init__(f"{service} is unavailable ({reason}); not retrying for another {retry_in:.0f}s")
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with AIMD rate adaptation: the rate halves on every
+    throttled response and creeps back towards the configured rate on success.
+    """
+
+    def __init__(self, rate, burst):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """
+        Take one token, sleeping until one is available. Returns the seconds waited.
+        """
+        if self.max_rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def throttled(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.max_rate / 16, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+
+    def succeeded(self):
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures (or explicitly, e.g. until the quota
+    resets), then lets a single probe call through once the cooldown has passed.
+    """
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0
+        self.reason = ""
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self, service):
+        with self._lock:
+            now = time.monotonic()
+            if now < self.open_until:
+                raise CircuitOpenError(service, self.open_until - now, self.reason)
+            if self.open_until and self._probing:
+                raise CircuitOpenError(service, self.cooldown, f"{self.reason}, probe in flight")
+            if self.open_until:
+                self._probing = True
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.open_until = 0.0
+            self._probing = False
+
+    def failure(self, reason):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.threshold:
+                self._open(self.cooldown, f"{self.failures} consecutive failures, last: {reason}")
+
+    def answered(self):
+        """
+        The service responded, with an error that does not count against it (404, 429, ...).
+        A probe has shown it reachable again; otherwise the failure streak is left as is.
+        """
+        with self._lock:
+            if self._probing:
+                self.failures = 0
+                self.open_until = 0.0
+                self._probing = False
+
+    def trip(self, seconds, reason):
+        with self._lock:
+            self._open(seconds, reason)
+
+    def _open(self, seconds, reason):
+        self.open_until = time.monotonic() + seconds
+        self.reason = reason
+        self._probing = False
+
+    def state(self):
+        with self._lock:
+            if not self.open_until:
+                return "closed"
+            return "open" if time.monotonic() < self.open_until else "half-open"
+
+
+@dataclass
+class Failure:
+    """
+    How an exception should be handled.
+    """
+    retryable: bool
+    # Counts towards opening the circuit (client errors such as 404 do not)
+    counts: bool
+    retry_after: float = None
+    # Open the circuit for this long (e.g. until the quota resets)
+    trip_for: float = None
+    throttled: bool = False
+    description: str = ""
+
+
+def _status(exc):
+    """
+    HTTP status of an exception from googleapiclient, notion-client, httpx or requests.
+    """
+    resp = getattr(exc, "resp", None)
+    if resp is not None and getattr(resp, "status", None):
+        return int(resp.status)
+    if isinstance(getattr(exc, "status", None), int):
+        return exc.status
+    response = getattr(exc, "response", None)
+    if response is not None and getattr(response, "status_code", None):
+        return int(response.status_code)
+    # youtube-transcript-api only keeps the message of the underlying HTTPError
+    if type(exc).__name__ == "YouTubeRequestFailed":
+        match = re.search(r"\b([45]\d\d)\b", str(getattr(exc, "reason", "")))
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def _headers(exc):
+    for source in (getattr(exc, "resp", None), getattr(exc, "headers", None),
+                   getattr(getattr(exc, "response", None), "headers", None)):
+        if source is not None and hasattr(source, "get"):
+            return source
+    return {}
+
+
+def _reason(exc):
+    """
+    Google API error reason (quotaExceeded, rateLimitExceeded, ...) if present.
+    """
+    details = getattr(exc, "error_details", None)
+    if isinstance(details, list):
+        for detail in details:
+            if isinstance(detail, dict) and detail.get("reason"):
+                return detail["reason"]
+    content = getattr(exc, "content", b"")
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", "replace")
+    match = re.search(r'"reason"\s*:\s*"(\w+)"', content or "")
+    return match.group(1) if match else ""
+
+
+def parse_retry_after(value):
+    """
+    Seconds to wait from a Retry-After header (delta-seconds or HTTP-date).
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def seconds_until_quota_reset():
+    now = datetime.now(QUOTA_RESET_TZ)
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (midnight - now).total_seconds()
+
+
+def is_quota_exceeded(exc):
+    """
+    True for a YouTube 403 quotaExceeded (the project's daily quota is used up).
+    """
+    return _status(exc) == 403 and _reason(exc) in QUOTA_REASONS
+
+
+def classify(exc):
+    """
+    Decide whether an upstream exception is transient.
+    """
+    status = _status(exc)
+    if status is None:
+        name = type(exc).__name__
+        # Network-level failures (connection reset, timeouts) are transient
+        transient = isinstance(exc, (ConnectionError, TimeoutError)) or any(
+            word in name for word in ("Timeout", "Connection", "RemoteProtocol", "NetworkError"))
+        # YouTube blocking our IP will not clear up within a retry, but should stop further attempts
+        blocked = name in ("RequestBlocked", "IpBlocked")
+        return Failure(retryable=transient, counts=transient or blocked, description=name)
+
+    retry_after = parse_retry_after(_headers(exc).get("retry-after") or _headers(exc).get("Retry-After"))
+    if status == 403:
+        reason = _reason(exc)
+        if reason in QUOTA_REASONS:
+            return Failure(retryable=False, counts=True, trip_for=seconds_until_quota_reset(),
+                           description=f"403 {reason}")
+        if reason in THROTTLE_REASONS:
+            return Failure(retryable=True, counts=False, retry_after=retry_after, throttled=True,
+                           description=f"403 {reason}")
+        return Failure(retryable=False, counts=False, description="403")
+    if status == 429:
+        return Failure(retryable=True, counts=False, retry_after=retry_after, throttled=True, description="429")
+    if status in RETRYABLE_STATUSES:
+        return Failure(retryable=True, counts=True, retry_after=retry_after, description=str(status))
+    return Failure(retryable=False, counts=False, description=str(status))
+
+
+class Guard:
+    """
+    Rate limiter, retry loop and circuit breaker for one upstream service.
+    """
+
+    def __init__(self, service, policy=None):
+        self.service = service
+        # "youtube:key2" uses the "youtube" policy with its own bucket and breaker
+        self.policy = policy or POLICIES.get(service.split(":")[0], Policy())
+        self.bucket = TokenBucket(self.policy.rate, self.policy.burst)
+        self.breaker = CircuitBreaker(self.policy.failure_threshold, self.policy.cooldown)
+        self.retries = 0
+
+    def backoff(self, attempt, retry_after=None):
+        """
+        Full-jitter exponential backoff, or the server's Retry-After when it gave one.
+        """
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.policy.base_delay)
+        return random.uniform(0, min(self.policy.max_delay, self.policy.base_delay * 2 ** attempt))
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Call fn(*args, **kwargs) with pacing, retries and circuit breaking.
+        Raises the last upstream error, or CircuitOpenError without calling the service.
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            self.breaker.before_call(self.service)
+            self.bucket.acquire()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                failure = classify(e)
+                if failure.throttled:
+                    self.bucket.throttled()
+                if failure.trip_for:
+                    self.breaker.trip(failure.trip_for, failure.description)
+                elif failure.counts:
+                    self.breaker.failure(failure.description)
+                else:
+                    self.breaker.answered()
+
+                attempt += 1
+                delay = self.backoff(attempt, failure.retry_after)
+                if (not failure.retryable or attempt >= self.policy.max_attempts
+                        or self.breaker.state() == "open"
+                        or delay > self.policy.max_delay
+                        or time.monotonic() - started + delay > self.policy.deadline):
+                    # The server asked for a longer pause than we are willing to block for
+                    if failure.retry_after and failure.retry_after > self.policy.max_delay:
+                        self.breaker.trip(failure.retry_after, f"{failure.description}, Retry-After")
+                    raise
+                self.retries += 1
+                logger.warning(f"{self.service}: {failure.description}, retry {attempt} in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+            self.bucket.succeeded()
+            self.breaker.success()
+            return result
+
+    def wrap(self, fn):
+        """
+        Return fn guarded by this service's limits.
+        """
+        def guarded(*args, **kwargs):
+            return self.call(fn, *args, **kwargs)
+        guarded.__wrapped__ = fn
+        return guarded
+
+    def snapshot(self):
+        return {
+            "rate": round(self.bucket.rate, 3),
+            "maxRate": self.bucket.max_rate,
+            "retries": self.retries,
+            "circuit": self.breaker.state(),
+            "reason": self.breaker.reason,
+        }
+
+
+_guards = {}
+_guards_lock = threading.Lock()
+
+
+def guard(service):
+    """
+    The process-wide Guard for a service.
+    """
+    with _guards_lock:
+        if service not in _guards:
+            _guards[service] = Guard(service)
+        return _guards[service]
+
+
+def snapshot():
+    with _guards_lock:
+        return {service: g.snapshot() for service, g in sorted(_guards.items())}
+
+
+def reset():
+    """
+    Forget all rate, retry and circuit state (e.g. between benchmark runs).
+    """
+    with _guards_lock:
+        _guards.clear()
+
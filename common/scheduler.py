@@ -0,0 +1,142 @@
+# scheduler.py
+"""
+Background prefetch scheduler for the agency's research caches.
+
+The strategy agent's workflow is predictable, so the data it asks for first
+(title frameworks, the script style profile, transcripts of new uploads on watched
+channels) is refreshed on a schedule in a daemon thread and the first turn of a
+session is served from warm caches. Jobs run one at a time; a failing job is
+logged and retried at its next run.
+
+    start_prefetch({
+        "title_frameworks": prefetch_frameworks,
+        "style_profile": (prefetch_style_profile, 900),
+    })
+
+Set AGENCY_PREFETCH=0 to disable it, AGENCY_PREFETCH_INTERVAL to change how often
+jobs run (seconds, default 1800).
+"""
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_INTERVAL = int(os.getenv("AGENCY_PREFETCH_INTERVAL", "1800"))
+
+# Seconds to wait after startup before the first run, so it does not compete with the agency starting up
+STARTUP_DELAY = 5
+
+
+def prefetch_enabled():
+    return os.getenv("AGENCY_PREFETCH", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+class Job:
+    __slots__ = ("name", "fn", "interval", "next_run", "runs", "failures", "last_error", "last_seconds")
+
+    def __init__(self, name, fn, interval, next_run):
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.next_run = next_run
+        self.runs = 0
+        self.failures = 0
+        self.last_error = None
+        self.last_seconds = None
+
+
+class Scheduler:
+    """
+    Runs registered jobs every `interval` seconds in a single daemon thread.
+    """
+
+    def __init__(self, interval=PREFETCH_INTERVAL):
+        self.interval = interval
+        self.jobs = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add(self, name, fn, interval=None, delay=STARTUP_DELAY):
+        with self._lock:
+            self.jobs[name] = Job(name, fn, interval or self.interval, time.monotonic() + delay)
+        self._wake.set()
+
+    def run_pending(self):
+        """
+        Run every job that is due. Returns the seconds until the next one is.
+        """
+        with self._lock:
+            due = [job for job in self.jobs.values() if job.next_run <= time.monotonic()]
+        for job in due:
+            started = time.monotonic()
+            try:
+                job.fn()
+                job.last_error = None
+            except Exception as e:
+                job.failures += 1
+                job.last_error = f"{type(e).__name__}: {e}"
+                logger.warning(f"Prefetch job {job.name} failed: {e}")
+            job.runs += 1
+            job.last_seconds = round(time.monotonic() - started, 3)
+            job.next_run = started + job.interval
+        with self._lock:
+            next_run = min((job.next_run for job in self.jobs.values()), default=time.monotonic() + self.interval)
+        return max(0.0, next_run - time.monotonic())
+
+    def _loop(self):
+        while not self._stop.is_set():
+            wait = self.run_pending()
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="agency-prefetch", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                job.name: {
+                    "runs": job.runs,
+                    "failures": job.failures,
+                    "last_error": job.last_error,
+                    "last_seconds": job.last_seconds,
+                    "next_run_in": round(max(0.0, job.next_run - time.monotonic()), 1),
+                }
+                for job in self.jobs.values()
+            }
+
+
+_scheduler = None
+
+
+def start_prefetch(jobs):
+    """
+    Schedule the given jobs and start the background thread (once per process).
+
+    Args:
+        jobs: {name: function} or {name: (function, interval seconds)}
+
+    Returns:
+        Scheduler, or None if prefetching is disabled
+    """
+    global _scheduler
+    if not prefetch_enabled():
+        return None
+    if _scheduler is None:
+        _scheduler = Scheduler()
+    for name, job in jobs.items():
+        fn, interval = job if isinstance(job, tuple) else (job, None)
+        if name not in _scheduler.jobs:
+            _scheduler.add(name, fn, interval)
+    _scheduler.start()
+    return _scheduler
@@ -0,0 +1,76 @@
+# text_index.py
+import math
+import re
+from collections import Counter
+
+WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9'+#.-]*[a-z0-9+#]|[a-z0-9]")
+
+# Small English stopword list, enough to keep short queries focused on content words
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have
+having he her here hers herself him himself his how i if in into is it its itself just let me more
+most my myself no nor not now of off on once only or other our ours ourselves out over own same she
+should so some such than that the their theirs them themselves then there these they this those
+through to too under until up very was we were what when where which while who whom why will with
+would you your yours yourself yourselves
+""".split())
+
+
+def tokenize(text):
+    """
+    Lowercase and split text into content words, dropping stopwords.
+    """
+    if not text:
+        return []
+    return [w for w in WORD_PATTERN.findall(text.lower()) if w not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    Minimal in-memory Okapi BM25 index over a list of documents.
+    Documents are plain strings; they are tokenized once when the index is built.
+    """
+
+    def __init__(self, documents, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_terms = [Counter(tokenize(doc)) for doc in documents]
+        self.doc_lengths = [sum(terms.values()) for terms in self.doc_terms]
+        self.avg_length = (sum(self.doc_lengths) / len(self.doc_lengths)) if self.doc_lengths else 0.0
+
+        # Document frequency per term -> inverse document frequency
+        document_frequency = Counter()
+        for terms in self.doc_terms:
+            document_frequency.update(terms.keys())
+        total = len(self.doc_terms)
+        self.idf = {
+            term: math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for term, df in document_frequency.items()
+        }
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    def scores(self, query):
+        """
+        Return a BM25 score for every document against the query string.
+        """
+        query_terms = set(tokenize(query))
+        results = []
+        for terms, length in zip(self.doc_terms, self.doc_lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * (length / self.avg_length if self.avg_length else 0))
+            for term in query_terms:
+                tf = terms.get(term)
+                if tf:
+                    score += self.idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            results.append(score)
+        return results
+
+    def top_k(self, query, k):
+        """
+        Return (index, score) pairs for the k best matching documents, best first.
+        """
+        ranked = sorted(enumerate(self.scores(query)), key=lambda pair: pair[1], reverse=True)
+        return ranked[:k]
@@ -0,0 +1,446 @@
+# tracing.py
+"""
+Agency tracing: turns the openai-agents trace spans (agent turns, LLM responses,
+tool and MCP calls, sub-agent messages and handoffs) into
+
+- OTLP/HTTP JSON spans, posted in batches to a local collector when
+  OTEL_EXPORTER_OTLP_ENDPOINT (or OTEL_EXPORTER_OTLP_TRACES_ENDPOINT) is set, and
+- a per-request summary (wall time, LLM vs tool time, tokens, reasoning effort and
+  estimated cost per agent) logged at INFO and optionally appended to
+  AGENCY_TRACE_SUMMARY_FILE as JSON lines.
+
+Enabled by setup_tracing() at startup (main.py, or agency.py when run directly); set AGENCY_TRACING=0 to turn it off.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+from datetime import datetime
+
+from agents.tracing import TracingProcessor
+
+logger = logging.getLogger("agency.tracing")
+
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "youtube-content-agency")
+
+# USD per 1M tokens: (input, cached input, output). Override with AGENCY_MODEL_PRICES='{"model": [in, cached, out]}'
+MODEL_PRICES = {
+    "gpt-5.1": (1.25, 0.125, 10.0),
+    "gpt-5": (1.25, 0.125, 10.0),
+    "gpt-5-mini": (0.25, 0.025, 2.0),
+}
+
+# Batching for the OTLP exporter
+EXPORT_BATCH_SIZE = 256
+EXPORT_INTERVAL_SECONDS = 2.0
+
+_processor = None
+
+
+def otlp_endpoint():
+    """
+    Traces endpoint from the standard OpenTelemetry environment variables, or None.
+    """
+    endpoint = os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT")
+    if endpoint:
+        return endpoint
+    base = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+    return f"{base.rstrip('/')}/v1/traces" if base else None
+
+
+def load_model_prices():
+    """
+    Apply the AGENCY_MODEL_PRICES overrides to MODEL_PRICES. A malformed value is logged
+    and ignored, keeping the default prices.
+    """
+    value = os.getenv("AGENCY_MODEL_PRICES")
+    if not value:
+        return
+    try:
+        overrides = json.loads(value)
+        if not isinstance(overrides, dict):
+            raise TypeError("expected an object of model names to prices")
+        prices = {}
+        for model, model_prices in overrides.items():
+            if not isinstance(model_prices, list) or len(model_prices) != 3:
+                raise ValueError(f"{model}: expected [input, cached input, output] USD per 1M tokens")
+            prices[model] = tuple(float(price) for price in model_prices)
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Ignoring AGENCY_MODEL_PRICES ({e}); using the default prices")
+        return
+    MODEL_PRICES.update(prices)
+
+
+def estimate_cost(model, input_tokens, cached_tokens, output_tokens):
+    """
+    Estimated USD cost of one LLM call, or 0.0 for unknown models.
+    """
+    prices = MODEL_PRICES.get(model) or next(
+        (p for name, p in sorted(MODEL_PRICES.items(), key=lambda item: -len(item[0])) if model and model.startswith(name)),
+        None,
+    )
+    if not prices:
+        return 0.0
+    uncached = max(input_tokens - cached_tokens, 0)
+    return (uncached * prices[0] + cached_tokens * prices[1] + output_tokens * prices[2]) / 1_000_000
+
+
+# ---------------------------------------------------------------------------
+# Span conversion
+# ---------------------------------------------------------------------------
+
+def _unix_nanos(iso_time):
+    if not iso_time:
+        return time.time_ns()
+    return int(datetime.fromisoformat(iso_time).timestamp() * 1_000_000_000)
+
+
+def _hex_id(value, length):
+    """
+    openai-agents ids look like trace_<32 hex> / span_<24 hex>; OTLP wants 32 / 16 hex chars.
+    """
+    raw = (value or "").split("_", 1)[-1].replace("-", "")
+    return raw[:length].rjust(length, "0")
+
+
+def _usage(data):
+    """
+    (model, input, cached input, output, reasoning tokens, reasoning effort) of an LLM span.
+    """
+    model, effort, usage = None, None, {}
+    if data.type == "response":
+        response = data.response
+        model = getattr(response, "model", None)
+        effort = getattr(getattr(response, "reasoning", None), "effort", None)
+        raw = getattr(response, "usage", None)
+        if raw is not None:
+            usage = raw.model_dump() if hasattr(raw, "model_dump") else dict(raw)
+        usage = usage or getattr(data, "usage", None) or {}
+    elif data.type == "generation":
+        model = data.model
+        usage = data.usage or {}
+        reasoning = (data.model_config or {}).get("reasoning")
+        effort = reasoning.get("effort") if isinstance(reasoning, dict) else getattr(reasoning, "effort", None)
+
+    input_tokens = usage.get("input_tokens") or usage.get("prompt_tokens") or 0
+    output_tokens = usage.get("output_tokens") or usage.get("completion_tokens") or 0
+    input_details = usage.get("input_tokens_details") or usage.get("prompt_tokens_details") or {}
+    output_details = usage.get("output_tokens_details") or usage.get("completion_tokens_details") or {}
+    return (model, input_tokens, input_details.get("cached_tokens") or 0, output_tokens,
+            output_details.get("reasoning_tokens") or 0, effort)
+
+
+def describe_span(span):
+    """
+    OTLP span name and attributes for an openai-agents span.
+    """
+    data = span.span_data
+    kind = data.type
+    attributes = {"agency.span.type": kind}
+
+    if kind == "agent":
+        name = f"agent {data.name}"
+        attributes.update({"agent.name": data.name, "agent.tools": ",".join(data.tools or []),
+                           "agent.handoffs": ",".join(data.handoffs or [])})
+    elif kind in ("response", "generation"):
+        model, input_tokens, cached, output_tokens, reasoning_tokens, effort = _usage(data)
+        name = f"llm {model or 'unknown'}"
+        attributes.update({
+            "gen_ai.request.model": model or "",
+            "gen_ai.request.reasoning_effort": effort or "",
+            "gen_ai.usage.input_tokens": input_tokens,
+            "gen_ai.usage.cached_input_tokens": cached,
+            "gen_ai.usage.output_tokens": output_tokens,
+            "gen_ai.usage.reasoning_tokens": reasoning_tokens,
+            "gen_ai.usage.cost_usd": round(estimate_cost(model, input_tokens, cached, output_tokens), 6),
+        })
+    elif kind == "function":
+        name = f"tool {data.name}"
+        attributes.update({"tool.name": data.name, "tool.input_chars": len(data.input or ""),
+                           "tool.output_chars": len(str(data.output or ""))})
+        if data.mcp_data:
+            attributes["mcp.server"] = str(data.mcp_data.get("server", ""))
+    elif kind == "handoff":
+        name = f"handoff {data.from_agent} -> {data.to_agent}"
+        attributes.update({"handoff.from": data.from_agent or "", "handoff.to": data.to_agent or ""})
+    elif kind == "mcp_tools":
+        name = f"mcp list_tools {data.server}"
+        attributes["mcp.server"] = data.server or ""
+    else:
+        name = getattr(data, "name", None) or kind
+    return name, attributes
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(trace_id, span_id, parent_id, name, start_ns, end_ns, attributes, error=None):
+    span = {
+        "traceId": trace_id,
+        "spanId": span_id,
+        "name": name,
+        "kind": 1,
+        "startTimeUnixNano": str(start_ns),
+        "endTimeUnixNano": str(end_ns),
+        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()],
+        "status": {"code": 2, "message": str(error.get("message", ""))} if error else {"code": 1},
+    }
+    if parent_id:
+        span["parentSpanId"] = parent_id
+    return span
+
+
+class OTLPExporter:
+    """
+    Posts OTLP/HTTP JSON batches from a background thread; never blocks the agents.
+    """
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self._queue = queue.Queue(maxsize=10_000)
+        self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, span):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            logger.debug("OTLP export queue full, dropping span")
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + EXPORT_INTERVAL_SECONDS
+            while len(batch) < EXPORT_BATCH_SIZE and time.monotonic() < deadline:
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0.01)))
+                except queue.Empty:
+                    break
+            self._post(batch)
+
+    def flush(self):
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            self._post(batch)
+
+    def _post(self, spans):
+        payload = {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "agency.tracing"}, "spans": spans}],
+        }]}
+        request = urllib.request.Request(self.endpoint, data=json.dumps(payload).encode("utf-8"),
+                                         headers={"Content-Type": "application/json"}, method="POST")
+        try:
+            urllib.request.urlopen(request, timeout=5).close()
+        except Exception as e:
+            logger.debug(f"OTLP export to {self.endpoint} failed: {e}")
+
+
+# ---------------------------------------------------------------------------
+# Per-request summary
+# ---------------------------------------------------------------------------
+
+class _AgentStats:
+    __slots__ = ("turns", "llm_calls", "llm_ms", "tool_calls", "tool_ms", "input_tokens", "cached_tokens",
+                 "output_tokens", "reasoning_tokens", "cost_usd", "efforts")
+
+    def __init__(self):
+        self.turns = self.llm_calls = self.tool_calls = 0
+        self.llm_ms = self.tool_ms = self.cost_usd = 0.0
+        self.input_tokens = self.cached_tokens = self.output_tokens = self.reasoning_tokens = 0
+        self.efforts = set()
+
+
+class TraceSummary:
+    """
+    Accumulates one request's spans into per-agent and per-tool totals.
+    """
+
+    def __init__(self, trace):
+        self.trace_id = trace.trace_id
+        self.name = trace.name
+        self.started = time.perf_counter()
+        self.agents = defaultdict(_AgentStats)
+        self.tools = defaultdict(lambda: [0, 0.0])
+        self.handoffs = []
+        self.errors = 0
+
+    def add(self, span, agent, elapsed_ms):
+        data = span.span_data
+        stats = self.agents[agent or "unknown"]
+        if span.error:
+            self.errors += 1
+
+        if data.type == "agent":
+            stats.turns += 1
+        elif data.type in ("response", "generation"):
+            model, input_tokens, cached, output_tokens, reasoning_tokens, effort = _usage(data)
+            stats.llm_calls += 1
+            stats.llm_ms += elapsed_ms
+            stats.input_tokens += input_tokens
+            stats.cached_tokens += cached
+            stats.output_tokens += output_tokens
+            stats.reasoning_tokens += reasoning_tokens
+            stats.cost_usd += estimate_cost(model, input_tokens, cached, output_tokens)
+            if effort:
+                stats.efforts.add(effort)
+        elif data.type == "function":
+            stats.tool_calls += 1
+            stats.tool_ms += elapsed_ms
+            tool = self.tools[data.name]
+            tool[0] += 1
+            tool[1] += elapsed_ms
+        elif data.type == "handoff":
+            self.handoffs.append(f"{data.from_agent} -> {data.to_agent}")
+
+    def to_dict(self):
+        agents = {
+            name: {
+                "turns": s.turns, "llmCalls": s.llm_calls, "llmMs": round(s.llm_ms, 1),
+                "toolCalls": s.tool_calls, "toolMs": round(s.tool_ms, 1),
+                "inputTokens": s.input_tokens, "cachedInputTokens": s.cached_tokens,
+                "outputTokens": s.output_tokens, "reasoningTokens": s.reasoning_tokens,
+                "reasoningEffort": sorted(s.efforts), "costUsd": round(s.cost_usd, 6),
+            }
+            for name, s in self.agents.items()
+        }
+        return {
+            "traceId": self.trace_id,
+            "name": self.name,
+            "wallMs": round((time.perf_counter() - self.started) * 1000, 1),
+            "costUsd": round(sum(s.cost_usd for s in self.agents.values()), 6),
+            "agents": agents,
+            "tools": {name: {"calls": c, "ms": round(ms, 1)}
+                      for name, (c, ms) in sorted(self.tools.items(), key=lambda item: -item[1][1])},
+            "handoffs": self.handoffs,
+            "errors": self.errors,
+        }
+
+    def log_line(self, summary):
+        parts = [f"{summary['name']} {summary['traceId']}: {summary['wallMs'] / 1000:.1f}s, ${summary['costUsd']:.4f}"]
+        for name, a in sorted(summary["agents"].items(), key=lambda item: -item[1]["llmMs"]):
+            parts.append(f"{name} llm {a['llmMs'] / 1000:.1f}s/{a['llmCalls']} calls "
+                         f"({a['inputTokens']} in, {a['outputTokens']} out, {a['reasoningTokens']} reasoning), "
+                         f"tools {a['toolMs'] / 1000:.1f}s/{a['toolCalls']} calls")
+        slowest = list(summary["tools"].items())[:3]
+        if slowest:
+            parts.append("slowest tools: " + ", ".join(f"{n} {t['ms'] / 1000:.1f}s" for n, t in slowest))
+        return " | ".join(parts)
+
+
+# ---------------------------------------------------------------------------
+# Processor
+# ---------------------------------------------------------------------------
+
+class AgencyTraceProcessor(TracingProcessor):
+    """
+    openai-agents TracingProcessor feeding the OTLP exporter and the per-request summaries.
+    """
+
+    def __init__(self, endpoint=None, summary_file=None):
+        self.exporter = OTLPExporter(endpoint) if endpoint else None
+        self.summary_file = summary_file
+        self._lock = threading.Lock()
+        self._summaries = {}
+        self._span_agents = {}
+        self._span_started = {}
+        self._trace_spans = defaultdict(list)
+        self._trace_started_ns = {}
+
+    def on_trace_start(self, trace):
+        with self._lock:
+            self._summaries[trace.trace_id] = TraceSummary(trace)
+            self._trace_started_ns[trace.trace_id] = time.time_ns()
+
+    def on_span_start(self, span):
+        data = span.span_data
+        with self._lock:
+            # Attribute every span to the closest enclosing agent
+            agent = data.name if data.type == "agent" else self._span_agents.get(span.parent_id)
+            self._span_agents[span.span_id] = agent
+            self._span_started[span.span_id] = time.perf_counter()
+            self._trace_spans[span.trace_id].append(span.span_id)
+
+    def on_span_end(self, span):
+        with self._lock:
+            started = self._span_started.pop(span.span_id, None)
+            agent = self._span_agents.get(span.span_id)
+            summary = self._summaries.get(span.trace_id)
+        elapsed_ms = (time.perf_counter() - started) * 1000 if started else 0.0
+
+        if summary:
+            summary.add(span, agent, elapsed_ms)
+
+        if self.exporter:
+            name, attributes = describe_span(span)
+            if agent:
+                attributes["agent.name"] = agent
+            trace_id = _hex_id(span.trace_id, 32)
+            self.exporter.submit(_otlp_span(
+                trace_id, _hex_id(span.span_id, 16), _hex_id(span.parent_id, 16) if span.parent_id else trace_id[:16],
+                name, _unix_nanos(span.started_at), _unix_nanos(span.ended_at), attributes, span.error,
+            ))
+
+    def on_trace_end(self, trace):
+        with self._lock:
+            summary = self._summaries.pop(trace.trace_id, None)
+            started_ns = self._trace_started_ns.pop(trace.trace_id, time.time_ns())
+            for span_id in self._trace_spans.pop(trace.trace_id, []):
+                self._span_agents.pop(span_id, None)
+                self._span_started.pop(span_id, None)
+        if not summary:
+            return
+
+        result = summary.to_dict()
+        logger.info(summary.log_line(result))
+
+        if self.summary_file:
+            try:
+                with open(self.summary_file, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(result) + "\n")
+            except OSError as e:
+                logger.warning(f"Could not write trace summary: {e}")
+
+        if self.exporter:
+            # Root span for the whole request, carrying the summary totals
+            trace_id = _hex_id(trace.trace_id, 32)
+            totals = {"agency.request.cost_usd": result["costUsd"], "agency.request.errors": result["errors"],
+                      "agency.request.handoffs": len(result["handoffs"])}
+            self.exporter.submit(_otlp_span(trace_id, trace_id[:16], None, f"request {trace.name}",
+                                            started_ns, time.time_ns(), totals))
+
+    def shutdown(self):
+        self.force_flush()
+
+    def force_flush(self):
+        if self.exporter:
+            self.exporter.flush()
+
+
+def setup_tracing():
+    """
+    Register the agency trace processor once per process. Returns it, or None if disabled.
+    """
+    global _processor
+    if _processor is not None or os.getenv("AGENCY_TRACING", "1") == "0":
+        return _processor
+
+    from agents import add_trace_processor
+
+    load_model_prices()
+    _processor = AgencyTraceProcessor(otlp_endpoint(), os.getenv("AGENCY_TRACE_SUMMARY_FILE"))
+    add_trace_processor(_processor)
+    return _processor
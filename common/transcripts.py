@@ -0,0 +1,176 @@
+# transcripts.py
+"""
+On-disk transcript cache plus watched-channel upload detection.
+
+YouTubeTranscriptTool reads through the cache, and the prefetch scheduler fills it
+with transcripts of new uploads on the channels in YOUTUBE_WATCHLIST, so the
+outlier videos a planning session asks about are usually already local.
+
+Uploads are found in the channels' public feeds (feeds.py), which cost no API quota;
+the feed validators, entries and resolved @handles are shared with the toolbox's
+check_watchlist_uploads, in the same watchlist file format.
+"""
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from youtube_transcript_api import NoTranscriptFound, YouTubeTranscriptApi
+from youtube_transcript_api.proxies import WebshareProxyConfig
+
+from .cache import YOUTUBE_DATASET_DIR, load_json, save_json
+from .feeds import STATE_FILE_NAME, FeedStore, channel_reference, fetch_feeds, published_at, read_watchlist
+from .resilience import guard
+
+logger = logging.getLogger(__name__)
+
+# Transcripts rarely change once published; refetch after this many seconds
+TRANSCRIPT_TTL_SECONDS = int(os.getenv("AGENCY_TRANSCRIPT_TTL", str(7 * 24 * 3600)))
+
+# Watchlist prefetch settings
+WATCHLIST_FILE = os.getenv("YOUTUBE_WATCHLIST")
+WATCHLIST_LANGUAGE = os.getenv("WATCHLIST_TRANSCRIPT_LANGUAGE", "en")
+# Only uploads this recent count as new
+WATCHLIST_MAX_AGE_DAYS = int(os.getenv("WATCHLIST_MAX_AGE_DAYS", "7"))
+
+# Feed state shared with the toolbox
+WATCHLIST_FEEDS_FILE = os.path.join(YOUTUBE_DATASET_DIR, STATE_FILE_NAME)
+
+YOUTUBE_API_ROOT = (os.getenv("YOUTUBE_API_BASE_URL") or "https://www.googleapis.com/").rstrip("/") + "/youtube/v3"
+
+
+def _cache_file(video_id, language):
+    return f"transcript-{video_id}-{language or 'any'}.json"
+
+
+def transcript_api():
+    """
+    Transcript client, through the Webshare proxy when its credentials are set.
+    """
+    proxy_username = os.getenv("WEBSHARE_PROXY_USERNAME")
+    proxy_password = os.getenv("WEBSHARE_PROXY_PASSWORD")
+    if proxy_username and proxy_password:
+        return YouTubeTranscriptApi(proxy_config=WebshareProxyConfig(
+            proxy_username=proxy_username,
+            proxy_password=proxy_password,
+            filter_ip_locations=["us"],
+        ))
+    return YouTubeTranscriptApi()
+
+
+def load_transcript(video_id, language):
+    """
+    Return the cached transcript of a video, or None if it is missing or expired.
+    """
+    cached = load_json(_cache_file(video_id, language))
+    if cached and time.time() - cached.get("fetched_at", 0) < TRANSCRIPT_TTL_SECONDS:
+        return cached
+    return None
+
+
+def fetch_transcript(api, video_id, language):
+    """
+    Return a video's transcript from the cache, fetching it through `api` on a miss.
+
+    Falls back to any available language when `language` has no transcript. Other failures
+    (rate limits, timeouts left after retries) raise, so a transient error never caches a
+    wrong-language transcript under `language`.
+
+    Returns:
+        dict: video_id, language_code, fallback (True if `language` was unavailable),
+            fetched_at and snippets as [text, start, duration] lists
+    """
+    cached = load_transcript(video_id, language)
+    if cached:
+        return cached
+
+    transcripts = guard("transcript")
+    fallback = False
+    try:
+        fetched = transcripts.call(api.fetch, video_id, languages=[language])
+    except NoTranscriptFound:
+        fetched = transcripts.call(api.fetch, video_id)
+        fallback = True
+
+    transcript = {
+        "video_id": video_id,
+        "language_code": fetched.language_code,
+        "fallback": fallback,
+        "fetched_at": time.time(),
+        "snippets": [[snippet.text, snippet.start, snippet.duration] for snippet in fetched.snippets],
+    }
+    save_json(_cache_file(video_id, language), transcript)
+    return transcript
+
+
+def _youtube_get(client, resource, **params):
+    # The key goes in a header so it never shows up in logged request URLs
+    response = guard("youtube").call(client.get, f"{YOUTUBE_API_ROOT}/{resource}", params=params,
+                                     headers={"X-Goog-Api-Key": os.getenv("YOUTUBE_API_KEY")})
+    response.raise_for_status()
+    return response.json()
+
+
+def _channel_id(client, reference, handles):
+    """
+    Resolve a channel ID, @handle or channel URL (a handle costs 1 quota unit once, then is remembered).
+    """
+    kind, value = channel_reference(reference)
+    if kind == "id":
+        return value
+    if value not in handles:
+        if not os.getenv("YOUTUBE_API_KEY"):
+            raise ValueError(f"Resolving {value} needs YOUTUBE_API_KEY; list its channel ID instead")
+        items = _youtube_get(client, "channels", part="id", forHandle=value).get("items", [])
+        if not items:
+            raise ValueError(f"Channel {reference} not found")
+        handles[value] = items[0]["id"]
+    return handles[value]
+
+
+def new_uploads(entries, max_age_days=WATCHLIST_MAX_AGE_DAYS):
+    """
+    IDs of the feed entries published within the last max_age_days.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+    return [entry["videoId"] for entry in entries if (published_at(entry) or cutoff) >= cutoff]
+
+
+def prefetch_watchlist_transcripts():
+    """
+    Prefetch job: cache the transcripts of new uploads on the watched channels.
+    Does nothing unless YOUTUBE_WATCHLIST is set; uses no API quota for channel IDs.
+    """
+    if not WATCHLIST_FILE:
+        return
+    store = FeedStore(WATCHLIST_FEEDS_FILE)
+    feeds, handles = store.load()
+    channel_ids = []
+    with httpx.Client(timeout=30) as client:
+        for reference in read_watchlist(WATCHLIST_FILE):
+            try:
+                channel_ids.append(_channel_id(client, reference, handles))
+            except Exception as e:
+                logger.warning(f"Could not resolve watchlist channel {reference}: {e}")
+    channel_ids = list(dict.fromkeys(channel_ids))
+    results = fetch_feeds(channel_ids, feeds)
+    store.save({channel_id: feeds[channel_id] for channel_id in channel_ids}, handles)
+
+    api = transcript_api()
+    fetched = 0
+    for channel_id, result in zip(channel_ids, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Could not read the upload feed of {channel_id}: {result}")
+            continue
+        for video_id in new_uploads(result["entries"]):
+            if load_transcript(video_id, WATCHLIST_LANGUAGE):
+                continue
+            try:
+                fetch_transcript(api, video_id, WATCHLIST_LANGUAGE)
+                fetched += 1
+            except Exception as e:
+                # Live streams and brand-new uploads often have no transcript yet; retried next run
+                logger.info(f"No transcript for {video_id} yet: {e}")
+    if fetched:
+        logger.info(f"Prefetched {fetched} watchlist transcripts")
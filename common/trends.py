@@ -0,0 +1,404 @@
+# trends.py
+"""
+Keyword burst detection over the YouTube and news streams.
+
+Every item (a video title and tags from the toolbox's trending snapshots and search
+results, an X post, a Readwise newsletter) is reduced to its set of word n-grams and
+counted once, in the time bucket it was published in. Counts are kept incrementally in
+.cache/trends.json: each call only adds items not seen before, reading the toolbox's
+JSON Lines tables from where the previous call stopped.
+
+Bursts are scored over the term x bucket count matrix with NumPy:
+
+- z-score: the share of recent items mentioning a term against its share in the
+  baseline buckets before them (a binomial test per term)
+- Kleinberg: a two-state (normal / bursty) automaton per term, decoded with Viterbi;
+  a term whose last state is bursty reports when the burst started and its weight
+
+    tracker = TrendTracker()
+    tracker.observe(items)
+    bursts = tracker.bursts(window_hours=24, baseline_days=14)
+"""
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .cache import YOUTUBE_DATASET_DIR, load_json, save_json
+from .text_index import tokenize
+
+TRENDS_CACHE_FILE = "trends.json"
+
+# Width of a time bucket; changing it starts the counts over
+TREND_BUCKET_HOURS = int(os.getenv("AGENCY_TREND_BUCKET_HOURS", "6"))
+# Buckets older than this are dropped
+TREND_RETENTION_DAYS = int(os.getenv("AGENCY_TREND_RETENTION_DAYS", "30"))
+
+# Unigrams and bigrams; bigrams name most emerging topics ("claude code", "sora 2")
+NGRAM_SIZES = (1, 2)
+
+# Tables of the toolbox dataset read for YouTube items
+YOUTUBE_TABLES = ("videos", "search_results")
+
+SOURCES = ("youtube", "x", "readwise")
+
+# Kleinberg: the bursty state emits a term at KLEINBERG_S times its base rate, and
+# entering it costs KLEINBERG_GAMMA * ln(buckets)
+KLEINBERG_S = 2.0
+KLEINBERG_GAMMA = 1.0
+
+# A burst must at least be this many times more frequent in the window than in the baseline
+MIN_LIFT = 1.5
+
+URL_RE = re.compile(r"https?://\S+|www\.\S+|@\w+")
+
+_lock = threading.Lock()
+
+
+def ngrams(text):
+    """
+    Distinct word n-grams of a text (content words, URLs and @handles removed).
+    """
+    words = tokenize(URL_RE.sub(" ", text or ""))
+    terms = set()
+    for size in NGRAM_SIZES:
+        terms.update(" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+    return terms
+
+
+def timestamp(value):
+    """
+    Epoch seconds of an ISO date/time or epoch number, or None.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat(timespec="minutes")
+
+
+def _baseline_share(baseline_counts, baseline_docs):
+    """
+    Share of baseline items mentioning each term, smoothed so unseen terms are not infinitely surprising.
+    """
+    return np.clip((baseline_counts + 1) / (baseline_docs + 2), 1e-6, 1 - 1e-6)
+
+
+def youtube_items(offsets, dataset_dir=YOUTUBE_DATASET_DIR):
+    """
+    Videos and search results appended to the toolbox's dataset since the given byte offsets.
+
+    Returns:
+        tuple: (items, new offsets per table file)
+    """
+    items, new_offsets = [], dict(offsets)
+    for table in YOUTUBE_TABLES:
+        path = os.path.join(dataset_dir, f"{table}.jsonl")
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            continue
+        # A rewritten (smaller) file is read again from the start; seen items are skipped anyway
+        start = offsets.get(path, 0) if offsets.get(path, 0) <= size else 0
+        with open(path, "rb") as f:
+            f.seek(start)
+            data = f.read()
+        # Stop at the last complete line; a partial one is read next time
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            if not row.get("video_id"):
+                continue
+            items.append({
+                "source": "youtube",
+                "id": row["video_id"],
+                "text": " ".join([row.get("title") or "", *(row.get("tags") or [])]),
+                "published_at": row.get("published_at") or row.get("observed_at"),
+            })
+        new_offsets[path] = start + end
+    return items, new_offsets
+
+
+class TrendTracker:
+    """
+    Incremental n-gram counts per source and time bucket, persisted in the agency cache.
+    """
+
+    def __init__(self, bucket_hours=TREND_BUCKET_HOURS, retention_days=TREND_RETENTION_DAYS):
+        self.bucket_seconds = bucket_hours * 3600
+        self.retention_buckets = max(1, retention_days * 86400 // self.bucket_seconds)
+
+    def _load(self):
+        state = load_json(TRENDS_CACHE_FILE)
+        if not state or state.get("bucket_seconds") != self.bucket_seconds:
+            state = {"bucket_seconds": self.bucket_seconds, "buckets": {}, "seen": {}, "offsets": {}}
+        return state
+
+    def _bucket(self, epoch):
+        return int(epoch // self.bucket_seconds)
+
+    def observe(self, items, youtube_dataset=True, now=None):
+        """
+        Count the n-grams of items not seen before.
+
+        Args:
+            items: dicts with source, id, text and published_at (ISO or epoch; items without
+                one count as published now)
+            youtube_dataset: also read new rows of the toolbox's videos and search_results tables
+
+        Returns:
+            dict: added items per source
+        """
+        now = now or time.time()
+        current = self._bucket(now)
+        oldest = current - self.retention_buckets + 1
+        added = Counter()
+        with _lock:
+            state = self._load()
+            if youtube_dataset:
+                youtube, state["offsets"] = youtube_items(state["offsets"])
+                items = list(items) + youtube
+            buckets, seen = state["buckets"], state["seen"]
+            for item in items:
+                key = f"{item['source']}:{item['id']}"
+                if key in seen:
+                    continue
+                bucket = min(self._bucket(timestamp(item.get("published_at")) or now), current)
+                if bucket < oldest:
+                    continue
+                seen[key] = bucket
+                entry = buckets.setdefault(item["source"], {}).setdefault(str(bucket), {"docs": 0, "terms": {}})
+                entry["docs"] += 1
+                terms = entry["terms"]
+                for term in ngrams(item.get("text")):
+                    terms[term] = terms.get(term, 0) + 1
+                added[item["source"]] += 1
+
+            for source_buckets in buckets.values():
+                for bucket in [bucket for bucket in source_buckets if int(bucket) < oldest]:
+                    del source_buckets[bucket]
+            state["seen"] = {key: bucket for key, bucket in seen.items() if bucket >= oldest}
+            save_json(TRENDS_CACHE_FILE, state)
+        return dict(added)
+
+    def _matrix(self, state, first, last, window, sources, min_count):
+        """
+        Term x bucket counts (and docs per bucket) over buckets first..last, overall and per source.
+
+        Only terms that can be reported get a row: at least min_count items in the last `window` buckets
+        and MIN_LIFT over the baseline, checked on the plain counts first. That is a small fraction of
+        the vocabulary, so the matrices stay small however many items the buckets hold.
+        """
+        width = last - first + 1
+        docs = np.zeros(width)
+        per_source = {}
+        for source in sources:
+            entries = []
+            for bucket, entry in state["buckets"].get(source, {}).items():
+                column = int(bucket) - first
+                if 0 <= column < width:
+                    docs[column] += entry["docs"]
+                    entries.append((column, entry["terms"]))
+            per_source[source] = entries
+
+        window_counts = Counter()
+        for entries in per_source.values():
+            for column, terms in entries:
+                if column >= width - window:
+                    window_counts.update(terms)
+        baseline_counts = {term: 0 for term, count in window_counts.items() if count >= min_count}
+        for entries in per_source.values():
+            for column, terms in entries:
+                if column < width - window:
+                    for term, count in terms.items():
+                        if term in baseline_counts:
+                            baseline_counts[term] += count
+        candidates = list(baseline_counts)
+        lift = (np.array([window_counts[term] for term in candidates], dtype=float) / max(docs[-window:].sum(), 1)
+                / _baseline_share(np.array(list(baseline_counts.values()), dtype=float), docs[:-window].sum()))
+        vocabulary = {term: index for index, term in enumerate(
+            term for term, term_lift in zip(candidates, lift) if term_lift >= MIN_LIFT)}
+
+        counts = np.zeros((len(vocabulary), width))
+        source_counts = {}
+        for source, entries in per_source.items():
+            matrix = np.zeros((len(vocabulary), width))
+            for column, terms in entries:
+                kept = [(vocabulary[term], count) for term, count in terms.items() if term in vocabulary]
+                if kept:
+                    indexes, values = zip(*kept)
+                    matrix[list(indexes), column] = values
+            counts += matrix
+            source_counts[source] = matrix
+        return list(vocabulary), counts, docs, source_counts
+
+    def bursts(self, window_hours=24, baseline_days=14, method="zscore", sources=SOURCES, min_count=3,
+               max_results=20, now=None):
+        """
+        Terms mentioned by markedly more items in the recent window than in the baseline before it.
+
+        Args:
+            method: "zscore" ranks by the binomial z-score of the window share against the baseline share;
+                "kleinberg" ranks the terms in a Kleinberg burst at the latest bucket by burst weight
+            min_count: minimum items in the window mentioning a term
+
+        Returns:
+            dict: bursts (term, score, lift, counts, per-source window counts, Kleinberg state) and the
+                items counted in the window and the baseline
+        """
+        if method not in ("zscore", "kleinberg"):
+            raise ValueError(f"Unknown method '{method}'. Choose zscore or kleinberg")
+        now = now or time.time()
+        current = self._bucket(now)
+        window = max(1, math.ceil(window_hours * 3600 / self.bucket_seconds))
+        baseline = max(1, math.ceil(baseline_days * 86400 / self.bucket_seconds))
+        first = current - window - baseline + 1
+
+        with _lock:
+            state = self._load()
+        terms, counts, docs, source_counts = self._matrix(state, first, current, window, sources, min_count)
+        window_docs, baseline_docs = docs[-window:].sum(), docs[:-window].sum()
+        summary = {
+            "window": {"start": _iso((current - window + 1) * self.bucket_seconds), "items": int(window_docs)},
+            "baseline": {"start": _iso(first * self.bucket_seconds), "items": int(baseline_docs)},
+            "method": method,
+        }
+        if not terms or not window_docs:
+            return {**summary, "bursts": []}
+
+        window_counts = counts[:, -window:].sum(axis=1)
+        baseline_counts = counts[:, :-window].sum(axis=1)
+
+        # Binomial z-score of the window count given the (smoothed) baseline share
+        p0 = _baseline_share(baseline_counts, baseline_docs)
+        expected = window_docs * p0
+        z = (window_counts - expected) / np.sqrt(expected * (1 - p0))
+        lift = (window_counts / window_docs) / p0
+
+        active, since, weight = self._kleinberg(counts, docs)
+        score = z if method == "zscore" else weight
+        eligible = (window_counts >= min_count) & (lift >= MIN_LIFT)
+        if method == "kleinberg":
+            eligible &= active
+
+        kept = []
+        # Ties go to bigrams, so a phrase is listed before its words
+        lengths = np.array([term.count(" ") for term in terms])
+        for index in np.lexsort((-lengths, -score)):
+            if not eligible[index]:
+                continue
+            term = terms[index]
+            if self._absorbed(term, int(window_counts[index]), kept):
+                continue
+            kept.append({
+                "term": term,
+                "score": round(float(score[index]), 2),
+                "lift": round(float(lift[index]), 2),
+                "windowCount": int(window_counts[index]),
+                "baselineCount": int(baseline_counts[index]),
+                "windowShare": round(float(window_counts[index] / window_docs), 4),
+                "sources": {source: int(matrix[index, -window:].sum()) for source, matrix in source_counts.items()
+                            if matrix[index, -window:].any()},
+                "burst": {
+                    "active": bool(active[index]),
+                    "since": _iso((first + int(since[index])) * self.bucket_seconds) if active[index] else None,
+                    "weight": round(float(weight[index]), 2),
+                },
+            })
+            if len(kept) >= max_results:
+                break
+        return {**summary, "bursts": kept}
+
+    @staticmethod
+    def _absorbed(term, count, kept):
+        """
+        Fold a term into a listed phrase that it mostly co-occurs with: a word of the phrase is dropped, and a
+        bigram overlapping its first or last word extends it ("sora 2" + "2 video" -> "sora 2 video").
+        """
+        words = term.split()
+        for other in kept:
+            phrase = other["term"].split()
+            if len(words) == 1:
+                if words[0] in phrase and other["windowCount"] >= 0.6 * count:
+                    return True
+                continue
+            if min(count, other["windowCount"]) < 0.8 * max(count, other["windowCount"]):
+                continue
+            if f" {term} " in f" {other['term']} ":
+                return True
+            if phrase[-1] == words[0]:
+                other["term"] = f"{other['term']} {words[1]}"
+            elif phrase[0] == words[1]:
+                other["term"] = f"{words[0]} {other['term']}"
+            else:
+                continue
+            # The longer phrase may now run into another listed one ("sora 2 video" + "video model demo")
+            for rest in kept:
+                if rest is not other and min(rest["windowCount"], other["windowCount"]) >= 0.8 * max(
+                        rest["windowCount"], other["windowCount"]):
+                    if rest["term"].split()[0] == other["term"].split()[-1]:
+                        other["term"] = f"{other['term']} {rest['term'].split(' ', 1)[1]}"
+                        kept.remove(rest)
+                        break
+                    if rest["term"].split()[-1] == other["term"].split()[0]:
+                        other["term"] = f"{rest['term'].rsplit(' ', 1)[0]} {other['term']}"
+                        kept.remove(rest)
+                        break
+            return True
+        return False
+
+    def _kleinberg(self, counts, docs):
+        """
+        Two-state Kleinberg burst detection for every term at once.
+
+        Returns:
+            tuple: per term, whether the last bucket is bursty, the bucket index the burst started at,
+                and the burst weight (cost saved by the bursty state over the run)
+        """
+        terms, width = counts.shape
+        rate = counts.sum(axis=1) / max(docs.sum(), 1)
+        p0 = np.clip(rate, 1e-6, 0.9999)
+        p1 = np.clip(KLEINBERG_S * p0, 1e-6, 0.9999)
+        # Negative log-likelihood of each bucket's count under each state (the binomial coefficient cancels)
+        misses = docs - counts
+        cost0 = -(counts * np.log(p0)[:, None] + misses * np.log1p(-p0)[:, None])
+        cost1 = -(counts * np.log(p1)[:, None] + misses * np.log1p(-p1)[:, None])
+        up = KLEINBERG_GAMMA * math.log(max(width, 2))
+
+        # Viterbi over the buckets, vectorized across terms
+        v0, v1 = np.zeros(terms), np.full(terms, np.inf)
+        stay1 = np.zeros((terms, width), dtype=bool)  # best path into state 1 at t comes from state 1
+        for t in range(width):
+            stay1[:, t] = v1 <= v0 + up
+            v0, v1 = np.minimum(v0, v1) + cost0[:, t], np.minimum(v1, v0 + up) + cost1[:, t]
+
+        # Walk back only through the final bursty run
+        active = v1 < v0
+        since = np.full(terms, width - 1)
+        running = active.copy()
+        for t in range(width - 1, 0, -1):
+            running &= stay1[:, t]
+            since[running] = t - 1
+        columns = np.arange(width)
+        in_run = active[:, None] & (columns[None, :] >= since[:, None])
+        weight = np.where(in_run, cost0 - cost1, 0).sum(axis=1)
+        return active, since, weight
@@ -0,0 +1,75 @@
+# FetchXNews.py
+import json
+
+from agency_swarm.tools import BaseTool
+from pydantic import Field
+
+from grok_news_agent.x_news import collect
+
+
+class FetchXNews(BaseTool):
+    """
+    Searches X (Twitter) for recent posts about a query through Grok Live Search and returns them as JSON,
+    newest first, with author, text, timestamp, engagement, permalink and the links present in the post.
+    Results are kept locally: repeating a search only fetches posts published since the previous one
+    (posts first seen by this call have "new": true), and reposts and near-identical posts are merged into
+    one entry whose other permalinks are listed in duplicate_urls.
+    """
+
+    query: str = Field(
+        ...,
+        description="X search query, including at least one channel keyword, e.g. 'AI agents OpenAI release'.",
+    )
+
+    days: int = Field(
+        default=3,
+        ge=1,
+        le=14,
+        description="Return posts from the last this many days.",
+    )
+
+    max_results: int = Field(
+        default=30,
+        ge=1,
+        le=100,
+        description="Maximum number of posts to return.",
+    )
+
+    only_new: bool = Field(
+        default=False,
+        description="Return only posts not seen by earlier searches for this query.",
+    )
+
+    refresh: bool = Field(
+        default=False,
+        description="Search the whole window again instead of only fetching posts since the last search.",
+    )
+
+    def run(self):
+        """
+        Collect the posts (incrementally) and return them as JSON.
+        """
+        try:
+            result = collect(self.query, self.days, self.refresh)
+        except Exception as e:
+            return f"❌ Error searching X for '{self.query}': {str(e)}"
+
+        posts = [post for post in result["posts"] if post["new"] or not self.only_new]
+        for post in posts:
+            del post["id"], post["queries"], post["first_seen"]
+        return json.dumps({
+            "query": result["query"],
+            "window_days": result["window_days"],
+            "searched_since": result["from_date"] or "served from local store",
+            "new_posts": result["new_posts"],
+            "total_posts": len(posts),
+            "posts": posts[:self.max_results],
+        }, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    # Test the tool (run from the repository root: python -m grok_news_agent.tools.FetchXNews)
+    print("🧪 Testing FetchXNews:")
+    print("-" * 50)
+    tool = FetchXNews(query="AI agents framework release", days=3)
+    print(tool.run())
@@ -0,0 +1,339 @@
+# x_news.py
+"""
+Incremental X (Twitter) news collection through Grok Live Search.
+
+Each search computes its window when it runs (the last `days` days), and posts are
+kept on disk between searches. A repeated search only asks Grok for posts since the
+previous fetch of the same query (or skips the API entirely within
+NEWS_MIN_REFRESH_SECONDS), so repeated news briefings are incremental.
+
+Posts are deduplicated on the way in:
+- the same status under different URLs (x.com / twitter.com, mobile links, query strings),
+- reposts ("RT @author: ...") of a stored post,
+- near-identical text (copy-pasted announcements), by word-shingle overlap, comparing
+  only the stored posts that share a MinHash LSH band (common/dedup.py).
+Duplicates are folded into the first post seen, keeping their URLs and the highest engagement.
+Posts without a URL are keyed on a hash of their text.
+
+Refresh manually with:
+    python -m grok_news_agent.x_news "AI agents" [days]
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import httpx
+from dotenv import load_dotenv
+
+from common import load_json, save_json
+from common.dedup import LSHIndex, signature
+from common.resilience import guard
+
+load_dotenv()
+
+XAI_API_URL = (os.getenv("XAI_BASE_URL") or "https://api.x.ai/v1").rstrip("/") + "/chat/completions"
+NEWS_MODEL = os.getenv("GROK_NEWS_MODEL", "grok-4-fast")
+
+NEWS_CACHE_FILE = "x_news.json"
+
+# Posts older than this are dropped from the local store
+NEWS_RETENTION_DAYS = int(os.getenv("GROK_NEWS_RETENTION_DAYS", "14"))
+
+# A query fetched this recently is answered from the store without calling Grok
+NEWS_MIN_REFRESH_SECONDS = int(os.getenv("GROK_NEWS_MIN_REFRESH", "900"))
+
+# Search results per Grok call: a full window the first time, only new posts afterwards
+FULL_SEARCH_RESULTS = 30
+INCREMENTAL_SEARCH_RESULTS = 15
+
+# Only surface posts with at least this many views (Live Search source filter)
+MIN_POST_VIEWS = 100000
+
+# Word-shingle overlap above which two posts are the same story
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+EXTRACTION_PROMPT = """You collect X (Twitter) posts for a news briefing. Search X for the user's query and return
+every relevant post you found as JSON: {"posts": [{"url": "...", "author": "@handle (Display Name)",
+"text": "full post text", "posted_at": "ISO 8601 timestamp", "likes": 0, "reposts": 0, "replies": 0,
+"views": 0, "external_links": ["links that appear in the post or its thread only"]}]}.
+Use only URLs and numbers that appear in the search results; use null when unknown. Never invent links."""
+
+STATUS_RE = re.compile(r"(?:twitter\.com|x\.com)/(?:[^/\s]+/status(?:es)?|i/web/status)/(\d+)", re.I)
+REPOST_RE = re.compile(r"^RT @\w+:\s*")
+URL_RE = re.compile(r"https?://\S+|@\w+")
+WORD_RE = re.compile(r"\w+")
+
+_lock = threading.Lock()
+
+
+def status_id(url):
+    """
+    Tweet ID of a post URL, or None if it is not a post URL.
+    """
+    match = STATUS_RE.search(url or "")
+    return match.group(1) if match else None
+
+
+def _shingles(text):
+    """
+    Word 3-grams of a post's text, ignoring the repost prefix, links, mentions, numbers and case.
+    """
+    text = URL_RE.sub(" ", REPOST_RE.sub("", text or "")).lower()
+    words = [word for word in WORD_RE.findall(text) if not word.isdigit()]
+    if len(words) < 3:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + 3]) for i in range(len(words) - 2)}
+
+
+def similarity(a, b):
+    """
+    Jaccard similarity of two shingle sets.
+    """
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _timestamp(value):
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return (parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)).timestamp()
+
+
+def _query_key(query):
+    return " ".join(query.lower().split())
+
+
+def _number(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _text_id(text):
+    """
+    ID of a post without a URL: a hash of its text, ignoring the repost prefix, case and spacing.
+    """
+    text = " ".join(REPOST_RE.sub("", text).lower().split())
+    return "text:" + hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _normalize_post(raw, now):
+    url = (raw.get("url") or "").strip()
+    text = raw.get("text") or ""
+    return {
+        "id": status_id(url) or url or _text_id(text),
+        "url": url,
+        "author": raw.get("author"),
+        "text": text,
+        "posted_at": raw.get("posted_at"),
+        "likes": _number(raw.get("likes")),
+        "reposts": _number(raw.get("reposts")),
+        "replies": _number(raw.get("replies")),
+        "views": _number(raw.get("views")),
+        "external_links": [link for link in raw.get("external_links") or [] if isinstance(link, str)],
+        "first_seen": now,
+        "duplicate_urls": [],
+        "queries": [],
+    }
+
+
+def _merge(kept, duplicate):
+    """
+    Fold a duplicate into the post kept for the story.
+    """
+    for url in [duplicate["url"], *duplicate["duplicate_urls"]]:
+        if url and url != kept["url"] and url not in kept["duplicate_urls"]:
+            kept["duplicate_urls"].append(url)
+    for field in ("likes", "reposts", "replies", "views"):
+        values = [value for value in (kept[field], duplicate[field]) if value is not None]
+        kept[field] = max(values) if values else None
+    for link in duplicate["external_links"]:
+        if link not in kept["external_links"]:
+            kept["external_links"].append(link)
+    for query in duplicate["queries"]:
+        if query not in kept["queries"]:
+            kept["queries"].append(query)
+
+
+def dedupe(store, incoming):
+    """
+    Add posts to the store, folding reposts and near-identical posts into the ones already there.
+
+    Returns:
+        list: IDs of the posts that were new stories
+    """
+    shingles = {post_id: _shingles(post["text"]) for post_id, post in store.items()}
+    index = LSHIndex()
+    for post_id, post_shingles in shingles.items():
+        index.add(post_id, signature(post_shingles))
+    by_url = {url: post_id for post_id, post in store.items() for url in [post["url"], *post["duplicate_urls"]] if url}
+    added = []
+    for post in incoming:
+        if not post["url"] and not post["text"]:
+            continue
+        match = post["id"] if post["id"] in store else by_url.get(post["url"]) if post["url"] else None
+        post_shingles = _shingles(post["text"])
+        post_signature = signature(post_shingles)
+        if match is None:
+            # Only posts sharing an LSH band are compared, not the whole store
+            match = next((post_id for post_id in index.candidates(post_signature)
+                          if similarity(post_shingles, shingles[post_id]) >= NEAR_DUPLICATE_THRESHOLD), None)
+        if match is not None:
+            _merge(store[match], post)
+            continue
+        store[post["id"]] = post
+        shingles[post["id"]] = post_shingles
+        index.add(post["id"], post_signature)
+        if post["url"]:
+            by_url[post["url"]] = post["id"]
+        added.append(post["id"])
+    return added
+
+
+def search_x(query, from_date, max_results):
+    """
+    One Grok Live Search over X posts since from_date (YYYY-MM-DD).
+
+    Returns:
+        list: raw post dicts, plus bare {"url": ...} entries for cited posts Grok did not describe
+    """
+    api_key = os.getenv("XAI_API_KEY")
+    if not api_key:
+        raise RuntimeError("XAI_API_KEY environment variable not found")
+    payload = {
+        "model": NEWS_MODEL,
+        "messages": [
+            {"role": "system", "content": EXTRACTION_PROMPT},
+            {"role": "user", "content": query},
+        ],
+        "response_format": {"type": "json_object"},
+        "search_parameters": {
+            "mode": "on",
+            "from_date": from_date,
+            "return_citations": True,
+            "sources": [{"type": "x", "post_view_count": MIN_POST_VIEWS}],
+            "max_search_results": max_results,
+        },
+    }
+
+    def post():
+        response = httpx.post(XAI_API_URL, json=payload, headers={"Authorization": f"Bearer {api_key}"},
+                              timeout=120)
+        response.raise_for_status()
+        return response.json()
+
+    data = guard("xai").call(post)
+    try:
+        posts = json.loads(data["choices"][0]["message"]["content"]).get("posts") or []
+    except (KeyError, IndexError, TypeError, ValueError):
+        posts = []
+    posts = [post for post in posts if isinstance(post, dict)]
+    described = {status_id(post.get("url")) for post in posts}
+    citations = [url for url in data.get("citations") or [] if isinstance(url, str)]
+    return posts + [{"url": url} for url in citations if status_id(url) and status_id(url) not in described]
+
+
+def recent_posts(days=3):
+    """
+    Stored posts from every query published (or first seen) within the last `days` days, newest first.
+    """
+    window_start = time.time() - days * 86400
+    with _lock:
+        posts = load_json(NEWS_CACHE_FILE, {"posts": {}})["posts"]
+    recent = [post for post in posts.values() if (_timestamp(post["posted_at"]) or post["first_seen"]) >= window_start]
+    recent.sort(key=lambda post: _timestamp(post["posted_at"]) or post["first_seen"], reverse=True)
+    return recent
+
+
+def _prune(cache, now):
+    """
+    Drop posts and queries that left the retention window.
+    """
+    cutoff = now - NEWS_RETENTION_DAYS * 86400
+    cache["posts"] = {
+        post_id: post for post_id, post in cache["posts"].items()
+        if (_timestamp(post["posted_at"]) or post["first_seen"]) >= cutoff
+    }
+    cache["queries"] = {
+        name: {**state, "covered_from": max(state["covered_from"], cutoff)}
+        for name, state in cache["queries"].items() if state["fetched_at"] >= cutoff
+    }
+
+
+def collect(query, days=3, refresh=False):
+    """
+    Posts about `query` from the last `days` days, fetching only what is new since the last search.
+
+    Returns:
+        dict: posts (newest first, with `new` set on the ones first seen by this call),
+            fetched (whether Grok was called), from_date and counts
+    """
+    now = time.time()
+    key = _query_key(query)
+    window_start = now - days * 86400
+
+    with _lock:
+        cache = load_json(NEWS_CACHE_FILE, {"posts": {}, "queries": {}})
+
+    # When the query was last fetched, and how far back the stored posts for it reach
+    state = cache["queries"].get(key, {"fetched_at": 0, "covered_from": now})
+    covered = state["covered_from"] <= window_start
+    fetched = refresh or not covered or now - state["fetched_at"] >= NEWS_MIN_REFRESH_SECONDS
+    added = []
+    from_date = None
+    if fetched:
+        # Only ask for posts since the last fetch when the store already covers the rest of the window
+        since = state["fetched_at"] if covered and not refresh else window_start
+        from_date = datetime.fromtimestamp(since, timezone.utc).strftime("%Y-%m-%d")
+        results = INCREMENTAL_SEARCH_RESULTS if since > window_start else FULL_SEARCH_RESULTS
+        # The search is made without the lock, so other queries and readers do not wait on it
+        incoming = [_normalize_post(raw, now) for raw in search_x(query, from_date, results)]
+        for post in incoming:
+            post["queries"] = [key]
+
+        with _lock:
+            # Other searches may have saved while this one was running
+            cache = load_json(NEWS_CACHE_FILE, {"posts": {}, "queries": {}})
+            added = dedupe(cache["posts"], incoming)
+            state = cache["queries"].get(key, state)
+            cache["queries"][key] = {"fetched_at": now, "covered_from": min(state["covered_from"], since)}
+            _prune(cache, now)
+            save_json(NEWS_CACHE_FILE, cache)
+    else:
+        _prune(cache, now)
+    posts = cache["posts"]
+
+    added = set(added)
+    results = [
+        {**post, "new": post_id in added}
+        for post_id, post in posts.items()
+        if key in post["queries"] and (_timestamp(post["posted_at"]) or post["first_seen"]) >= window_start
+    ]
+    results.sort(key=lambda post: _timestamp(post["posted_at"]) or post["first_seen"], reverse=True)
+    return {
+        "query": query,
+        "window_days": days,
+        "fetched": fetched,
+        "from_date": from_date,
+        "new_posts": len(added),
+        "posts": results,
+    }
+
+
+if __name__ == "__main__":
+    result = collect(sys.argv[1] if len(sys.argv) > 1 else "AI agents",
+                     int(sys.argv[2]) if len(sys.argv) > 2 else 3, refresh=True)
+    print(f"{len(result['posts'])} posts ({result['new_posts']} new) since {result['from_date']}")
+    for post in result["posts"]:
+        print(f"- {post['posted_at'] or '?'} {post['author'] or ''} {post['url']}")
@@ -8,11 +8,17 @@ load_dotenv()
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
-from agency import create_agency
+from agency import PREFETCH_JOBS, create_agency
 from agency_swarm.integrations.fastapi import run_fastapi
+from common.scheduler import start_prefetch
+from common.tracing import setup_tracing
 
 
 if __name__ == "__main__":
+    # Per-request latency, token and cost breakdown (plus OTLP export when configured)
+    setup_tracing()
+    start_prefetch(PREFETCH_JOBS)
+
     run_fastapi(
         agencies={
             # you must export your create agency function here
@@ -5,6 +5,8 @@ from agents.mcp import MCPServerStdio
 import os
 from dotenv import load_dotenv
 
+from common.scheduler import prefetch_enabled
+
 load_dotenv()
 
 # Readwise Reader MCP Server Configuration
@@ -20,7 +22,10 @@ readwise_reader_server = MCPServerStdio(
             os.path.join(path_to_readwise_mcp, "dist/index.js")
         ],
         "env": {
-            "READWISE_TOKEN": os.getenv("READWISE_TOKEN", "your_readwise_token")
+            "READWISE_TOKEN": os.getenv("READWISE_TOKEN", "your_readwise_token"),
+            # The newsletter digest reads later/email documents; keep a local copy of that feed synced
+            "READWISE_PREFETCH": os.getenv("READWISE_PREFETCH", "later:email") if prefetch_enabled() else "",
+            "READWISE_PREFETCH_INTERVAL": os.getenv("READWISE_PREFETCH_INTERVAL", "600"),
         }
     },
     cache_tools_list=True,
@@ -0,0 +1,205 @@
+"""
+Analytical queries over the local YouTube dataset with DuckDB.
+
+Answers performance questions from data already collected by batch.py and the tools,
+without spending API quota: every query is a parameterized SQL aggregate returning a
+few compact rows. Tables are read from the columnar copy (columnar.py) when it is
+up to date, otherwise straight from the JSON Lines tables.
+
+Views per day is a video's latest view count divided by its age (at least one day)
+when that count was observed.
+
+Requires duckdb (pip install "py-mcp-youtube-toolbox[analytics]").
+"""
+import os
+import time
+from collections import Counter
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+from columnar import COLUMNAR_DIR, FLOAT_COLUMNS, INT_COLUMNS, TIMESTAMP_COLUMNS
+from dataset import DATASET_DIR, TABLES
+from text_utils import tokenize
+
+# Tables the analyses read
+SOURCE_TABLES = ('videos', 'stats')
+
+# Latest metadata and latest statistics observation per video, with views per day
+BASE_VIEWS = """
+CREATE VIEW latest_videos AS
+    SELECT * FROM videos
+    WHERE video_id IS NOT NULL
+    QUALIFY row_number() OVER (PARTITION BY video_id ORDER BY observed_at DESC) = 1;
+CREATE VIEW performance AS
+    SELECT v.video_id, v.channel_id, v.channel_title, v.title, v.published_at, v.duration_seconds,
+           s.views, s.likes, s.comments, s.observed_at,
+           s.views / greatest(date_diff('second', v.published_at, s.observed_at) / 86400.0, 1.0) AS views_per_day
+    FROM latest_videos v
+    JOIN (SELECT * FROM stats QUALIFY row_number() OVER (PARTITION BY video_id ORDER BY observed_at DESC) = 1) s
+        USING (video_id)
+    WHERE s.views IS NOT NULL AND v.published_at IS NOT NULL;
+"""
+
+# Timestamps leave DuckDB as ISO strings (returning TIMESTAMPTZ values to Python needs pytz)
+ISO = "'%Y-%m-%dT%H:%M:%SZ'"
+
+# Shared filters: one channel, and videos published within the last N days
+FILTERED = """
+    ($channel_id IS NULL OR channel_id = $channel_id)
+    AND ($days IS NULL OR published_at >= now() - to_days(CAST($days AS INTEGER)))
+"""
+
+QUERIES = {
+    'top_videos': f"""
+        SELECT channel_id, channel_title, video_id, title, strftime(published_at, {ISO}) AS published_at, views,
+               round(views_per_day) AS views_per_day, rank
+        FROM (
+            SELECT *, row_number() OVER (PARTITION BY channel_id ORDER BY views_per_day DESC) AS rank
+            FROM performance WHERE {FILTERED}
+        )
+        WHERE rank <= $limit
+        ORDER BY channel_id, rank
+    """,
+    'views_by_title_length': f"""
+        SELECT length(title) // 10 * 10 AS title_length, count(*) AS videos,
+               median(views) AS median_views, round(median(views_per_day)) AS median_views_per_day
+        FROM performance WHERE {FILTERED}
+        GROUP BY 1
+        ORDER BY 1
+    """,
+    'upload_cadence': f"""
+        SELECT channel_id, any_value(channel_title) AS channel_title, count(*) AS uploads,
+               strftime(min(published_at), {ISO}) AS first_upload, strftime(max(published_at), {ISO}) AS last_upload,
+               round(median(gap_days), 1) AS median_days_between_uploads,
+               round(count(*) * 7.0 / greatest(date_diff('day', min(published_at), max(published_at)), 1), 2)
+                   AS uploads_per_week,
+               mode(dayname(published_at)) AS usual_weekday_utc, mode(hour(published_at)) AS usual_hour_utc
+        FROM (
+            SELECT *, date_diff('second', lag(published_at) OVER (PARTITION BY channel_id ORDER BY published_at),
+                                published_at) / 86400.0 AS gap_days
+            FROM latest_videos WHERE published_at IS NOT NULL AND {FILTERED}
+        )
+        GROUP BY channel_id
+        ORDER BY uploads DESC
+        LIMIT $limit
+    """,
+    # Outliers: views per day at least $outlier_ratio times their channel's median
+    'outlier_keywords': f"""
+        SELECT title, views_per_day >= $outlier_ratio * median(views_per_day) OVER (PARTITION BY channel_id) AS outlier
+        FROM performance WHERE {FILTERED}
+    """,
+}
+
+ANALYSES = tuple(QUERIES)
+
+def _require_duckdb() -> None:
+    if duckdb is None:
+        raise ImportError('duckdb is required for dataset analytics: pip install "py-mcp-youtube-toolbox[analytics]"')
+
+def _duckdb_type(column: str) -> str:
+    if column in TIMESTAMP_COLUMNS:
+        return 'TIMESTAMPTZ'
+    if column in INT_COLUMNS:
+        return 'BIGINT'
+    if column in FLOAT_COLUMNS:
+        return 'DOUBLE'
+    return 'VARCHAR[]' if column == 'tags' else 'VARCHAR'
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+def _columnar_is_fresh(table: str, dataset_dir: str, columnar_dir: str) -> bool:
+    """
+    True if the table has a columnar copy written after its JSON Lines file last changed
+    """
+    copy, source = os.path.join(columnar_dir, table), os.path.join(dataset_dir, f"{table}.jsonl")
+    if not os.path.isdir(copy):
+        return False
+    return not os.path.exists(source) or os.path.getmtime(copy) >= os.path.getmtime(source)
+
+def connect(dataset_dir: str = DATASET_DIR, columnar_dir: Optional[str] = None) -> tuple:
+    """
+    An in-memory DuckDB connection with the dataset tables and base views; returns (connection, source per table)
+    """
+    _require_duckdb()
+    columnar_dir = columnar_dir or (COLUMNAR_DIR if dataset_dir == DATASET_DIR else os.path.join(dataset_dir, "columnar"))
+    con = duckdb.connect()
+    con.execute("SET TimeZone = 'UTC'")
+    sources = {}
+    for table in SOURCE_TABLES:
+        if _columnar_is_fresh(table, dataset_dir, columnar_dir):
+            try:
+                from columnar import open_table
+                # A memory-mapped pyarrow dataset; DuckDB scans it in place
+                con.register(table, open_table(table, columnar_dir))
+                sources[table] = 'columnar'
+                continue
+            except ImportError:
+                pass
+        path = os.path.join(dataset_dir, f"{table}.jsonl")
+        columns = ', '.join(f"{column} {_duckdb_type(column)}" for column in TABLES[table])
+        if os.path.exists(path) and os.path.getsize(path):
+            types = ', '.join(f"{_quote(column)}: {_quote(_duckdb_type(column))}" for column in TABLES[table])
+            con.execute(f"CREATE VIEW {table} AS SELECT * FROM read_json({_quote(path)}, "
+                        f"format = 'newline_delimited', columns = {{{types}}})")
+        else:
+            con.execute(f"CREATE TABLE {table} ({columns})")
+        sources[table] = 'jsonl'
+    con.execute(BASE_VIEWS)
+    return con, sources
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, float):
+        return round(value, 2)
+    return value
+
+def _rows(cursor: Any) -> List[Dict[str, Any]]:
+    columns = [column[0] for column in cursor.description]
+    return [{column: _jsonable(value) for column, value in zip(columns, row)} for row in cursor.fetchall()]
+
+def _outlier_keywords(rows: List[Dict[str, Any]], limit: int) -> Dict[str, Any]:
+    """
+    Words over-represented in outlier titles: share of outlier titles containing the word over its share of all titles
+    """
+    outlier_counts, all_counts = Counter(), Counter()
+    outliers = 0
+    for row in rows:
+        words = set(tokenize(row['title'] or ''))
+        all_counts.update(words)
+        if row['outlier']:
+            outliers += 1
+            outlier_counts.update(words)
+    keywords = [
+        {'keyword': word, 'outlierTitles': count, 'allTitles': all_counts[word],
+         'lift': round((count / outliers) / (all_counts[word] / len(rows)), 2)}
+        for word, count in outlier_counts.items() if count >= 2 or outliers < 10
+    ]
+    keywords.sort(key=lambda k: (k['outlierTitles'] * k['lift'], k['outlierTitles']), reverse=True)
+    return {'videos': len(rows), 'outliers': outliers, 'rows': keywords[:limit]}
+
+def analyze(analysis: str, channel_id: Optional[str] = None, days: Optional[int] = None, limit: int = 10,
+            outlier_ratio: float = 3.0, dataset_dir: str = DATASET_DIR) -> Dict[str, Any]:
+    """
+    Run one of ANALYSES with its parameters; returns the rows plus where the data came from
+    """
+    if analysis not in QUERIES:
+        raise ValueError(f"Unknown analysis '{analysis}'. Choose one of: {', '.join(ANALYSES)}")
+    start = time.perf_counter()
+    con, sources = connect(dataset_dir)
+    try:
+        params = {'channel_id': channel_id, 'days': days, 'limit': limit, 'outlier_ratio': outlier_ratio}
+        # DuckDB rejects parameters the statement does not use
+        used = {name: value for name, value in params.items() if f"${name}" in QUERIES[analysis]}
+        rows = _rows(con.execute(QUERIES[analysis], used))
+    finally:
+        con.close()
+    result = _outlier_keywords(rows, limit) if analysis == 'outlier_keywords' else {'rows': rows}
+    return {'analysis': analysis, **result, 'sources': sources,
+            'elapsedMs': round((time.perf_counter() - start) * 1000, 1)}
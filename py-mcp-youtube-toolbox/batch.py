@@ -0,0 +1,236 @@
+"""
+Batch collection: build the local YouTube dataset offline instead of during a chat session.
+
+Takes a watchlist of channels (IDs, @handles or URLs, one per line) and/or a CSV of
+video IDs, then collects metadata, statistics, transcripts and comments through a
+parallel worker pool into the local dataset (see dataset.py). Every finished task is
+checkpointed, so an interrupted run resumes where it stopped.
+
+Usage:
+    python batch.py --channels watchlist.txt --uploads 30
+    python batch.py --videos videos.csv --no-comments --workers 4
+    python batch.py --channels watchlist.txt --run 2025-06-01   # resume a named run
+    python batch.py --channels watchlist.txt --export parquet   # then refresh the Parquet copy
+
+Metadata and statistics are re-collected once per run (default: one run per UTC day)
+so the stats table accumulates observations over time; transcripts and comments are
+collected once per video.
+"""
+import argparse
+import csv
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from googleapiclient.errors import HttpError
+
+from dataset import (Dataset, DATASET_DIR, channel_row, comment_rows, now_iso, transcript_rows,
+                     video_rows)
+from feeds import read_watchlist
+
+logger = logging.getLogger("batch")
+
+def read_video_csv(path: str) -> List[str]:
+    """
+    Video IDs or URLs from the 'video_id' (or 'url') column, or the first column if there is no header
+    """
+    with open(path, encoding='utf-8', newline='') as f:
+        rows = list(csv.reader(f))
+    if not rows:
+        return []
+    header = [cell.strip().lower() for cell in rows[0]]
+    for column in ('video_id', 'videoid', 'id', 'url'):
+        if column in header:
+            index = header.index(column)
+            return [row[index].strip() for row in rows[1:] if len(row) > index and row[index].strip()]
+    return [row[0].strip() for row in rows if row and row[0].strip()]
+
+def permanent(error: Exception) -> bool:
+    """
+    Failures that will not go away on resume (comments disabled, video removed, no transcript)
+    """
+    if isinstance(error, HttpError):
+        return error.resp.status in (403, 404) and 'quotaExceeded' not in str(error.content)
+    return isinstance(error, (LookupError, ValueError))
+
+class BatchRun:
+    def __init__(self, service, dataset: Dataset, run: str, workers: int = 8, language: str = 'en',
+                 comments: int = 100, transcripts: bool = True):
+        self.service = service
+        self.dataset = dataset
+        self.run = run
+        self.workers = workers
+        self.language = language
+        self.comments = comments
+        self.transcripts = transcripts
+        self.observed_at = now_iso()
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _stage(self, stage: str) -> Dict[str, int]:
+        return self.counts.setdefault(stage, {'done': 0, 'skipped': 0, 'failed': 0, 'cached': 0, 'rows': 0})
+
+    def _task(self, task: str, stage: str, fn: Callable[[], int]) -> None:
+        """
+        Run one checkpointed task; fn returns the number of rows written
+        """
+        counts = self.counts[stage]
+        try:
+            rows = fn()
+            self.dataset.mark(task, 'done')
+            with self._lock:
+                counts['rows'] += rows
+                counts['done'] += 1
+        except Exception as e:
+            status = 'skipped' if permanent(e) else 'failed'
+            self.dataset.mark(task, status, f"{type(e).__name__}: {e}"[:300])
+            with self._lock:
+                counts[status] += 1
+            logger.warning(f"{task} {status}: {e}")
+
+    def _parallel(self, stage: str, tasks: List[Tuple[str, Callable[[], int]]]) -> None:
+        pending = [(task, fn) for task, fn in tasks if not self.dataset.is_done(task)]
+        self._stage(stage)['cached'] += len(tasks) - len(pending)
+        if not pending:
+            return
+        print(f"  {stage}: {len(pending)} tasks ({len(tasks) - len(pending)} already done)", flush=True)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=stage) as pool:
+            futures = [pool.submit(self._task, task, stage, fn) for task, fn in pending]
+            for finished, _ in enumerate(as_completed(futures), 1):
+                if finished % 50 == 0:
+                    print(f"  {stage}: {finished}/{len(pending)}", flush=True)
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def collect_channels(self, channels: List[str], uploads: int) -> List[str]:
+        """
+        Channel rows plus the latest uploads of each channel; returns their video IDs
+        """
+        video_ids: Dict[str, None] = {}
+
+        def channel(reference: str) -> int:
+            result = self.service.get_channel_uploads(reference, uploads)
+            self.dataset.append('channels', [channel_row(result['channel'], self.observed_at)])
+            # Remember the uploads so a resumed run knows them without another call
+            self.dataset.mark(f"uploads:{self.run}:{reference}", 'done', ','.join(result['videoIds']))
+            return 1
+
+        self._parallel('channels', [(f"channel:{self.run}:{reference}", lambda reference=reference: channel(reference))
+                                    for reference in channels])
+
+        # Read the upload lists back from the checkpoint (covers channels finished by an earlier attempt)
+        wanted = {f"uploads:{self.run}:{reference}" for reference in channels}
+        for entry in self.dataset.checkpoint_entries():
+            if entry['task'] in wanted and entry.get('detail'):
+                video_ids.update(dict.fromkeys(entry['detail'].split(',')))
+        return list(video_ids)
+
+    def collect_details(self, video_ids: List[str]) -> None:
+        """
+        Metadata and a statistics observation per video, 50 videos per API call
+        """
+        def details(batch: List[str]) -> int:
+            items = self.service.get_videos(batch)
+            rows = [video_rows(item, self.observed_at) for item in items]
+            self.dataset.append('videos', [video for video, _ in rows])
+            self.dataset.append('stats', [stats for _, stats in rows])
+            # Mark each video so resumes are exact even if the batch boundaries shift
+            for video_id in batch:
+                self.dataset.mark(f"details:{self.run}:{video_id}", 'done')
+            return len(items)
+
+        pending = [video_id for video_id in video_ids if not self.dataset.is_done(f"details:{self.run}:{video_id}")]
+        batches = [pending[i:i + 50] for i in range(0, len(pending), 50)]
+        self._stage('details')['cached'] += len(video_ids) - len(pending)
+        self._parallel('details', [(f"details-batch:{self.run}:{batch[0]}:{len(batch)}", lambda batch=batch: details(batch))
+                                   for batch in batches])
+
+    def collect_transcripts(self, video_ids: List[str]) -> None:
+        def transcript(video_id: str) -> int:
+            result = self.service.get_video_transcript(video_id, self.language)
+            if not result:
+                raise LookupError(f"No transcript for {video_id}")
+            return self.dataset.append('transcript_segments', transcript_rows(result, self.observed_at))
+
+        self._parallel('transcripts', [(f"transcript:{video_id}", lambda video_id=video_id: transcript(video_id))
+                                       for video_id in video_ids])
+
+    def collect_comments(self, video_ids: List[str]) -> None:
+        def comments(video_id: str) -> int:
+            response = self.service.get_video_comments(video_id, min(self.comments, 100), order='relevance')
+            return self.dataset.append('comments', comment_rows(video_id, response, self.observed_at))
+
+        self._parallel('comments', [(f"comments:{video_id}", lambda video_id=video_id: comments(video_id))
+                                    for video_id in video_ids])
+
+    def report(self) -> None:
+        print(f"\n{'stage':<12} {'done':>6} {'cached':>7} {'skipped':>8} {'failed':>7} {'rows':>8}")
+        for stage, c in self.counts.items():
+            print(f"{stage:<12} {c['done']:>6} {c['cached']:>7} {c['skipped']:>8} {c['failed']:>7} {c['rows']:>8}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Collect YouTube data for a channel watchlist or video list into the local dataset")
+    parser.add_argument("--channels", help="Watchlist file: channel IDs, @handles or channel URLs, one per line")
+    parser.add_argument("--videos", help="CSV of video IDs or URLs ('video_id' or 'url' column, or the first column)")
+    parser.add_argument("--uploads", type=int, default=25, help="Latest uploads collected per channel")
+    parser.add_argument("--workers", type=int, default=8, help="Parallel workers")
+    parser.add_argument("--language", default="en", help="Transcript language")
+    parser.add_argument("--comments", type=int, default=100, help="Top comments per video (max 100, 0 to skip)")
+    parser.add_argument("--no-comments", action="store_true", help="Skip comments")
+    parser.add_argument("--no-transcripts", action="store_true", help="Skip transcripts")
+    parser.add_argument("--run", default=datetime.now(timezone.utc).date().isoformat(),
+                        help="Run name; metadata and stats are collected once per run (default: today, UTC)")
+    parser.add_argument("--dataset", default=DATASET_DIR, help="Dataset directory")
+    parser.add_argument("--export", choices=("parquet", "arrow"),
+                        help="Afterwards, rewrite the partitioned columnar copy in this format (requires pyarrow, see columnar.py)")
+    args = parser.parse_args(argv)
+
+    if not args.channels and not args.videos:
+        parser.error("pass --channels and/or --videos")
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    # Imported late: the server module validates YOUTUBE_API_KEY and builds the clients on import
+    from server import youtube_service
+    from metrics import metrics
+
+    started = time.perf_counter()
+    run = BatchRun(youtube_service, Dataset(args.dataset), args.run, workers=args.workers, language=args.language,
+                   comments=0 if args.no_comments else args.comments, transcripts=not args.no_transcripts)
+    print(f"Run {args.run} -> {args.dataset}")
+
+    video_ids: List[str] = []
+    if args.channels:
+        video_ids += run.collect_channels(read_watchlist(args.channels), args.uploads)
+    if args.videos:
+        video_ids += [youtube_service.parse_url(video) for video in read_video_csv(args.videos)]
+    video_ids = list(dict.fromkeys(video_ids))
+    print(f"  {len(video_ids)} videos")
+
+    run.collect_details(video_ids)
+    if run.transcripts:
+        run.collect_transcripts(video_ids)
+    if run.comments:
+        run.collect_comments(video_ids)
+
+    run.report()
+    if args.export:
+        from columnar import export
+        root = os.getenv("YOUTUBE_COLUMNAR_DIR") or os.path.join(args.dataset, "columnar")
+        rows = export(run.dataset, root, args.export)
+        print(f"\nExported {sum(rows.values())} rows to {root}")
+    snapshot = metrics.snapshot()
+    print(f"\n{time.perf_counter() - started:.1f}s, {snapshot['quotaUnitsTotal']} quota units")
+    failed = sum(c['failed'] for c in run.counts.values())
+    if failed:
+        print(f"⚠️  {failed} tasks failed; run the same command again to retry them")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
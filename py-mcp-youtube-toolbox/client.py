@@ -169,7 +169,8 @@ if __name__ == "__main__":
         print("  3. Resource 이름 또는 URI")
         print("\n사용 가능한 Tool 이름:")
         print("  search_videos, get_video_details, get_channel_details,")
-        print("  get_video_comments, get_video_transcript, get_related_videos, get_trending_videos, get_video_enhanced_transcript")
+        print("  get_video_comments, get_video_transcript, get_related_videos, get_trending_videos, get_video_enhanced_transcript,")
+        print("  get_video_chapters")
         print("\n사용 가능한 Prompt 이름:")
         print("  transcript_summary")
         print("\n사용 가능한 Resource URI 예시:")
@@ -203,7 +204,7 @@ if __name__ == "__main__":
                 value = value.strip()
 
                 # 배열 형태의 파라미터 처리 (쉼표로 구분)
-                array_param_keys = ['video_ids']  # enhanced_transcript 도구는 video_ids를 리스트로 받음
+                array_param_keys = ['video_ids', 'fields', 'queries']  # enhanced_transcript 도구는 video_ids를, harvest 도구는 queries를, 나머지 도구는 fields를 리스트로 받음
                 
                 # 계층적 파라미터 처리 (예: filters.timeRange.start)
                 if '.' in key:
@@ -231,7 +232,7 @@ if __name__ == "__main__":
                 elif key in array_param_keys:
                     arguments[key] = value.split(',')
                 # 숫자형 파라미터 처리
-                elif key in ['max_results'] and value.isdigit():
+                elif key in ['max_results', 'page_size', 'chapter_count', 'chapter_index', 'quota_budget', 'sentence_count', 'keyword_count', 'max_tokens'] and value.isdigit():
                     arguments[key] = int(value)
                 # 불리언 파라미터 처리
                 elif key in ['include_replies', 'include_metadata'] and value.lower() in ['true', 'false']:
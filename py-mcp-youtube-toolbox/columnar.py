@@ -0,0 +1,194 @@
+"""
+Columnar copy of the local dataset for fast offline analytics.
+
+Converts the JSON Lines tables written by batch.py and the tools (see dataset.py) into
+typed Parquet files, or Arrow IPC files, partitioned by observation date and channel:
+
+    data/columnar/videos/date=2025-06-01/channel_id=UC.../part-0-0.parquet
+
+Comments, search results and transcript segments carry their video's channel ID, so
+every table can be filtered by channel and date without reading the others.
+Files are opened memory-mapped, and Arrow IPC files are read without copying.
+
+Usage:
+    python columnar.py                  # export every table as Parquet (zstd)
+    python columnar.py --format arrow   # Arrow IPC, for zero-copy memory-mapped reads
+    python columnar.py --tables videos stats
+
+Requires pyarrow (pip install "py-mcp-youtube-toolbox[analytics]").
+"""
+import argparse
+import os
+import shutil
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    from pyarrow import fs
+except ImportError:
+    pa = ds = fs = None
+
+from dataset import Dataset, DATASET_DIR, TABLES
+
+# Exported next to the JSON Lines tables (override with YOUTUBE_COLUMNAR_DIR)
+COLUMNAR_DIR = os.getenv("YOUTUBE_COLUMNAR_DIR", os.path.join(DATASET_DIR, "columnar"))
+
+# Rows converted and written at a time, bounding memory use on large tables
+CHUNK_ROWS = 100_000
+
+# Partition value for rows whose channel or date is unknown
+UNKNOWN = 'unknown'
+
+FORMATS = {'parquet': 'parquet', 'arrow': 'arrow'}
+
+TIMESTAMP_COLUMNS = {'published_at', 'observed_at'}
+INT_COLUMNS = {'subscribers', 'views', 'video_count', 'duration_seconds', 'likes', 'comments', 'reply_count',
+               'segment', 'rank'}
+FLOAT_COLUMNS = {'start', 'duration'}
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError('pyarrow is required for the columnar export: pip install "py-mcp-youtube-toolbox[analytics]"')
+
+def schema(table: str) -> 'pa.Schema':
+    """
+    Arrow schema of a table: its dataset.py columns, typed, plus the date and channel_id partition columns
+    """
+    _require_pyarrow()
+    fields = []
+    for column in TABLES[table]:
+        if column in TIMESTAMP_COLUMNS:
+            fields.append(pa.field(column, pa.timestamp('s', tz='UTC')))
+        elif column in INT_COLUMNS:
+            fields.append(pa.field(column, pa.int64()))
+        elif column in FLOAT_COLUMNS:
+            fields.append(pa.field(column, pa.float64()))
+        elif column == 'tags':
+            fields.append(pa.field(column, pa.list_(pa.string())))
+        elif column != 'channel_id':
+            fields.append(pa.field(column, pa.string()))
+    return pa.schema(fields + [pa.field('date', pa.string()), pa.field('channel_id', pa.string())])
+
+def _timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def _typed(row: Dict[str, Any], channels: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Parse timestamps and add the partition columns
+    """
+    typed = {column: _timestamp(value) if column in TIMESTAMP_COLUMNS else value for column, value in row.items()}
+    observed_at = typed.get('observed_at')
+    typed['date'] = observed_at.date().isoformat() if observed_at else UNKNOWN
+    typed['channel_id'] = row.get('channel_id') or channels.get(row.get('video_id')) or UNKNOWN
+    return typed
+
+def _chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _partitioning() -> 'ds.Partitioning':
+    return ds.partitioning(pa.schema([('date', pa.string()), ('channel_id', pa.string())]), flavor='hive')
+
+def export_table(dataset: Dataset, table: str, root: str = COLUMNAR_DIR, format: str = 'parquet',
+                 channels: Optional[Dict[str, str]] = None) -> int:
+    """
+    Rewrite one table's columnar copy from its JSON Lines rows; returns the number of rows written.
+    The new copy is built next to the old one and swapped in, so readers never see a partial table.
+    """
+    _require_pyarrow()
+    if channels is None:
+        channels = {video_id: row.get('channel_id') for video_id, row in dataset.latest('videos', 'video_id').items()}
+    table_schema = schema(table)
+    target = os.path.join(root, table)
+    staging = f"{target}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+
+    if format == 'parquet':
+        file_format = ds.ParquetFileFormat()
+        file_options = file_format.make_write_options(compression='zstd')
+    else:
+        # Uncompressed, so memory-mapped reads need no decoding
+        file_format = ds.IpcFileFormat()
+        file_options = file_format.make_write_options(compression=None)
+
+    written = 0
+    for index, chunk in enumerate(_chunks(dataset.rows(table), CHUNK_ROWS)):
+        batch = pa.Table.from_pylist([_typed(row, channels) for row in chunk], schema=table_schema)
+        ds.write_dataset(batch, staging, format=file_format, file_options=file_options,
+                         partitioning=_partitioning(), basename_template=f"part-{index}-{{i}}.{FORMATS[format]}",
+                         existing_data_behavior='overwrite_or_ignore')
+        written += batch.num_rows
+
+    previous = f"{target}.old"
+    shutil.rmtree(previous, ignore_errors=True)
+    if os.path.exists(target):
+        os.replace(target, previous)
+    if written:
+        os.replace(staging, target)
+    shutil.rmtree(previous, ignore_errors=True)
+    return written
+
+def export(dataset: Dataset, root: str = COLUMNAR_DIR, format: str = 'parquet',
+           tables: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    Export the given tables (default: all); returns rows written per table
+    """
+    _require_pyarrow()
+    os.makedirs(root, exist_ok=True)
+    channels = {video_id: row.get('channel_id') for video_id, row in dataset.latest('videos', 'video_id').items()}
+    return {table: export_table(dataset, table, root, format, channels) for table in (tables or TABLES)}
+
+def open_table(table: str, root: str = COLUMNAR_DIR) -> 'ds.Dataset':
+    """
+    A lazily read, memory-mapped view of an exported table. Filter on the partition columns to skip files:
+
+        open_table('stats').to_table(filter=ds.field('channel_id') == 'UC...', columns=['video_id', 'views'])
+    """
+    _require_pyarrow()
+    path = os.path.join(root, table)
+    if not os.path.isdir(path):
+        # Not exported yet, or no rows
+        return ds.dataset(schema(table).empty_table())
+    files = [name for _, _, names in os.walk(path) for name in names]
+    format = 'ipc' if any(name.endswith('.arrow') for name in files) else 'parquet'
+    return ds.dataset(path, format=format, partitioning=_partitioning(), schema=schema(table),
+                      filesystem=fs.LocalFileSystem(use_mmap=True))
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export the local YouTube dataset to partitioned Parquet or Arrow files")
+    parser.add_argument("--dataset", default=DATASET_DIR, help="Dataset directory (JSON Lines tables)")
+    parser.add_argument("--out", default=None, help="Output directory (default: <dataset>/columnar)")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="parquet", help="File format")
+    parser.add_argument("--tables", nargs="+", choices=sorted(TABLES), help="Tables to export (default: all)")
+    args = parser.parse_args(argv)
+
+    try:
+        _require_pyarrow()
+    except ImportError as e:
+        print(f"❌ {e}")
+        return 1
+
+    root = args.out or os.getenv("YOUTUBE_COLUMNAR_DIR") or os.path.join(args.dataset, "columnar")
+    counts = export(Dataset(args.dataset), root, args.format, args.tables)
+    for table, rows in counts.items():
+        print(f"{table:<20} {rows:>10} rows")
+    print(f"-> {root}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+import json
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from transcript import Transcript
+
+# Local dataset written by batch.py and by the tools (override with YOUTUBE_DATASET_DIR)
+DATASET_DIR = os.getenv("YOUTUBE_DATASET_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+
+# Table name -> columns, in order
+TABLES = {
+    'channels': ('channel_id', 'title', 'handle', 'country', 'published_at', 'subscribers', 'views',
+                 'video_count', 'uploads_playlist_id', 'observed_at'),
+    'videos': ('video_id', 'channel_id', 'channel_title', 'title', 'description', 'tags', 'category_id',
+               'published_at', 'duration_seconds', 'default_language', 'observed_at'),
+    'stats': ('video_id', 'channel_id', 'observed_at', 'views', 'likes', 'comments'),
+    'comments': ('comment_id', 'video_id', 'author', 'text', 'likes', 'reply_count', 'published_at', 'observed_at'),
+    'transcript_segments': ('video_id', 'language', 'segment', 'start', 'duration', 'text', 'observed_at'),
+    'search_results': ('query', 'rank', 'video_id', 'channel_id', 'title', 'published_at', 'observed_at'),
+}
+
+CHECKPOINT_FILE = "checkpoint.jsonl"
+
+_DURATION = re.compile(r'P(?:(\d+)D)?T?(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?')
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+def parse_duration(value: Optional[str]) -> Optional[int]:
+    """
+    ISO 8601 duration (PT1H2M3S) to seconds
+    """
+    match = _DURATION.fullmatch(value or '')
+    if not match or not any(match.groups()):
+        return None
+    days, hours, minutes, seconds = (int(g or 0) for g in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+def _int(value: Any) -> Optional[int]:
+    return int(value) if value not in (None, '') else None
+
+def channel_row(item: Dict[str, Any], observed_at: str) -> Dict[str, Any]:
+    snippet, statistics = item.get('snippet', {}), item.get('statistics', {})
+    return {
+        'channel_id': item.get('id'),
+        'title': snippet.get('title'),
+        'handle': snippet.get('customUrl'),
+        'country': snippet.get('country'),
+        'published_at': snippet.get('publishedAt'),
+        'subscribers': _int(statistics.get('subscriberCount')),
+        'views': _int(statistics.get('viewCount')),
+        'video_count': _int(statistics.get('videoCount')),
+        'uploads_playlist_id': item.get('contentDetails', {}).get('relatedPlaylists', {}).get('uploads'),
+        'observed_at': observed_at,
+    }
+
+def video_rows(item: Dict[str, Any], observed_at: str) -> tuple:
+    """
+    Split a videos.list item into a videos row and a stats observation row
+    """
+    snippet, statistics = item.get('snippet', {}), item.get('statistics', {})
+    video = {
+        'video_id': item.get('id'),
+        'channel_id': snippet.get('channelId'),
+        'channel_title': snippet.get('channelTitle'),
+        'title': snippet.get('title'),
+        'description': snippet.get('description'),
+        'tags': snippet.get('tags') or [],
+        'category_id': snippet.get('categoryId'),
+        'published_at': snippet.get('publishedAt'),
+        'duration_seconds': parse_duration(item.get('contentDetails', {}).get('duration')),
+        'default_language': snippet.get('defaultLanguage') or snippet.get('defaultAudioLanguage'),
+        'observed_at': observed_at,
+    }
+    stats = {
+        'video_id': video['video_id'],
+        'channel_id': video['channel_id'],
+        'observed_at': observed_at,
+        'views': _int(statistics.get('viewCount')),
+        'likes': _int(statistics.get('likeCount')),
+        'comments': _int(statistics.get('commentCount')),
+    }
+    return video, stats
+
+def comment_rows(video_id: str, response: Dict[str, Any], observed_at: str) -> List[Dict[str, Any]]:
+    rows = []
+    for item in response.get('items', []):
+        top = item.get('snippet', {}).get('topLevelComment', {})
+        snippet = top.get('snippet', {})
+        rows.append({
+            'comment_id': top.get('id') or item.get('id'),
+            'video_id': video_id,
+            'author': snippet.get('authorDisplayName'),
+            'text': snippet.get('textOriginal') or snippet.get('textDisplay'),
+            'likes': _int(snippet.get('likeCount')),
+            'reply_count': _int(item.get('snippet', {}).get('totalReplyCount')),
+            'published_at': snippet.get('publishedAt'),
+            'observed_at': observed_at,
+        })
+    return rows
+
+def transcript_rows(transcript: Transcript, observed_at: Optional[str] = None) -> List[Dict[str, Any]]:
+    return [{
+        'video_id': transcript.video_id,
+        'language': transcript.language,
+        'segment': i,
+        'start': round(transcript.starts[i], 2),
+        'duration': round(transcript.durations[i], 2),
+        'text': transcript.texts[i],
+        'observed_at': observed_at or now_iso(),
+    } for i in range(len(transcript))]
+
+def search_rows(query: str, response: Dict[str, Any], observed_at: str) -> List[Dict[str, Any]]:
+    """
+    Ranked search.list results (search snippets lack statistics and durations, so they are kept apart from videos)
+    """
+    return [{
+        'query': query,
+        'rank': rank,
+        'video_id': item.get('id', {}).get('videoId'),
+        'channel_id': item.get('snippet', {}).get('channelId'),
+        'title': item.get('snippet', {}).get('title'),
+        'published_at': item.get('snippet', {}).get('publishedAt'),
+        'observed_at': observed_at,
+    } for rank, item in enumerate(response.get('items', []), 1)]
+
+class Dataset:
+    """
+    Append-only JSON Lines tables plus a task checkpoint, safe to write from worker threads.
+    Videos and channels are re-observed on every run; readers keep the latest row per key.
+    """
+
+    def __init__(self, root: str = DATASET_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._locks = {name: threading.Lock() for name in (*TABLES, CHECKPOINT_FILE)}
+        self._done = None
+
+    def path(self, table: str) -> str:
+        return os.path.join(self.root, f"{table}.jsonl")
+
+    def append(self, table: str, rows: Iterable[Dict[str, Any]]) -> int:
+        columns = TABLES[table]
+        lines = [json.dumps({c: row.get(c) for c in columns}, ensure_ascii=False) + '\n' for row in rows]
+        if lines:
+            with self._locks[table], open(self.path(table), 'a', encoding='utf-8') as f:
+                f.writelines(lines)
+        return len(lines)
+
+    def rows(self, table: str) -> Iterator[Dict[str, Any]]:
+        try:
+            with open(self.path(table), encoding='utf-8') as f:
+                for line in f:
+                    # A crash mid-write can leave a partial last line
+                    if line.endswith('\n'):
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    def latest(self, table: str, key: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Last written row per key (e.g. the newest metadata per video_id)
+        """
+        return {row[key]: row for row in self.rows(table)}
+
+    # ------------------------------------------------------------------
+    # Checkpoint
+    # ------------------------------------------------------------------
+
+    def checkpoint_entries(self) -> Iterator[Dict[str, Any]]:
+        """
+        Every recorded task outcome, oldest first
+        """
+        try:
+            with open(os.path.join(self.root, CHECKPOINT_FILE), encoding='utf-8') as f:
+                for line in f:
+                    if line.endswith('\n'):
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    def completed(self) -> Dict[str, str]:
+        """
+        Task -> final status ('done' or 'skipped') of every finished task
+        """
+        if self._done is None:
+            self._done = {entry['task']: entry['status'] for entry in self.checkpoint_entries()
+                          if entry['status'] in ('done', 'skipped')}
+        return self._done
+
+    def is_done(self, task: str) -> bool:
+        return task in self.completed()
+
+    def mark(self, task: str, status: str, detail: Optional[str] = None) -> None:
+        """
+        Record a task outcome: 'done', 'skipped' (permanent, e.g. comments disabled) or 'failed' (retried on resume)
+        """
+        entry = {'task': task, 'status': status, 'at': now_iso(), **({'detail': detail} if detail else {})}
+        with self._locks[CHECKPOINT_FILE]:
+            with open(os.path.join(self.root, CHECKPOINT_FILE), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            if status in ('done', 'skipped'):
+                self.completed()[task] = status
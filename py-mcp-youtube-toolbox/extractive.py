@@ -0,0 +1,209 @@
+import math
+import re
+from collections import Counter
+from typing import List, Dict, Any, Iterable, Optional
+
+import numpy as np
+
+from text_utils import WORD_PATTERN, STOPWORDS, tokenize
+from transcript import TranscriptView, format_time
+
+# Sentence building: auto-generated captions have no punctuation, so unpunctuated
+# transcripts are cut into pseudo-sentences of about PSEUDO_SENTENCE_WORDS words
+MIN_SENTENCE_WORDS = 5
+MAX_SENTENCE_WORDS = 60
+PSEUDO_SENTENCE_WORDS = 25
+# Terminal punctuation per word above which a transcript counts as punctuated
+PUNCTUATED_RATIO = 1 / 40
+
+# TextRank parameters
+MAX_VOCABULARY = 4000
+DAMPING = 0.85
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-6
+# Sentences more similar than this to one already selected are skipped
+REDUNDANCY_THRESHOLD = 0.6
+
+# RAKE parameters
+MAX_PHRASE_WORDS = 3
+
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+def split_sentences(view: TranscriptView) -> List[Dict[str, Any]]:
+    """
+    Split a transcript view into sentences (or pseudo-sentences for unpunctuated captions),
+    each starting at the segment it begins in
+
+    Returns:
+        List[Dict[str, Any]]: Sentences with start time and text
+    """
+    starts, texts = view.transcript.starts, view.transcript.texts
+    words = sum(len(texts[i].split()) for i in view.indices)
+    ends = sum(len(re.findall(r'[.!?](?:\s|$)', texts[i])) for i in view.indices)
+    punctuated = words > 0 and ends / words >= PUNCTUATED_RATIO
+    limit = MAX_SENTENCE_WORDS if punctuated else PSEUDO_SENTENCE_WORDS
+
+    sentences: List[Dict[str, Any]] = []
+    current: List[str] = []
+    current_start, current_words = 0.0, 0
+    for i in view.indices:
+        for piece in SENTENCE_END.split(texts[i].strip()):
+            if not piece:
+                continue
+            if not current:
+                current_start = starts[i]
+            current.append(piece)
+            current_words += len(piece.split())
+            if (punctuated and piece[-1] in '.!?' and current_words >= MIN_SENTENCE_WORDS) or current_words >= limit:
+                sentences.append({"start": current_start, "text": " ".join(current)})
+                current, current_words = [], 0
+    if current:
+        sentences.append({"start": current_start, "text": " ".join(current)})
+    return sentences
+
+def tfidf_matrix(documents: List[List[str]]) -> tuple:
+    """
+    L2-normalized TF-IDF (sublinear tf) matrix over the most frequent terms
+
+    Returns:
+        tuple: (document x term matrix, vocabulary)
+    """
+    vocabulary = [term for term, _ in Counter(t for doc in documents for t in doc).most_common(MAX_VOCABULARY)]
+    term_index = {term: j for j, term in enumerate(vocabulary)}
+
+    rows, cols = [], []
+    for r, doc in enumerate(documents):
+        for term in doc:
+            j = term_index.get(term)
+            if j is not None:
+                rows.append(r)
+                cols.append(j)
+
+    counts = np.zeros((len(documents), len(vocabulary)), dtype=np.float32)
+    np.add.at(counts, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), 1.0)
+    document_frequency = (counts > 0).sum(axis=0)
+    idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+    weights = np.log1p(counts, dtype=np.float32) * idf.astype(np.float32)
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    return np.divide(weights, norms, out=np.zeros_like(weights), where=norms > 0), vocabulary
+
+def textrank(similarity: np.ndarray) -> np.ndarray:
+    """
+    PageRank over a sentence similarity graph, by power iteration
+    """
+    n = similarity.shape[0]
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+    weights = similarity.copy()
+    np.fill_diagonal(weights, 0)
+    out_degree = weights.sum(axis=1, keepdims=True)
+    # Sentences sharing no terms with any other link to every sentence
+    transition = np.divide(weights, out_degree, out=np.full_like(weights, 1 / n), where=out_degree > 0)
+
+    ranks = np.full(n, 1 / n, dtype=np.float32)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / n + DAMPING * (transition.T @ ranks)
+        if np.abs(updated - ranks).sum() < TOLERANCE:
+            return updated
+        ranks = updated
+    return ranks
+
+def key_sentences(sentences: List[Dict[str, Any]], count: Optional[int] = None,
+                  max_tokens: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    The most central sentences by TextRank over TF-IDF cosine similarity, skipping near-repeats,
+    in transcript order
+
+    Args:
+        count (int, optional): Sentences to keep (default: about the square root of the sentence count, 3-15)
+        max_tokens (int, optional): Stop before the digest exceeds this many (estimated) tokens
+
+    Returns:
+        List[Dict[str, Any]]: Selected sentences with start time, timestamp, text and score
+    """
+    if not sentences:
+        return []
+    if count is None:
+        count = len(sentences) if max_tokens else min(max(3, round(math.sqrt(len(sentences)))), 15)
+
+    matrix, _ = tfidf_matrix([tokenize(sentence["text"]) for sentence in sentences])
+    similarity = matrix @ matrix.T
+    scores = textrank(similarity)
+    top = float(scores.max()) or 1.0
+
+    selected: List[int] = []
+    tokens = 0
+    for index in np.argsort(-scores, kind='stable'):
+        index = int(index)
+        if len(selected) >= count:
+            break
+        if selected and float(similarity[index, selected].max()) > REDUNDANCY_THRESHOLD:
+            continue
+        sentence_tokens = len(sentences[index]["text"]) // 4 + 1
+        if max_tokens and tokens + sentence_tokens > max_tokens:
+            continue
+        selected.append(index)
+        tokens += sentence_tokens
+
+    return [{
+        "start": sentences[index]["start"],
+        "timestamp": format_time(sentences[index]["start"]),
+        "text": sentences[index]["text"],
+        "score": round(float(scores[index]) / top, 3),
+    } for index in sorted(selected)]
+
+def _candidate_phrases(texts: Iterable[str]) -> List[tuple]:
+    """
+    RAKE candidates: runs of content words between stopwords, digits, punctuation and text (segment)
+    boundaries, at most MAX_PHRASE_WORDS long
+    """
+    phrases = []
+    for fragment in (part for text in texts for part in re.split(r'[.,!?;:()\[\]"]', text.lower())):
+        run: List[str] = []
+        for word in WORD_PATTERN.findall(fragment) + ['']:
+            if len(word) > 1 and not word.isdigit() and word not in STOPWORDS:
+                run.append(word)
+                continue
+            for start in range(0, len(run), MAX_PHRASE_WORDS):
+                phrases.append(tuple(run[start:start + MAX_PHRASE_WORDS]))
+            run = []
+    return phrases
+
+def keywords(texts: Iterable[str], count: int = 10) -> List[Dict[str, Any]]:
+    """
+    Key phrases by RAKE word scores (degree / frequency), weighted by how often the phrase recurs
+    (a YAKE-style preference for repeated phrases over one-off word runs). Phrases never span two texts,
+    so pass transcript segments separately: unpunctuated captions have no other phrase boundaries.
+
+    Returns:
+        List[Dict[str, Any]]: Keywords with score and occurrence count, best first
+    """
+    phrases = _candidate_phrases(texts)
+    if not phrases:
+        return []
+    frequency: Counter = Counter()
+    degree: Counter = Counter()
+    for phrase in phrases:
+        for word in phrase:
+            frequency[word] += 1
+            degree[word] += len(phrase)
+    phrase_counts = Counter(phrases)
+
+    scored = []
+    for phrase, occurrences in phrase_counts.items():
+        # A multi-word phrase seen once is usually an accident of the word run
+        if len(phrase) > 1 and occurrences < 2:
+            continue
+        score = sum(degree[word] / frequency[word] for word in phrase) * math.log1p(occurrences)
+        scored.append((score, occurrences, " ".join(phrase)))
+    scored.sort(key=lambda item: (-item[0], item[2]))
+
+    selected: List[Dict[str, Any]] = []
+    for score, occurrences, phrase in scored:
+        if len(selected) >= count:
+            break
+        # Skip a phrase contained in one already listed
+        if any(f" {phrase} " in f" {other['keyword']} " for other in selected):
+            continue
+        selected.append({"keyword": phrase, "score": round(score, 2), "count": occurrences})
+    return selected
@@ -0,0 +1,184 @@
+# feeds.py
+"""
+Zero-quota upload listings from channel feeds.
+
+Every channel publishes its latest 15 uploads as a public Atom feed
+(https://www.youtube.com/feeds/videos.xml?channel_id=UC...), which costs no API quota.
+Feeds are polled concurrently with conditional GETs (ETag / Last-Modified, so an
+unchanged feed is a bodiless 304). The validators and latest entries of every feed, and
+the channel IDs of resolved @handles, live in one state file, so the agency's
+watchlist prefetch and the toolbox's check_watchlist_uploads share them: a feed one
+of them has just fetched costs the other a 304.
+
+    store = FeedStore(path)
+    feeds, handles = store.load()
+    results = fetch_feeds(channel_ids, feeds)
+    store.save(feeds, handles)
+
+Watchlist files list one channel ID, @handle or channel URL per line; blank lines
+and # comments are ignored.
+
+Shared module: common/feeds.py is the source and py-mcp-youtube-toolbox/feeds.py an
+exact copy; tests/test_shared_modules.py fails while the two differ.
+"""
+import asyncio
+import json
+import os
+import re
+import threading
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+import httpx
+
+# Optional feed root override (e.g. the benchmark stand-in server)
+FEEDS_BASE_URL = (os.getenv("YOUTUBE_FEEDS_BASE_URL") or "https://www.youtube.com").rstrip("/") + "/feeds/videos.xml"
+
+# Feeds fetched at once
+FEED_CONCURRENCY = int(os.getenv("WATCHLIST_FEED_CONCURRENCY", "16"))
+FEED_TIMEOUT = 15
+
+# Name of the state file, kept next to the toolbox's dataset
+STATE_FILE_NAME = "watchlist_feeds.json"
+
+NAMESPACES = {
+    "atom": "http://www.w3.org/2005/Atom",
+    "yt": "http://www.youtube.com/xml/schemas/2015",
+}
+
+
+def read_watchlist(path):
+    """
+    Channel references from a watchlist file, one per line.
+    """
+    with open(path, encoding="utf-8") as f:
+        return [line.split("#", 1)[0].strip() for line in f if line.split("#", 1)[0].strip()]
+
+
+def channel_reference(reference):
+    """
+    ("id", channel ID) or ("handle", @handle) for a channel ID, @handle or channel URL.
+    """
+    channel_id = re.search(r"(UC[0-9A-Za-z_-]{22})", reference)
+    if channel_id:
+        return "id", channel_id.group(1)
+    handle = re.search(r"(?:^|youtube\.com/)(@[\w.-]+)", reference)
+    if handle:
+        return "handle", handle.group(1)
+    raise ValueError(f"Not a channel ID, @handle or channel URL: {reference}")
+
+
+def parse_feed(text):
+    """
+    Entries of a channel's Atom feed, newest first.
+    """
+    root = ET.fromstring(text)
+    entries = []
+    for entry in root.findall("atom:entry", NAMESPACES):
+        video_id = entry.findtext("yt:videoId", namespaces=NAMESPACES)
+        if not video_id:
+            continue
+        entries.append({
+            "videoId": video_id,
+            "channelId": entry.findtext("yt:channelId", namespaces=NAMESPACES),
+            "title": entry.findtext("atom:title", namespaces=NAMESPACES),
+            "publishedAt": entry.findtext("atom:published", namespaces=NAMESPACES),
+            "author": entry.findtext("atom:author/atom:name", namespaces=NAMESPACES),
+        })
+    return entries
+
+
+def published_at(entry):
+    """
+    Publication time of a feed entry, or None.
+    """
+    try:
+        return datetime.fromisoformat(entry["publishedAt"].replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+
+
+class FeedStore:
+    """
+    Per-channel feed state and resolved handles, persisted as JSON.
+
+    Each side keeps its own keys in a channel's state (the toolbox adds the video IDs it
+    has reported), and saving merges key by key into what is on disk, so the agency and
+    the toolbox do not overwrite each other's keys.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        return state.setdefault("channels", {}), state.setdefault("handles", {})
+
+    def load(self):
+        """
+        Returns:
+            tuple: (feed state per channel ID, channel ID per @handle)
+        """
+        with self._lock:
+            return self._read()
+
+    def save(self, feeds, handles):
+        with self._lock:
+            channels, known = self._read()
+            for channel_id, feed_state in feeds.items():
+                channels.setdefault(channel_id, {}).update(feed_state)
+            known.update(handles)
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"channels": channels, "handles": known}, f)
+            os.replace(tmp, self.path)
+
+
+async def poll(client, semaphore, channel_id, feed_state):
+    """
+    Conditional GET of one feed, updating its state.
+
+    Returns:
+        dict: status ("changed" or "not_modified") and the feed's entries (the stored ones when unchanged)
+    """
+    headers = {}
+    # Without stored entries a 304 would leave nothing to return
+    if "entries" in feed_state:
+        if feed_state.get("etag"):
+            headers["If-None-Match"] = feed_state["etag"]
+        if feed_state.get("lastModified"):
+            headers["If-Modified-Since"] = feed_state["lastModified"]
+    async with semaphore:
+        response = await client.get(FEEDS_BASE_URL, params={"channel_id": channel_id}, headers=headers)
+    if response.status_code == 304:
+        return {"status": "not_modified", "entries": feed_state["entries"]}
+    response.raise_for_status()
+    feed_state["etag"] = response.headers.get("ETag")
+    feed_state["lastModified"] = response.headers.get("Last-Modified")
+    feed_state["entries"] = parse_feed(response.text)
+    return {"status": "changed", "entries": feed_state["entries"]}
+
+
+async def poll_all(channel_ids, feeds, concurrency=FEED_CONCURRENCY):
+    """
+    Poll every channel's feed; a failed poll yields its exception in place of the result.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=FEED_TIMEOUT, limits=limits, follow_redirects=True) as client:
+        return await asyncio.gather(
+            *(poll(client, semaphore, channel_id, feeds.setdefault(channel_id, {})) for channel_id in channel_ids),
+            return_exceptions=True)
+
+
+def fetch_feeds(channel_ids, feeds, concurrency=FEED_CONCURRENCY):
+    """
+    poll_all() for synchronous callers (not from inside a running event loop).
+    """
+    return asyncio.run(poll_all(channel_ids, feeds, concurrency))
@@ -0,0 +1,181 @@
+"""
+Multi-page search harvesting under a quota budget.
+
+One harvest follows nextPageToken across one or more query variants until it has
+the requested number of unique videos or would exceed the quota budget. The next
+page of every active query is fetched concurrently in rounds. Hits are deduplicated
+across pages and queries, hydrated with statistics through videos.list (1 unit
+per 50 videos) and ranked.
+
+Quota: every search.list page costs 100 units (50 results), so 200 candidates from
+one query cost 4 pages + 4 hydration batches = 404 units. Pages answered from the
+response cache cost nothing, so reported units are an upper bound.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from metrics import quota_cost
+
+PAGE_SIZE = 50
+HYDRATE_BATCH = 50
+
+# Pages of different queries fetched at once
+MAX_PARALLEL_QUERIES = 8
+
+RANKINGS = ('views_per_day', 'views', 'engagement', 'relevance')
+
+# videos.list item paths the hydration always needs, whatever the caller's projection: the ID to match
+# hits and the statistics every ranking scores by
+HYDRATE_PATHS = ('id', 'snippet.publishedAt', 'statistics.viewCount', 'statistics.likeCount', 'statistics.commentCount')
+
+def hydration_cost(videos: int) -> int:
+    return -(-videos // HYDRATE_BATCH) * quota_cost('videos.list')
+
+def min_budget() -> int:
+    """
+    Quota units for one search page and its hydration
+    """
+    return quota_cost('search.list') + hydration_cost(PAGE_SIZE)
+
+def _age_days(published_at: Optional[str], now: datetime) -> float:
+    try:
+        published = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return 1.0
+    return max((now - published).total_seconds() / 86400, 1.0)
+
+def _int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+def score(video: Dict[str, Any], hit: Dict[str, Any], rank_by: str, now: datetime) -> float:
+    statistics = video.get('statistics', {})
+    views = _int(statistics.get('viewCount'))
+    if rank_by == 'views':
+        return views
+    if rank_by == 'engagement':
+        return (_int(statistics.get('likeCount')) + _int(statistics.get('commentCount'))) / max(views, 1)
+    if rank_by == 'relevance':
+        # Found by more query variants first, then by best search position
+        return len(hit['queries']) - hit['bestPosition'] / 10000
+    return views / _age_days(video.get('snippet', {}).get('publishedAt'), now)
+
+class Harvester:
+    """
+    Collects, hydrates and ranks search results from several pages and query variants
+    """
+
+    def __init__(self, service: Any):
+        self.service = service
+
+    def _page(self, query: str, page_token: Optional[str], options: Dict[str, Any],
+              search_fields: Optional[str]) -> Dict[str, Any]:
+        page_options = {**options, 'pageToken': page_token} if page_token else options
+        return self.service.search_videos(query, PAGE_SIZE, search_fields, **page_options)
+
+    def harvest(self, queries: List[str], max_results: int = 200, quota_budget: int = 1000, rank_by: str = 'views_per_day',
+                options: Optional[Dict[str, Any]] = None, search_fields: Optional[str] = None,
+                video_fields: Optional[str] = None, on_page: Any = None) -> Dict[str, Any]:
+        """
+        Harvest up to max_results unique videos for the queries, spending at most quota_budget units.
+
+        Args:
+            options: search.list filters (channelId, order, publishedAfter, ...)
+            search_fields / video_fields: Data API field masks for the search pages and the hydration
+                (video_fields must include HYDRATE_PATHS)
+            on_page: optional callback(query, response, position offset) for every fetched page (e.g. to record it)
+
+        Returns:
+            Dict[str, Any]: videos (videos.list items, best first, each with a 'harvest' entry holding
+                its score, matched queries and best search position), per-query counts, quota units and why it stopped
+        """
+        queries = list(dict.fromkeys(query.strip() for query in queries if query and query.strip()))
+        if not queries:
+            raise ValueError("At least one query is required")
+        if rank_by not in RANKINGS:
+            raise ValueError(f"Unknown rank_by '{rank_by}'. Choose one of: {', '.join(RANKINGS)}")
+        if quota_budget < min_budget():
+            raise ValueError(f"quota_budget must be at least {min_budget()} units (one search page and its hydration)")
+
+        start = time.perf_counter()
+        options = options or {}
+        page_cost = quota_cost('search.list')
+        hits: Dict[str, Dict[str, Any]] = {}
+        state = {query: {'pages': 0, 'hits': 0, 'new': 0, 'nextPageToken': None, 'done': False} for query in queries}
+        spent, stopped_by = 0, 'exhausted'
+
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_QUERIES, len(queries))) as pool:
+            while True:
+                active = [query for query in queries if not state[query]['done']]
+                if not active:
+                    stopped_by = 'exhausted'
+                    break
+                if len(hits) >= max_results:
+                    stopped_by = 'target'
+                    break
+                # As many pages this round as the budget allows, keeping enough for hydrating what they may add
+                affordable = 0
+                while affordable < len(active):
+                    candidates = min(max_results, len(hits) + (affordable + 1) * PAGE_SIZE)
+                    if spent + (affordable + 1) * page_cost + hydration_cost(candidates) > quota_budget:
+                        break
+                    affordable += 1
+                if not affordable:
+                    stopped_by = 'budget'
+                    break
+                round_queries = active[:affordable]
+                pages = list(pool.map(
+                    lambda query: self._page(query, state[query]['nextPageToken'], options, search_fields), round_queries))
+                spent += len(round_queries) * page_cost
+
+                # Merge in query order, so positions and first-seen order do not depend on timing
+                for query, page in zip(round_queries, pages):
+                    query_state = state[query]
+                    if on_page:
+                        on_page(query, page, query_state['pages'] * PAGE_SIZE)
+                    for index, item in enumerate(page.get('items', [])):
+                        video_id = item.get('id', {}).get('videoId')
+                        if not video_id:
+                            continue
+                        query_state['hits'] += 1
+                        position = query_state['pages'] * PAGE_SIZE + index + 1
+                        hit = hits.get(video_id)
+                        if hit is None:
+                            query_state['new'] += 1
+                            hits[video_id] = {'queries': [query], 'bestPosition': position}
+                        else:
+                            if query not in hit['queries']:
+                                hit['queries'].append(query)
+                            hit['bestPosition'] = min(hit['bestPosition'], position)
+                    query_state['pages'] += 1
+                    query_state['nextPageToken'] = page.get('nextPageToken')
+                    query_state['done'] = not query_state['nextPageToken']
+
+        # Hydrate the candidates the remaining budget covers (the last round may overshoot max_results; extra
+        # hits still compete in the ranking), preferring those matched by more queries and ranked higher
+        affordable = (quota_budget - spent) // quota_cost('videos.list') * HYDRATE_BATCH
+        candidates = sorted(hits, key=lambda video_id: (-len(hits[video_id]['queries']), hits[video_id]['bestPosition']))
+        candidates = candidates[:affordable]
+        videos = self.service.get_videos(candidates, video_fields) if candidates else []
+        spent += hydration_cost(len(candidates))
+        now = datetime.now(timezone.utc)
+        for video in videos:
+            hit = hits[video['id']]
+            video['harvest'] = {'score': score(video, hit, rank_by, now), 'queries': hit['queries'],
+                                'bestPosition': hit['bestPosition']}
+        videos.sort(key=lambda video: video['harvest']['score'], reverse=True)
+
+        return {
+            'videos': videos[:max_results],
+            'candidates': len(hits),
+            'queries': {query: {key: query_state[key] for key in ('pages', 'hits', 'new')}
+                        for query, query_state in state.items()},
+            'stoppedBy': stopped_by,
+            'quotaUnits': spent,
+            'quotaBudget': quota_budget,
+            'elapsedMs': round((time.perf_counter() - start) * 1000, 1),
+        }
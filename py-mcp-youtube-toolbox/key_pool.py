@@ -0,0 +1,110 @@
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from resilience import QUOTA_RESET_TZ
+
+# Daily quota of each key's Google Cloud project (the YouTube Data API default is 10,000 units)
+DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+
+def _quota_day() -> str:
+    """
+    The quota day in effect: quotas reset at midnight Pacific time
+    """
+    return datetime.now(QUOTA_RESET_TZ).date().isoformat()
+
+def _next_reset() -> datetime:
+    now = datetime.now(QUOTA_RESET_TZ)
+    return (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+class ApiKey:
+    """
+    One API key, its client and the quota units it has used today
+    """
+    __slots__ = ('name', 'client', 'daily_quota', 'used', 'exhausted')
+
+    def __init__(self, name: str, client: Any, daily_quota: int):
+        self.name = name
+        self.client = client
+        self.daily_quota = daily_quota
+        self.used = 0
+        self.exhausted = False
+
+    @property
+    def remaining(self) -> int:
+        return 0 if self.exhausted else max(0, self.daily_quota - self.used)
+
+class KeyPool:
+    """
+    YouTube Data API keys from several projects, routed by remaining daily quota.
+
+    Requests go to the key with the most headroom (by the units this process has
+    charged to it); a key that answers quotaExceeded is skipped until the quota resets.
+    """
+
+    def __init__(self, api_keys: Iterable[str], build_client: Callable[[str], Any], daily_quota: int = DAILY_QUOTA):
+        self.keys: List[ApiKey] = [
+            ApiKey(f"key{i}…{api_key[-4:]}", build_client(api_key), daily_quota)
+            for i, api_key in enumerate(api_keys, 1)
+        ]
+        if not self.keys:
+            raise ValueError("At least one YouTube API key is required")
+        self.day = _quota_day()
+        self._lock = threading.Lock()
+
+    def _roll_day(self) -> None:
+        day = _quota_day()
+        if day != self.day:
+            self.day = day
+            self._reset()
+
+    def _reset(self) -> None:
+        for key in self.keys:
+            key.used = 0
+            key.exhausted = False
+
+    def reset(self) -> None:
+        """
+        Forget used quota (e.g. between benchmark runs)
+        """
+        with self._lock:
+            self._reset()
+
+    def choose(self, units: int, exclude: Iterable[ApiKey] = ()) -> Optional[ApiKey]:
+        """
+        The key with the most remaining quota, preferring keys that can afford `units`.
+        Returns None if every key is exhausted or excluded.
+        """
+        with self._lock:
+            self._roll_day()
+            candidates = [key for key in self.keys if not key.exhausted and key not in exclude]
+            if not candidates:
+                return None
+            # Counts are this process's estimate, so a key "out" of quota is still worth trying last
+            return max(candidates, key=lambda key: (key.remaining >= units, key.remaining))
+
+    def charge(self, key: ApiKey, units: int) -> None:
+        with self._lock:
+            key.used += units
+
+    def exhaust(self, key: ApiKey) -> None:
+        """
+        Mark a key as out of quota until the next reset
+        """
+        with self._lock:
+            key.exhausted = True
+
+    def resets_at(self) -> str:
+        return _next_reset().strftime('%Y-%m-%d %H:%M %Z')
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._roll_day()
+            return {
+                'quotaDay': self.day,
+                'resetsAt': self.resets_at(),
+                'keys': [{'name': key.name, 'used': key.used, 'remaining': key.remaining, 'exhausted': key.exhausted}
+                         for key in self.keys],
+                'remainingTotal': sum(key.remaining for key in self.keys),
+            }
@@ -0,0 +1,226 @@
+import functools
+import inspect
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+# YouTube Data API quota cost per method (https://developers.google.com/youtube/v3/determine_quota_cost)
+QUOTA_COSTS = {
+    'search.list': 100,
+    'videos.list': 1,
+    'channels.list': 1,
+    'commentThreads.list': 1,
+    'playlistItems.list': 1,
+}
+
+# Latency histogram buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Recent observations kept per span for percentiles
+RESERVOIR_SIZE = 1024
+
+def quota_cost(method: str) -> int:
+    """
+    Quota units charged for one call to a YouTube Data API method (e.g. 'search.list')
+    """
+    return QUOTA_COSTS.get(method, 1)
+
+class _Latency:
+    __slots__ = ('count', 'total', 'buckets', 'recent')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.recent = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.recent.append(seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+
+    def percentile(self, q: float) -> float:
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+class Metrics:
+    """
+    In-process metrics: latency spans, upstream call counters, quota units and cache hit ratios.
+    Thread-safe; exported as a JSON snapshot or in the Prometheus text format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        # (kind, name) -> latency, kind is 'tool', 'service' or 'upstream'
+        self.latency: Dict[Tuple[str, str], _Latency] = defaultdict(_Latency)
+        # (kind, name, outcome) -> count
+        self.calls: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        # upstream method -> quota units
+        self.quota: Dict[str, int] = defaultdict(int)
+        # (cache, 'hit' | 'miss') -> count
+        self.cache: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def observe(self, kind: str, name: str, seconds: float, outcome: str = 'ok') -> None:
+        with self._lock:
+            self.latency[(kind, name)].observe(seconds)
+            self.calls[(kind, name, outcome)] += 1
+
+    def add_quota(self, method: str, units: int) -> None:
+        with self._lock:
+            self.quota[method] += units
+
+    def cache_hit(self, cache: str) -> None:
+        with self._lock:
+            self.cache[(cache, 'hit')] += 1
+
+    def cache_miss(self, cache: str) -> None:
+        with self._lock:
+            self.cache[(cache, 'miss')] += 1
+
+    @contextmanager
+    def span(self, kind: str, name: str):
+        """
+        Time a block; the outcome is 'error' if it raises
+        """
+        start = time.perf_counter()
+        outcome = 'ok'
+        try:
+            yield
+        except Exception:
+            outcome = 'error'
+            raise
+        finally:
+            self.observe(kind, name, time.perf_counter() - start, outcome)
+
+    def timed(self, kind: str, name: Optional[str] = None):
+        """
+        Decorator recording a span around every call of a sync or async function.
+        Tool results of the form {'error': ...} count as errors.
+        """
+        def decorator(func):
+            span_name = name or func.__name__
+
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    start = time.perf_counter()
+                    outcome = 'error'
+                    try:
+                        result = await func(*args, **kwargs)
+                        outcome = 'error' if isinstance(result, dict) and 'error' in result else 'ok'
+                        return result
+                    finally:
+                        self.observe(kind, span_name, time.perf_counter() - start, outcome)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(kind, span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        JSON-serializable summary: per-span latency percentiles and outcomes, quota and cache ratios
+        """
+        with self._lock:
+            spans: Dict[str, Dict[str, Any]] = {}
+            for (kind, name), latency in sorted(self.latency.items()):
+                outcomes = {o: c for (k, n, o), c in self.calls.items() if k == kind and n == name}
+                spans.setdefault(kind, {})[name] = {
+                    'count': latency.count,
+                    'errors': outcomes.get('error', 0),
+                    'outcomes': outcomes,
+                    'totalSeconds': round(latency.total, 4),
+                    'meanMs': round(latency.total / latency.count * 1000, 2) if latency.count else 0.0,
+                    'p50Ms': round(latency.percentile(50) * 1000, 2),
+                    'p95Ms': round(latency.percentile(95) * 1000, 2),
+                }
+
+            caches = {}
+            for cache in sorted({c for c, _ in self.cache}):
+                hits, misses = self.cache[(cache, 'hit')], self.cache[(cache, 'miss')]
+                caches[cache] = {'hits': hits, 'misses': misses,
+                                 'hitRatio': round(hits / (hits + misses), 4) if hits + misses else 0.0}
+
+            return {
+                'uptimeSeconds': round(time.time() - self.started_at, 1),
+                'tools': spans.get('tool', {}),
+                'service': spans.get('service', {}),
+                'upstream': spans.get('upstream', {}),
+                'quotaUnits': dict(sorted(self.quota.items())),
+                'quotaUnitsTotal': sum(self.quota.values()),
+                'caches': caches,
+            }
+
+    def prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+        """
+        lines: List[str] = []
+        with self._lock:
+            lines += ['# HELP youtube_toolbox_latency_seconds Latency of tool handlers, service methods and upstream calls',
+                      '# TYPE youtube_toolbox_latency_seconds histogram']
+            for (kind, name), latency in sorted(self.latency.items()):
+                labels = f'kind="{kind}",name="{name}"'
+                for bound, count in zip(LATENCY_BUCKETS, latency.buckets):
+                    lines.append(f'youtube_toolbox_latency_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'youtube_toolbox_latency_seconds_bucket{{{labels},le="+Inf"}} {latency.count}')
+                lines.append(f'youtube_toolbox_latency_seconds_sum{{{labels}}} {latency.total:.6f}')
+                lines.append(f'youtube_toolbox_latency_seconds_count{{{labels}}} {latency.count}')
+
+            lines += ['# HELP youtube_toolbox_calls_total Calls by kind, name and outcome',
+                      '# TYPE youtube_toolbox_calls_total counter']
+            for (kind, name, outcome), count in sorted(self.calls.items()):
+                lines.append(f'youtube_toolbox_calls_total{{kind="{kind}",name="{name}",outcome="{outcome}"}} {count}')
+
+            lines += ['# HELP youtube_toolbox_quota_units_total YouTube Data API quota units consumed',
+                      '# TYPE youtube_toolbox_quota_units_total counter']
+            for method, units in sorted(self.quota.items()):
+                lines.append(f'youtube_toolbox_quota_units_total{{method="{method}"}} {units}')
+
+            lines += ['# HELP youtube_toolbox_cache_requests_total Cache lookups by result',
+                      '# TYPE youtube_toolbox_cache_requests_total counter']
+            for (cache, result), count in sorted(self.cache.items()):
+                lines.append(f'youtube_toolbox_cache_requests_total{{cache="{cache}",result="{result}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """
+        Serve GET /metrics for Prometheus scraping from a daemon thread
+        """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+        return server
+
+# Process-wide registry
+metrics = Metrics()
@@ -0,0 +1,67 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("prefetch")
+
+# Regions whose trending charts are kept warm, e.g. "US,KR" (disabled if unset)
+PREFETCH_REGIONS = [region.strip() for region in os.getenv("PREFETCH_REGIONS", "").split(",") if region.strip()]
+# Seconds between refreshes; keep below RESPONSE_CACHE_TTL so the charts never go cold
+PREFETCH_INTERVAL = int(os.getenv("PREFETCH_INTERVAL", "600"))
+
+class Prefetcher:
+    """
+    Background thread that refreshes the trending chart of each configured region on a schedule,
+    so the first get_trending_videos call of a session is served from the response cache.
+    Each refresh costs 1 quota unit per region.
+    """
+
+    def __init__(self, service: Any, regions: List[str], interval: int = PREFETCH_INTERVAL):
+        self.service = service
+        self.regions = regions
+        self.interval = interval
+        self.runs = 0
+        self.failures = 0
+        self.last_run: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> None:
+        for region in self.regions:
+            try:
+                with self.service.refreshing():
+                    self.service.get_trending_videos(region, 50)
+            except Exception as e:
+                self.failures += 1
+                self.last_error = f"{region}: {type(e).__name__}: {e}"
+                logger.warning(f"Prefetch of trending videos for {region} failed: {e}")
+        self.runs += 1
+        self.last_run = time.time()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.run_once()
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="prefetch", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'regions': self.regions,
+            'interval': self.interval,
+            'running': self._thread is not None and self._thread.is_alive(),
+            'runs': self.runs,
+            'failures': self.failures,
+            'lastRun': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(self.last_run)) if self.last_run else None,
+            'lastError': self.last_error,
+        }
@@ -0,0 +1,188 @@
+"""
+Field projections for the YouTube Data API tools.
+
+Each tool formats API items into flat records, and its schema maps every output field
+to the item path it comes from. A projection (the output fields a caller asks for) is
+turned into the request's `fields` mask, so the API leaves out everything else (full
+descriptions, every thumbnail size, localized blocks), and the same projection trims
+the tool's output:
+
+    names = select(fields, VIDEO_FIELDS, VIDEO_DEFAULT)
+    response = service.get_video_details(video_id, fields=mask(paths(VIDEO_FIELDS, names)))
+    records = [project(item, VIDEO_FIELDS, names) for item in response['items']]
+
+Masks are canonical (sorted, deduplicated), so every projection of the same paths shares
+one response cache entry.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+# An item path ('snippet.title'), or a path and a function of its value
+Field = Union[str, Tuple[str, Callable[[Any], Any]]]
+
+# List envelope kept by every mask: the ETag for revalidation, paging and result counts
+ENVELOPE = ('etag', 'nextPageToken', 'pageInfo')
+
+def watch_url(video_id: Optional[str]) -> Optional[str]:
+    return f"https://www.youtube.com/watch?v={video_id}" if video_id else None
+
+def channel_url(channel_id: Optional[str]) -> Optional[str]:
+    return f"https://www.youtube.com/channel/{channel_id}" if channel_id else None
+
+VIDEO_FIELDS: Dict[str, Field] = {
+    'id': 'id',
+    'title': 'snippet.title',
+    'description': 'snippet.description',
+    'publishedAt': 'snippet.publishedAt',
+    'channelId': 'snippet.channelId',
+    'channelTitle': 'snippet.channelTitle',
+    'tags': 'snippet.tags',
+    'categoryId': 'snippet.categoryId',
+    'thumbnail': 'snippet.thumbnails.medium.url',
+    'thumbnails': 'snippet.thumbnails',
+    'duration': 'contentDetails.duration',
+    'dimension': 'contentDetails.dimension',
+    'definition': 'contentDetails.definition',
+    'caption': 'contentDetails.caption',
+    'viewCount': 'statistics.viewCount',
+    'likeCount': 'statistics.likeCount',
+    'commentCount': 'statistics.commentCount',
+    'url': ('id', watch_url),
+}
+
+SEARCH_FIELDS: Dict[str, Field] = {
+    'videoId': 'id.videoId',
+    'title': 'snippet.title',
+    'description': 'snippet.description',
+    'publishedAt': 'snippet.publishedAt',
+    'channelId': 'snippet.channelId',
+    'channelTitle': 'snippet.channelTitle',
+    'thumbnail': 'snippet.thumbnails.medium.url',
+    'thumbnails': 'snippet.thumbnails',
+    'url': ('id.videoId', watch_url),
+}
+
+CHANNEL_FIELDS: Dict[str, Field] = {
+    'id': 'id',
+    'title': 'snippet.title',
+    'description': 'snippet.description',
+    'publishedAt': 'snippet.publishedAt',
+    'customUrl': 'snippet.customUrl',
+    'country': 'snippet.country',
+    'thumbnail': 'snippet.thumbnails.medium.url',
+    'thumbnails': 'snippet.thumbnails',
+    'subscriberCount': 'statistics.subscriberCount',
+    'videoCount': 'statistics.videoCount',
+    'viewCount': 'statistics.viewCount',
+    'url': ('id', channel_url),
+}
+
+COMMENT_FIELDS: Dict[str, Field] = {
+    'id': 'id',
+    'text': 'snippet.topLevelComment.snippet.textDisplay',
+    'author': 'snippet.topLevelComment.snippet.authorDisplayName',
+    'authorProfileImageUrl': 'snippet.topLevelComment.snippet.authorProfileImageUrl',
+    'likeCount': 'snippet.topLevelComment.snippet.likeCount',
+    'publishedAt': 'snippet.topLevelComment.snippet.publishedAt',
+    'updatedAt': 'snippet.topLevelComment.snippet.updatedAt',
+    'replyCount': 'snippet.totalReplyCount',
+}
+
+# Replies (commentThreads replies.comments[]) share the comment field names
+REPLY_FIELDS: Dict[str, Field] = {
+    'id': 'id',
+    'text': 'snippet.textDisplay',
+    'author': 'snippet.authorDisplayName',
+    'authorProfileImageUrl': 'snippet.authorProfileImageUrl',
+    'likeCount': 'snippet.likeCount',
+    'publishedAt': 'snippet.publishedAt',
+    'updatedAt': 'snippet.updatedAt',
+}
+
+# Lean default projection of each tool
+VIDEO_DEFAULT = ('id', 'title', 'description', 'publishedAt', 'channelId', 'channelTitle', 'tags', 'duration',
+                 'viewCount', 'likeCount', 'commentCount', 'url')
+TRENDING_DEFAULT = ('id', 'title', 'publishedAt', 'channelTitle', 'viewCount', 'likeCount', 'commentCount', 'url')
+UPLOAD_DEFAULT = ('id', 'title', 'publishedAt', 'channelId', 'channelTitle', 'duration', 'viewCount', 'likeCount',
+                  'commentCount', 'url')
+HARVEST_DEFAULT = ('id', 'title', 'channelTitle', 'publishedAt', 'duration', 'viewCount', 'url')
+SEARCH_DEFAULT = ('videoId', 'title', 'channelTitle', 'publishedAt', 'url')
+CHANNEL_DEFAULT = ('id', 'title', 'description', 'publishedAt', 'customUrl', 'subscriberCount', 'videoCount',
+                   'viewCount', 'url')
+COMMENT_DEFAULT = ('id', 'text', 'author', 'likeCount', 'publishedAt', 'replyCount')
+
+# Item paths the dataset rows are built from (dataset.py), requested whenever results are recorded
+VIDEO_RECORD = ('id', 'snippet.channelId', 'snippet.channelTitle', 'snippet.title', 'snippet.description',
+                'snippet.tags', 'snippet.categoryId', 'snippet.publishedAt', 'snippet.defaultLanguage',
+                'snippet.defaultAudioLanguage', 'contentDetails.duration', 'statistics.viewCount',
+                'statistics.likeCount', 'statistics.commentCount')
+SEARCH_RECORD = ('id.videoId', 'snippet.channelId', 'snippet.title', 'snippet.publishedAt')
+CHANNEL_RECORD = ('id', 'snippet.title', 'snippet.customUrl', 'snippet.country', 'snippet.publishedAt',
+                  'statistics.subscriberCount', 'statistics.viewCount', 'statistics.videoCount',
+                  'contentDetails.relatedPlaylists.uploads')
+COMMENT_RECORD = ('id', 'snippet.topLevelComment.id', 'snippet.topLevelComment.snippet.authorDisplayName',
+                  'snippet.topLevelComment.snippet.textOriginal', 'snippet.topLevelComment.snippet.textDisplay',
+                  'snippet.topLevelComment.snippet.likeCount', 'snippet.topLevelComment.snippet.publishedAt',
+                  'snippet.totalReplyCount')
+
+def select(requested: Optional[List[str]], schema: Dict[str, Field], default: Iterable[str]) -> List[str]:
+    """
+    Output fields of a projection: the tool's default when none is given, every field for ['*']
+    """
+    if not requested:
+        return list(default)
+    if '*' in requested:
+        return list(schema)
+    unknown = [name for name in requested if name not in schema]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available fields: {', '.join(schema)}")
+    return list(dict.fromkeys(requested))
+
+def _path(field: Field) -> str:
+    return field if isinstance(field, str) else field[0]
+
+def paths(schema: Dict[str, Field], names: Iterable[str], prefix: str = '') -> List[str]:
+    """
+    Item paths behind the named output fields
+    """
+    return [prefix + _path(schema[name]) for name in names]
+
+def _serialize(tree: Dict[str, Any]) -> str:
+    return ','.join(key if tree[key] is None else f"{key}({_serialize(tree[key])})" for key in sorted(tree))
+
+def mask(item_paths: Iterable[str]) -> str:
+    """
+    Data API `fields` mask selecting the given item paths plus the list envelope
+    (e.g. 'etag,items(id,snippet(title)),nextPageToken,pageInfo')
+    """
+    tree: Dict[str, Any] = {}
+    for path in item_paths:
+        node, keys = tree, path.split('.')
+        for key in keys[:-1]:
+            if key in node and node[key] is None:
+                # The whole parent is already selected
+                break
+            node = node.setdefault(key, {})
+        else:
+            node[keys[-1]] = None
+    return _serialize({**{key: None for key in ENVELOPE}, 'items': tree})
+
+def pick(item: Any, path: str) -> Any:
+    for key in path.split('.'):
+        item = item.get(key) if isinstance(item, dict) else None
+    return item
+
+def project(item: Dict[str, Any], schema: Dict[str, Field], names: Iterable[str]) -> Dict[str, Any]:
+    """
+    The named output fields of one API item
+    """
+    record = {}
+    for name in names:
+        field = schema[name]
+        if isinstance(field, str):
+            record[name] = pick(item, field)
+        else:
+            record[name] = field[1](pick(item, field[0]))
+    return record
+
+# Metadata lookups made by the transcript tools, prompts and resources share this mask (and its cache entries)
+VIDEO_RECORD_MASK = mask(VIDEO_RECORD)
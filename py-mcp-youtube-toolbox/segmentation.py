@@ -0,0 +1,199 @@
+import math
+from collections import Counter
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from text_utils import tokenize
+from transcript import TranscriptView, format_time
+
+# TextTiling parameters
+PSEUDO_SENTENCE_WORDS = 20   # content words per pseudo-sentence
+BLOCK_SIZE = 6               # pseudo-sentences compared on each side of a gap
+SMOOTHING_WIDTH = 3
+MAX_VOCABULARY = 4000
+MIN_CHAPTER_SECONDS = 60
+KEYWORDS_PER_CHAPTER = 5
+
+def _pseudo_sentences(view: TranscriptView) -> tuple:
+    """
+    Group transcript segments into pseudo-sentences of ~PSEUDO_SENTENCE_WORDS content words.
+    Pseudo-sentences always start at a segment boundary so chapter breaks map back onto segments.
+
+    Returns:
+        tuple: (token lists, view position where each pseudo-sentence starts)
+    """
+    texts = view.transcript.texts
+    units, unit_positions = [], []
+    current, start = [], 0
+    for position, i in enumerate(view.indices):
+        if not current:
+            start = position
+        current.extend(tokenize(texts[i]))
+        if len(current) >= PSEUDO_SENTENCE_WORDS:
+            units.append(current)
+            unit_positions.append(start)
+            current = []
+    if current:
+        units.append(current)
+        unit_positions.append(start)
+    return units, unit_positions
+
+def _term_matrix(units: List[List[str]]) -> tuple:
+    """
+    Build a dense (pseudo-sentence x term) count matrix over the most frequent terms
+    """
+    vocabulary = [term for term, _ in Counter(t for unit in units for t in unit).most_common(MAX_VOCABULARY)]
+    term_index = {term: j for j, term in enumerate(vocabulary)}
+
+    rows, cols = [], []
+    for r, unit in enumerate(units):
+        for term in unit:
+            j = term_index.get(term)
+            if j is not None:
+                rows.append(r)
+                cols.append(j)
+
+    matrix = np.zeros((len(units), len(vocabulary)), dtype=np.float32)
+    np.add.at(matrix, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), 1.0)
+    return matrix, vocabulary
+
+def gap_similarities(matrix: np.ndarray, block_size: int = BLOCK_SIZE) -> np.ndarray:
+    """
+    Cosine similarity between the blocks before and after every gap, computed for all gaps at once
+    using prefix sums over the term matrix. Entry g-1 is the gap before pseudo-sentence g.
+    """
+    n = matrix.shape[0]
+    prefix = np.vstack([np.zeros((1, matrix.shape[1]), dtype=np.float32), np.cumsum(matrix, axis=0)])
+    gaps = np.arange(1, n)
+    left = prefix[gaps] - prefix[np.maximum(gaps - block_size, 0)]
+    right = prefix[np.minimum(gaps + block_size, n)] - prefix[gaps]
+
+    numerator = np.einsum('ij,ij->i', left, right)
+    denominator = np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+def depth_scores(similarities: np.ndarray) -> np.ndarray:
+    """
+    TextTiling depth score: how deep each gap sits between the nearest peaks on either side
+    """
+    n = len(similarities)
+    depths = np.zeros(n, dtype=np.float32)
+    for g in range(n):
+        left = g
+        while left > 0 and similarities[left - 1] >= similarities[left]:
+            left -= 1
+        right = g
+        while right < n - 1 and similarities[right + 1] >= similarities[right]:
+            right += 1
+        depths[g] = (similarities[left] - similarities[g]) + (similarities[right] - similarities[g])
+    return depths
+
+def _select_gaps(depths: np.ndarray, gap_times: List[float], count: Optional[int], start: float, end: float) -> List[int]:
+    """
+    Pick boundary gaps by depth, keeping chapters at least MIN_CHAPTER_SECONDS long.
+    With `count`, returns the count-1 deepest gaps; otherwise every gap deeper than mean + std/2
+    (a conservative cutoff, since video chapters are coarser than paragraphs).
+    """
+    if len(depths) == 0:
+        return []
+
+    threshold = float(depths.mean() + depths.std() / 2)
+    order = np.argsort(-depths, kind='stable')
+
+    chosen: List[int] = []
+    for g in order:
+        g = int(g)
+        if count is not None and len(chosen) >= count - 1:
+            break
+        if count is None and (depths[g] <= threshold or depths[g] <= 0):
+            break
+        if gap_times[g] - start < MIN_CHAPTER_SECONDS or end - gap_times[g] < MIN_CHAPTER_SECONDS:
+            continue
+        if all(abs(gap_times[g] - gap_times[c]) >= MIN_CHAPTER_SECONDS for c in chosen):
+            chosen.append(g)
+    return sorted(chosen)
+
+def _chapter_keywords(matrix: np.ndarray, vocabulary: List[str], unit_bounds: List[tuple]) -> List[List[str]]:
+    """
+    Top TF-IDF terms of each chapter, treating chapters as documents
+    """
+    chapter_counts = np.vstack([matrix[start:end].sum(axis=0) for start, end in unit_bounds])
+    document_frequency = (chapter_counts > 0).sum(axis=0)
+    idf = np.log((1 + len(unit_bounds)) / (1 + document_frequency)) + 1
+    totals = chapter_counts.sum(axis=1, keepdims=True)
+    weights = np.divide(chapter_counts, totals, out=np.zeros_like(chapter_counts), where=totals > 0) * idf
+
+    keywords = []
+    for row in weights:
+        top = np.argsort(-row, kind='stable')[:KEYWORDS_PER_CHAPTER]
+        keywords.append([vocabulary[j] for j in top if row[j] > 0])
+    return keywords
+
+def segment_topics(view: TranscriptView, count: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Split a transcript view into topical chapters (TextTiling-style lexical cohesion)
+
+    Args:
+        view (TranscriptView): Segments to split
+        count (int, optional): Desired number of chapters. Chosen automatically if omitted.
+
+    Returns:
+        List[Dict[str, Any]]: Chapters with view positions, times, title and keywords
+    """
+    if not view:
+        return []
+
+    units, unit_positions = _pseudo_sentences(view)
+    matrix, vocabulary = _term_matrix(units)
+
+    boundaries: List[int] = []
+    if len(units) > 2 and (count is None or count > 1):
+        starts = view.transcript.starts
+        gap_times = [starts[view.indices[unit_positions[g]]] for g in range(1, len(units))]
+        similarities = gap_similarities(matrix)
+        if SMOOTHING_WIDTH > 1 and len(similarities) >= SMOOTHING_WIDTH:
+            similarities = np.convolve(similarities, np.ones(SMOOTHING_WIDTH) / SMOOTHING_WIDTH, mode='same')
+        selected = _select_gaps(depth_scores(similarities), gap_times, count, view.start_time(), view.end_time())
+        boundaries = [g + 1 for g in selected]
+
+    unit_bounds = list(zip([0] + boundaries, boundaries + [len(units)]))
+    keywords = _chapter_keywords(matrix, vocabulary, unit_bounds) if vocabulary else [[] for _ in unit_bounds]
+
+    chapters = []
+    for index, ((unit_start, unit_end), chapter_keywords) in enumerate(zip(unit_bounds, keywords)):
+        start = unit_positions[unit_start]
+        end = unit_positions[unit_end] if unit_end < len(units) else len(view)
+        chunk = view[start:end]
+        chapters.append({
+            "index": index,
+            "startIndex": start,
+            "endIndex": end,
+            "start": chunk.start_time(),
+            "end": chunk.end_time(),
+            "timestamp": format_time(chunk.start_time()),
+            "title": " & ".join(word.capitalize() for word in chapter_keywords[:2]) or f"Part {index + 1}",
+            "keywords": chapter_keywords
+        })
+    return chapters
+
+def match_chapter(view: TranscriptView, chapters: List[Dict[str, Any]], query: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the chapter whose text best matches the query (length-normalized TF-IDF overlap)
+    """
+    query_terms = set(tokenize(query))
+    if not query_terms or not chapters:
+        return None
+
+    chapter_terms = [Counter(tokenize(view[c["startIndex"]:c["endIndex"]].full_text())) for c in chapters]
+    best, best_score = None, 0.0
+    for chapter, terms in zip(chapters, chapter_terms):
+        length = sum(terms.values()) or 1
+        score = 0.0
+        for term in query_terms:
+            if terms.get(term):
+                document_frequency = sum(1 for other in chapter_terms if term in other)
+                score += (terms[term] / length) * (math.log((1 + len(chapters)) / (1 + document_frequency)) + 1)
+        if score > best_score:
+            best, best_score = chapter, score
+    return best
@@ -1,9 +1,15 @@
 import os
+import asyncio
+import copy
 import json
 import re
 import logging
+import threading
+import time
+from collections import OrderedDict
 from logging.handlers import RotatingFileHandler
-from typing import List, Dict, Any, Optional
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Any, Callable, Optional
 
 # pydantic imports
 from dotenv import load_dotenv
@@ -17,11 +23,34 @@ from googleapiclient.errors import HttpError
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
 
 # MCP related imports
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+from mcp import types
+
+from transcript import Transcript, TranscriptView, format_time, page_bounds
+from segmentation import segment_topics, match_chapter
+from metrics import metrics, quota_cost
+from resilience import CircuitOpenError, guard, is_quota_exceeded, snapshot as resilience_snapshot
+from key_pool import KeyPool
+from singleflight import SingleFlight
+from prefetch import Prefetcher, PREFETCH_INTERVAL, PREFETCH_REGIONS
+from dataset import Dataset, channel_row, comment_rows, now_iso, search_rows, video_rows
+import analytics
+import projection
+from feeds import read_watchlist
+from watchlist import WatchlistMonitor
+from harvest import HYDRATE_PATHS, Harvester
+from transport import build_transport
+import extractive
+from summarize import SUMMARY_DIRECT_TOKENS, Summarizer, estimate_tokens, format_section, plan_chunks
 
 # Load environment variables
 load_dotenv()
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+# Comma-separated keys from several Google Cloud projects pool their daily quotas (defaults to YOUTUBE_API_KEY)
+YOUTUBE_API_KEYS = [key.strip() for key in os.getenv("YOUTUBE_API_KEYS", "").split(",") if key.strip()] or \
+    ([YOUTUBE_API_KEY] if YOUTUBE_API_KEY else [])
+# Optional API root override (e.g. the benchmark stand-in server)
+YOUTUBE_API_BASE_URL = os.getenv("YOUTUBE_API_BASE_URL")
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -44,9 +73,9 @@ console_handler.setFormatter(formatter)
 logger.addHandler(console_handler)
 
 # Check if YOUTUBE_API_KEY is available
-if not YOUTUBE_API_KEY:
+if not YOUTUBE_API_KEYS:
     logger.error("YOUTUBE_API_KEY environment variable is not set")
-    raise ValueError("YOUTUBE_API_KEY environment variable is required")
+    raise ValueError("YOUTUBE_API_KEY (or YOUTUBE_API_KEYS) environment variable is required")
 
 # Create MCP server
 mcp = FastMCP("YouTube Toolbox MCP Server")
@@ -55,25 +84,30 @@ logger.info("YouTube Toolbox MCP Server 준비 중...")
 # Define prompt
 @mcp.prompt(
     name="transcript_summary",
-    description="Generate a summary of a YouTube video based on its transcript content with customizable options. This prompt provides different summary levels from brief overviews to detailed analyses, and can extract key topics from the content. Optimal for quickly understanding video content without watching the entire video."
+    description="Generate a summary of a YouTube video based on its transcript content with customizable options. This prompt provides different summary levels from brief overviews to detailed analyses, and can extract key topics from the content. Optimal for quickly understanding video content without watching the entire video. Set prefilter to \"true\" to send only the key sentences of the transcript (extracted locally) instead of the full text."
 )
 async def transcript_summary(
     video_id: str,
     language: Optional[str] = None,
     summary_length: Optional[str] = None,
-    include_keywords: Optional[str] = None
-) -> Dict[str, Any]:
+    include_keywords: Optional[str] = None,
+    prefilter: Optional[str] = None,
+    ctx: Optional[Context] = None
+) -> List[Dict[str, str]]:
     """
-    Generate a summary of a YouTube video based on its transcript content with customizable options
+    Generate a summary of a YouTube video based on its transcript content with customizable options.
+    Long transcripts are condensed chunk by chunk through the client's LLM (MCP sampling) when the client
+    supports it, and the prompt carries the chunk notes instead of the transcript.
     
     Args:
         video_id (str): The YouTube video ID
         language (str, optional): Language code for transcript (e.g., "en", "ko")
         summary_length (str, optional): Level of detail in summary ("short", "medium", or "detailed", default: "medium")
         include_keywords (str, optional): Whether to extract key topics (set to "true" to enable)
+        prefilter (str, optional): Set to "true" to send the transcript's key sentences (extracted locally) instead of the full transcript
     
     Returns:
-        Dict[str, Any]: Prompt configuration for the LLM
+        List[Dict[str, str]]: Prompt messages for the LLM
     """
     try:
         # Set defaults
@@ -81,57 +115,32 @@ async def transcript_summary(
         should_include_keywords = include_keywords == 'true'
         
         # Get video details and transcript
-        video_data = youtube_service.get_video_details(video_id)
+        video_data = await asyncio.to_thread(youtube_service.get_video_details, video_id, projection.VIDEO_RECORD_MASK)
         if not video_data or 'error' in video_data:
-            return {
-                'messages': [{
-                    'role': 'user',
-                    'content': f"Error: Could not retrieve video details for ID {video_id}"
-                }]
-            }
+            return [{
+                'role': 'user',
+                'content': f"Error: Could not retrieve video details for ID {video_id}"
+            }]
             
         video = video_data['items'][0] if 'items' in video_data and video_data['items'] else None
         
         # Get transcript data
         try:
-            raw_transcript_data = youtube_service.get_video_transcript(video_id, language)
-            
-            # Format transcript text based on the actual structure
-            transcript_text = ""
-            
-            if isinstance(raw_transcript_data, dict):
-                # Handle dictionary response (might have transcript or text key)
-                if 'transcript' in raw_transcript_data:
-                    transcript_text = ' '.join([segment.get('text', '') for segment in raw_transcript_data['transcript']])
-                elif 'text' in raw_transcript_data:
-                    transcript_text = raw_transcript_data['text']
-            elif isinstance(raw_transcript_data, list):
-                # Handle list response (direct list of segment dictionaries)
-                transcript_text = ' '.join([item.get('text', '') for item in raw_transcript_data])
-            else:
-                # Handle FetchedTranscript objects or other types
-                transcript_segments = []
-                for segment in raw_transcript_data:
-                    text = getattr(segment, 'text', '')
-                    transcript_segments.append(text)
-                transcript_text = ' '.join(transcript_segments)
+            transcript = await asyncio.to_thread(youtube_service.get_video_transcript, video_id, language)
+            transcript_text = transcript.view().full_text()
             
             if not transcript_text:
-                return {
-                    'messages': [{
-                        'role': 'user',
-                        'content': f"Error: Could not extract transcript text for video ID {video_id}."
-                    }]
-                }
+                return [{
+                    'role': 'user',
+                    'content': f"Error: Could not extract transcript text for video ID {video_id}."
+                }]
                 
         except Exception as e:
             logger.exception(f"Error getting transcript for video {video_id}: {e}")
-            return {
-                'messages': [{
-                    'role': 'user',
-                    'content': f"Error: Could not retrieve transcript for video ID {video_id}. {str(e)}"
-                }]
-            }
+            return [{
+                'role': 'user',
+                'content': f"Error: Could not retrieve transcript for video ID {video_id}. {str(e)}"
+            }]
         
         # Define summary instructions based on length
         summary_instructions = ''
@@ -150,48 +159,149 @@ async def transcript_summary(
 2. Important details or facts presented
 3. The overall tone and style of the content"""
         
+        # Key sentences and key phrases extracted locally, for the pre-filter and as keyword candidates
+        use_prefilter = prefilter == 'true'
+        digest = None
+        if use_prefilter or should_include_keywords:
+            digest = await asyncio.to_thread(transcript_digest, transcript, None, SUMMARY_DIRECT_TOKENS)
+        
         # Add keywords extraction if requested
         if should_include_keywords:
             summary_instructions += """\n\nAlso extract and list 5-10 key topics, themes, or keywords from the content in the format:
 KEY TOPICS: [comma-separated list of key topics/keywords]"""
+            if digest['keywords']:
+                summary_instructions += "\nKey phrases found in the transcript, most prominent first (use, merge or correct them): " + \
+                    ", ".join(keyword['keyword'] for keyword in digest['keywords'])
         
         # Get video metadata
         video_title = video.get('snippet', {}).get('title', 'Unknown') if video else 'Unknown'
         channel_title = video.get('snippet', {}).get('channelTitle', 'Unknown') if video else 'Unknown'
         published_at = video.get('snippet', {}).get('publishedAt', 'Unknown') if video else 'Unknown'
         
+        # Long transcripts are replaced by notes on each chunk (map), which this prompt then summarizes (reduce)
+        subject = 'YouTube video transcript'
+        content = f"Transcript:\n{transcript_text}"
+        if use_prefilter:
+            subject = 'YouTube video, given as the key sentences of its transcript in order'
+            content = "Key sentences:\n" + "\n".join(f"[{sentence['timestamp']}] {sentence['text']}" for sentence in digest['sentences'])
+        elif estimate_tokens(transcript_text) > SUMMARY_DIRECT_TOKENS and ctx is not None and can_sample(ctx):
+            try:
+                sections = await summarize_by_parts(transcript, ctx)
+                subject = 'YouTube video, given as notes on each part of its transcript in order'
+                content = "Transcript notes:\n" + "\n\n".join(format_section(section) for section in sections)
+            except Exception as e:
+                logger.warning(f"Chunked summarization of {video_id} failed, sending the full transcript: {e}")
+        
         # Construct the prompt message
-        prompt_message = f"""Please provide a {final_summary_length} summary of the following YouTube video transcript.
+        prompt_message = f"""Please provide a {final_summary_length} summary of the following {subject}.
 
 Video Title: {video_title}
 Channel: {channel_title}
 Published: {published_at}
 
-Transcript:
-{transcript_text}
+{content}
 
 {summary_instructions}"""
         
-        return {
-            'messages': [{
-                'role': 'user',
-                'content': prompt_message
-            }]
-        }
+        return [{
+            'role': 'user',
+            'content': prompt_message
+        }]
     except Exception as e:
         logger.exception(f"Error in transcript_summary prompt: {e}")
-        return {
-            'messages': [{
-                'role': 'user',
-                'content': f"Error creating transcript summary prompt: {str(e)}"
-            }]
-        }
+        return [{
+            'role': 'user',
+            'content': f"Error creating transcript summary prompt: {str(e)}"
+        }]
+
+def can_sample(ctx: Context) -> bool:
+    """
+    Whether the connected client accepts sampling (LLM completion) requests
+    """
+    try:
+        return ctx.session.check_client_capability(types.ClientCapabilities(sampling=types.SamplingCapability()))
+    except Exception:
+        return False
+
+def transcript_digest(transcript: Transcript, sentence_count: Optional[int] = None, max_tokens: Optional[int] = None,
+                      keyword_count: int = 10) -> Dict[str, Any]:
+    """
+    Key sentences (TextRank) and key phrases (RAKE) of a whole transcript, computed locally
+    """
+    view = transcript.view()
+    sentences = extractive.split_sentences(view)
+    return {
+        'sentenceCount': len(sentences),
+        'sentences': extractive.key_sentences(sentences, sentence_count, max_tokens),
+        'keywords': extractive.keywords((transcript.texts[i] for i in view.indices), keyword_count),
+    }
+
+async def summarize_by_parts(transcript: Transcript, ctx: Context) -> List[Dict[str, Any]]:
+    """
+    Notes on each chunk of a transcript (chapters or token windows), sampled in parallel through the client
+    and cached by content hash, merged further if they are still too long for one prompt
+    """
+    async def sample(prompt: str, system_prompt: str, max_tokens: int) -> str:
+        result = await ctx.session.create_message(
+            messages=[types.SamplingMessage(role='user', content=types.TextContent(type='text', text=prompt))],
+            max_tokens=max_tokens,
+            system_prompt=system_prompt,
+            temperature=0.2,
+        )
+        return result.content.text if isinstance(result.content, types.TextContent) else ''
+    
+    chapters = await asyncio.to_thread(youtube_service.get_chapters, transcript)
+    sections = await summarizer.map(plan_chunks(transcript.view(), chapters), sample)
+    return await summarizer.collapse(sections, sample)
+
+# Transcript cache settings
+TRANSCRIPT_CACHE_SIZE = int(os.getenv("TRANSCRIPT_CACHE_SIZE", "32"))
+TRANSCRIPT_CACHE_TTL = int(os.getenv("TRANSCRIPT_CACHE_TTL", "3600"))
+
+# YouTube Data API response cache settings (TTL 0 disables it)
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "900"))
+
+# Result of a conditional request whose resource has not changed (HTTP 304); survives the single-flight copy
+class _NotModified:
+    def __deepcopy__(self, memo: Dict[int, Any]) -> '_NotModified':
+        return self
+NOT_MODIFIED = _NotModified()
+
+# Trending charts are always fetched at the API maximum (same quota cost) so one cached chart serves every max_results
+TRENDING_PAGE_SIZE = 50
+
+# Default channel list for check_watchlist_uploads: a file with one channel ID, @handle or URL per line
+YOUTUBE_WATCHLIST = os.getenv("YOUTUBE_WATCHLIST")
+
+# Record what the tools fetch in the local dataset for offline analysis (0 disables it)
+DATASET_CAPTURE = os.getenv("YOUTUBE_DATASET_CAPTURE", "1") != "0"
+
+# Serve Prometheus metrics on this port (disabled if unset)
+METRICS_PORT = os.getenv("METRICS_PORT")
 
 class YouTubeService:
     """Service for interacting with YouTube API"""
     
     def __init__(self):
-        self.youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
+        client_options = {'api_endpoint': YOUTUBE_API_BASE_URL} if YOUTUBE_API_BASE_URL else None
+        # One thread-safe pooled transport shared by every key's client and every thread
+        self.transport = build_transport()
+        self.key_pool = KeyPool(YOUTUBE_API_KEYS, lambda api_key: build(
+            'youtube', 'v3', developerKey=api_key, client_options=client_options, http=self.transport))
+        self.youtube = self.key_pool.keys[0].client
+        # (video_id, language) -> (fetched_at, transcript); lets paginated calls reuse one fetch
+        self._transcript_cache = OrderedDict()
+        self._transcript_cache_lock = threading.Lock()
+        # Per-thread state (the refreshing flag)
+        self._local = threading.local()
+        self.transcript_api = YouTubeTranscriptApi()
+        # Identical concurrent requests share one upstream call; callers may modify responses, so each gets a copy
+        self._api_flights = SingleFlight(clone=copy.deepcopy)
+        self._transcript_flights = SingleFlight()
+        # (method, uri, body) -> (fetched_at, response); warmed in the background by the prefetcher
+        self._response_cache = OrderedDict()
+        self._response_cache_lock = threading.Lock()
         
     def parse_url(self, url: str) -> str:
         """
@@ -225,9 +335,113 @@ class YouTubeService:
         # Return mapped code or original if no mapping exists
         return region_mapping.get(region_code, region_code)
     
-    def search_videos(self, query: str, max_results: int = 10, **options) -> Dict[str, Any]:
+    def _execute(self, build_request: Callable[[Any], Any], method: str) -> Dict[str, Any]:
+        """
+        Execute the YouTube Data API request built by build_request(client).
+        Responses are cached for RESPONSE_CACHE_TTL; concurrent identical requests share one upstream call.
+        A stale cached response is revalidated with its ETag: an unchanged resource comes back as a bodiless 304
+        and the cached copy is served again.
+        """
+        request = build_request(self.youtube)
+        key = (request.method, request.uri, request.body)
+        
+        cached, etag = None, None
+        if RESPONSE_CACHE_TTL > 0:
+            with self._response_cache_lock:
+                cached = self._response_cache.get(key)
+                if cached:
+                    self._response_cache.move_to_end(key)
+            if not getattr(self._local, 'refreshing', False):
+                if cached and time.time() - cached[0] < RESPONSE_CACHE_TTL:
+                    metrics.cache_hit('api')
+                    return copy.deepcopy(cached[1])
+                metrics.cache_miss('api')
+            etag = cached[1].get('etag') if cached else None
+        
+        response = self._api_flights.do((key, etag), self._execute_pooled, build_request, method, etag)
+        if response is NOT_MODIFIED:
+            metrics.cache_hit('etag')
+            stored, response = cached[1], copy.deepcopy(cached[1])
+        else:
+            if etag:
+                metrics.cache_miss('etag')
+            # Stored as a copy: the caller may modify the response it gets back
+            stored = copy.deepcopy(response)
+        if RESPONSE_CACHE_TTL > 0:
+            with self._response_cache_lock:
+                self._response_cache[key] = (time.time(), stored)
+                self._response_cache.move_to_end(key)
+                while len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                    self._response_cache.popitem(last=False)
+        return response
+    
+    @contextmanager
+    def refreshing(self) -> Iterator[None]:
         """
-        Search for YouTube videos based on query and options
+        Within this block, requests made by this thread skip the response cache lookup (revalidating cached responses) and re-store fresh responses
+        """
+        self._local.refreshing = True
+        try:
+            yield
+        finally:
+            self._local.refreshing = False
+    
+    def _execute_pooled(self, build_request: Callable[[Any], Any], method: str, etag: Optional[str] = None) -> Any:
+        """
+        Run a request on the API key with the most quota headroom, paced, retried and circuit-broken
+        per key, failing over to the next key when one is out of quota.
+        With an etag the request is conditional and returns NOT_MODIFIED if the resource is unchanged.
+        """
+        tried, last_error = [], None
+        while True:
+            api_key = self.key_pool.choose(quota_cost(method), exclude=tried)
+            if api_key is None:
+                if last_error is not None:
+                    raise last_error
+                raise RuntimeError(f"All YouTube API keys are out of quota until {self.key_pool.resets_at()}")
+            tried.append(api_key)
+            try:
+                request = build_request(api_key.client)
+                if etag:
+                    request.headers['If-None-Match'] = etag
+                return guard(f'youtube:{api_key.name}').call(self._execute_once, request, method, api_key)
+            except HttpError as e:
+                if not is_quota_exceeded(e):
+                    raise
+                logger.warning(f"YouTube API {api_key.name} is out of quota, failing over")
+                self.key_pool.exhaust(api_key)
+                last_error = e
+            except CircuitOpenError as e:
+                # This key was rejected recently (out of quota or failing); another key may still work
+                last_error = e
+    
+    def _execute_once(self, request: Any, method: str, api_key: Any) -> Any:
+        """
+        Execute a YouTube Data API request once, recording latency, outcome and quota units
+        """
+        start = time.perf_counter()
+        outcome = 'ok'
+        try:
+            return request.execute()
+        except HttpError as e:
+            outcome = str(e.resp.status)
+            if outcome == '304':
+                return NOT_MODIFIED
+            raise
+        except Exception:
+            outcome = 'error'
+            raise
+        finally:
+            metrics.observe('upstream', method, time.perf_counter() - start, outcome)
+            # Rejected (quota / rate limited) and failed requests are not charged; a 304 still costs its quota
+            if outcome in ('ok', '304') or (outcome.startswith('4') and outcome not in ('403', '429')):
+                metrics.add_quota(method, quota_cost(method))
+                self.key_pool.charge(api_key, quota_cost(method))
+    
+    @metrics.timed('service')
+    def search_videos(self, query: str, max_results: int = 10, fields: Optional[str] = None, **options) -> Dict[str, Any]:
+        """
+        Search for YouTube videos based on query and options; `fields` is an optional Data API field mask
         """
         try:
             search_params = {
@@ -239,51 +453,108 @@ class YouTubeService:
             
             # Add optional parameters if provided
             for param in ['channelId', 'order', 'videoDuration', 'publishedAfter', 
-                        'publishedBefore', 'videoCaption', 'videoDefinition', 'regionCode']:
+                        'publishedBefore', 'videoCaption', 'videoDefinition', 'regionCode', 'pageToken']:
                 if param in options and options[param]:
                     search_params[param] = options[param]
+            if fields:
+                search_params['fields'] = fields
             
-            response = self.youtube.search().list(**search_params).execute()
+            response = self._execute(lambda youtube: youtube.search().list(**search_params), 'search.list')
             return response
         except HttpError as e:
             logger.error(f"Error searching videos: {e}")
             raise e
     
-    def get_video_details(self, video_id: str) -> Dict[str, Any]:
+    @metrics.timed('service')
+    def get_video_details(self, video_id: str, fields: Optional[str] = None) -> Dict[str, Any]:
         """
-        Get detailed information about a specific YouTube video
+        Get detailed information about a specific YouTube video; `fields` is an optional Data API field mask
         """
         video_id = self.parse_url(video_id)
         
         try:
-            response = self.youtube.videos().list(
-                part='snippet,contentDetails,statistics',
-                id=video_id
-            ).execute()
+            params = {'part': 'snippet,contentDetails,statistics', 'id': video_id}
+            if fields:
+                params['fields'] = fields
+            response = self._execute(lambda youtube: youtube.videos().list(**params), 'videos.list')
             return response
         except HttpError as e:
             logger.error(f"Error getting video details: {e}")
             raise e
     
-    def get_channel_details(self, channel_id: str) -> Dict[str, Any]:
+    @metrics.timed('service')
+    def get_channel_details(self, channel_id: str, fields: Optional[str] = None) -> Dict[str, Any]:
         """
-        Get detailed information about a specific YouTube channel
+        Get detailed information about a specific YouTube channel; `fields` is an optional Data API field mask
         """
         channel_id = self.parse_url(channel_id)
         
         try:
-            response = self.youtube.channels().list(
-                part='snippet,statistics',
-                id=channel_id
-            ).execute()
+            params = {'part': 'snippet,statistics', 'id': channel_id}
+            if fields:
+                params['fields'] = fields
+            response = self._execute(lambda youtube: youtube.channels().list(**params), 'channels.list')
             return response
         except HttpError as e:
             logger.error(f"Error getting channel details: {e}")
             raise e
     
-    def get_video_comments(self, video_id: str, max_results: int = 20, **options) -> Dict[str, Any]:
+    @metrics.timed('service')
+    def get_videos(self, video_ids: List[str], fields: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get details and statistics of many videos, 50 per request (1 quota unit each); `fields` is an optional field mask
+        """
+        video_ids = list(dict.fromkeys(self.parse_url(video_id) for video_id in video_ids))
+        items = []
+        for i in range(0, len(video_ids), 50):
+            params = {'part': 'snippet,contentDetails,statistics', 'id': ','.join(video_ids[i:i + 50]), 'maxResults': 50}
+            if fields:
+                params['fields'] = fields
+            response = self._execute(lambda youtube: youtube.videos().list(**params), 'videos.list')
+            items.extend(response.get('items', []))
+        return items
+    
+    @metrics.timed('service')
+    def get_channel_uploads(self, channel: str, max_results: int = 50) -> Dict[str, Any]:
+        """
+        Get a channel (snippet, statistics) and the IDs of its latest uploads.
+        `channel` may be a channel ID, an @handle or a channel URL.
+        """
+        handle = re.search(r"(?:^|youtube\.com/)(@[\w.-]+)", channel)
+        channel_id = re.search(r"(UC[0-9A-Za-z_-]{22})", channel)
+        if channel_id:
+            selector = {'id': channel_id.group(1)}
+        elif handle:
+            selector = {'forHandle': handle.group(1)}
+        else:
+            raise ValueError(f"Not a channel ID, @handle or channel URL: {channel}")
+        
+        response = self._execute(lambda youtube: youtube.channels().list(
+            part='snippet,statistics,contentDetails',
+            **selector
+        ), 'channels.list')
+        if not response.get('items'):
+            raise ValueError(f"Channel {channel} not found")
+        item = response['items'][0]
+        
+        uploads = item.get('contentDetails', {}).get('relatedPlaylists', {}).get('uploads')
+        video_ids, page_token = [], None
+        while uploads and len(video_ids) < max_results:
+            params = {'part': 'contentDetails', 'playlistId': uploads, 'maxResults': min(50, max_results - len(video_ids))}
+            if page_token:
+                params['pageToken'] = page_token
+            page = self._execute(lambda youtube: youtube.playlistItems().list(**params), 'playlistItems.list')
+            video_ids.extend(entry['contentDetails']['videoId'] for entry in page.get('items', []))
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                break
+        
+        return {'channel': item, 'videoIds': video_ids}
+    
+    @metrics.timed('service')
+    def get_video_comments(self, video_id: str, max_results: int = 20, fields: Optional[str] = None, **options) -> Dict[str, Any]:
         """
-        Get comments for a specific YouTube video
+        Get comments for a specific YouTube video; `fields` is an optional Data API field mask
         """
         video_id = self.parse_url(video_id)
         
@@ -302,22 +573,63 @@ class YouTubeService:
                 
             if options.get('includeReplies'):
                 params['part'] = 'snippet,replies'
+            
+            if fields:
+                params['fields'] = fields
                 
-            response = self.youtube.commentThreads().list(**params).execute()
+            response = self._execute(lambda youtube: youtube.commentThreads().list(**params), 'commentThreads.list')
             return response
         except HttpError as e:
             logger.error(f"Error getting comments: {e}")
             raise e
     
-    def get_video_transcript(self, video_id: str, language: Optional[str] = 'ko') -> List[Dict[str, Any]]:
+    @metrics.timed('service')
+    def get_video_transcript(self, video_id: str, language: Optional[str] = 'ko') -> Transcript:
         """
-        Get transcript for a specific YouTube video
+        Get the normalized transcript for a specific YouTube video (cached per video and language)
         """
         video_id = self.parse_url(video_id)
+        cache_key = (video_id, language)
+        
+        with self._transcript_cache_lock:
+            cached = self._transcript_cache.get(cache_key)
+            if cached and time.time() - cached[0] < TRANSCRIPT_CACHE_TTL:
+                self._transcript_cache.move_to_end(cache_key)
+                metrics.cache_hit('transcript')
+                return cached[1]
         
+        metrics.cache_miss('transcript')
+        return self._transcript_flights.do(cache_key, self._load_video_transcript, video_id, language)
+    
+    def _load_video_transcript(self, video_id: str, language: Optional[str]) -> Transcript:
+        """
+        Fetch, normalize and cache a transcript (one call per video and language at a time)
+        """
+        # Normalize once per fetch; every tool works on views of this object
+        transcript = Transcript.from_raw(self._fetch_video_transcript(video_id, language), video_id, language)
+        
+        if transcript:
+            with self._transcript_cache_lock:
+                self._transcript_cache[(video_id, language)] = (time.time(), transcript)
+                while len(self._transcript_cache) > TRANSCRIPT_CACHE_SIZE:
+                    self._transcript_cache.popitem(last=False)
+        
+        return transcript
+    
+    def _fetch_video_transcript(self, video_id: str, language: Optional[str] = 'ko') -> Any:
+        """
+        Fetch transcript for a specific YouTube video, paced, retried and circuit-broken by the 'transcript' guard
+        """
+        return guard('transcript').call(self._fetch_video_transcript_once, video_id, language)
+    
+    @metrics.timed('upstream', 'transcript.fetch')
+    def _fetch_video_transcript_once(self, video_id: str, language: Optional[str] = 'ko') -> Any:
+        """
+        Fetch transcript for a specific YouTube video from YouTube
+        """
         try:
             if language:
-                transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+                transcript_list = self.transcript_api.list(video_id)
                 try:
                     transcript = transcript_list.find_transcript([language])
                     return transcript.fetch()
@@ -331,7 +643,7 @@ class YouTubeService:
                         transcript = transcript_list.find_transcript(['en'])
                         return transcript.fetch()
             else:
-                return YouTubeTranscriptApi.get_video_transcript(video_id)
+                return self.transcript_api.fetch(video_id)
                 
         except (TranscriptsDisabled, NoTranscriptFound) as e:
             logger.error(f"No transcript available for video {video_id}: {e}")
@@ -340,16 +652,36 @@ class YouTubeService:
             logger.error(f"Error getting transcript for video {video_id}: {e}")
             raise e
 
-    def get_related_videos(self, video_id: str, max_results: Optional[int] = 10) -> Dict[str, Any]:
+    @metrics.timed('service')
+    def get_chapters(self, transcript: Transcript, view: Optional[TranscriptView] = None, count: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Get related videos for a specific YouTube video
+        Topic chapters for a transcript view. Chapters of the full transcript are cached on the transcript itself.
+        """
+        if view is None:
+            view = transcript.view()
+        
+        if len(view) != len(transcript):
+            return segment_topics(view, count)
+        
+        key = count or 0
+        if key in transcript.chapters:
+            metrics.cache_hit('chapters')
+        else:
+            metrics.cache_miss('chapters')
+            transcript.chapters[key] = segment_topics(view, count)
+        return transcript.chapters[key]
+
+    @metrics.timed('service')
+    def get_related_videos(self, video_id: str, max_results: Optional[int] = 10, fields: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get related videos for a specific YouTube video; `fields` is an optional field mask for the search results
         """
         video_id = self.parse_url(video_id)
         
         try:
             # Use search to find videos for a similar query to effectively get related content
             # First, get video details to use title for search
-            video_details = self.get_video_details(video_id)
+            video_details = self.get_video_details(video_id, projection.VIDEO_RECORD_MASK)
             if not video_details.get('items'):
                 raise ValueError(f"Video with ID {video_id} not found")
             
@@ -358,21 +690,24 @@ class YouTubeService:
             search_query = ' '.join(video_title.split()[:3]) if video_title else ''
             
             # Search for videos with similar content
-            response = self.youtube.search().list(
-                part='snippet',
-                q=search_query,
-                type='video',
-                maxResults=max_results,
-                videoCategoryId=video_details['items'][0]['snippet'].get('categoryId', ''),
-                relevanceLanguage='en'  # Can be adjusted based on requirements
-            ).execute()
+            params = {
+                'part': 'snippet',
+                'q': search_query,
+                'type': 'video',
+                'maxResults': max_results,
+                'videoCategoryId': video_details['items'][0]['snippet'].get('categoryId', ''),
+                'relevanceLanguage': 'en'  # Can be adjusted based on requirements
+            }
+            if fields:
+                params['fields'] = fields
+            response = self._execute(lambda youtube: youtube.search().list(**params), 'search.list')
             
             # Filter out the original video from results
             if 'items' in response:
                 response['items'] = [item for item in response['items'] 
                                     if item.get('id', {}).get('videoId') != video_id]
                 # Adjust result count if original video was filtered
-                if len(response['items']) < max_results:
+                if len(response['items']) < max_results and 'pageInfo' in response:
                     response['pageInfo']['totalResults'] = len(response['items'])
                     response['pageInfo']['resultsPerPage'] = len(response['items'])
             
@@ -385,24 +720,29 @@ class YouTubeService:
             raise e
           
             
-    def get_trending_videos(self, region_code: Optional[str] = 'ko', max_results: Optional[int] = 5) -> Dict[str, Any]:
+    @metrics.timed('service')
+    def get_trending_videos(self, region_code: Optional[str] = 'ko', max_results: Optional[int] = 5,
+                            fields: Optional[str] = projection.VIDEO_RECORD_MASK) -> Dict[str, Any]:
         """
-        Get trending videos for a specific region
+        Get trending videos for a specific region. By default only the fields the dataset records are
+        requested, so one cached (or prefetched) chart serves every default projection.
         """
         try:
             params = {
                 'part': 'snippet,contentDetails,statistics',
                 'chart': 'mostPopular',
-                'maxResults': max_results
+                'maxResults': TRENDING_PAGE_SIZE
             }
+            if fields:
+                params['fields'] = fields
             
             if region_code:
                 # Normalize region code to ensure valid ISO country code format
                 normalized_code = self.normalize_region_code(region_code)
                 params['regionCode'] = normalized_code
                 
-            response = self.youtube.videos().list(**params).execute()
-            return response
+            response = self._execute(lambda youtube: youtube.videos().list(**params), 'videos.list')
+            return {**response, 'items': response.get('items', [])[:max_results]}
         except HttpError as e:
             logger.error(f"Error getting trending videos: {e}")
             raise e
@@ -411,18 +751,9 @@ class YouTubeService:
         """
         Format milliseconds into a human-readable time string
         """
-        seconds = int(milliseconds / 1000)
-        minutes = int(seconds / 60)
-        hours = int(minutes / 60)
-        
-        remaining_seconds = seconds % 60
-        remaining_minutes = minutes % 60
-        
-        if hours > 0:
-            return f"{hours:02d}:{remaining_minutes:02d}:{remaining_seconds:02d}"
-        else:
-            return f"{remaining_minutes:02d}:{remaining_seconds:02d}"
+        return format_time(milliseconds / 1000)
 
+    @metrics.timed('service')
     def get_video_enhanced_transcript(self, video_ids: List[str], options: Dict[str, Any]) -> Dict[str, Any]:
         """
         Get enhanced transcript for one or more YouTube videos with advanced filtering and processing
@@ -436,6 +767,9 @@ class YouTubeService:
                 - timeRange (Dict, optional): Time range filter with start and end in seconds
                 - search (Dict, optional): Search filter with query, caseSensitive, and contextLines
                 - segment (Dict, optional): Segmentation options with method and count
+                - encoding (str, optional): Segment encoding ("segments" or "columnar")
+                - pageToken (str, optional): Token of the segment page to return
+                - pageSize (int, optional): Number of segments per page (default: all)
                 
         Returns:
             Dict[str, Any]: Enhanced transcript data
@@ -457,6 +791,9 @@ class YouTubeService:
         time_range = options.get('timeRange')
         search_filter = options.get('search')
         segment_options = options.get('segment')
+        columnar = options.get('encoding') == 'columnar'
+        page_token = options.get('pageToken')
+        page_size = options.get('pageSize')
         
         # Process each video
         for video_id in video_ids:
@@ -465,7 +802,7 @@ class YouTubeService:
             try:
                 # Get video details if metadata requested
                 if include_metadata:
-                    video_data = self.get_video_details(video_id)
+                    video_data = self.get_video_details(video_id, projection.VIDEO_RECORD_MASK)
                     if not video_data.get('items'):
                         video_result["error"] = f"Video with ID {video_id} not found"
                         result["videos"].append(video_result)
@@ -481,169 +818,76 @@ class YouTubeService:
                         'duration': video.get('contentDetails', {}).get('duration')
                     }
                 
-                # Call the get_video_transcript method which returns transcript data
-                raw_transcript_data = self.get_video_transcript(video_id, language)
+                # Normalized transcript (fetched once, cached); filters below only select indices
+                transcript = self.get_video_transcript(video_id, language)
                 
-                # Check if transcript was fetched successfully
-                if not raw_transcript_data or (isinstance(raw_transcript_data, dict) and 'error' in raw_transcript_data):
-                    error_msg = raw_transcript_data.get('error', "Failed to retrieve transcript") if isinstance(raw_transcript_data, dict) else "Failed to retrieve transcript"
-                    video_result["error"] = error_msg
+                if not transcript:
+                    video_result["error"] = "Failed to retrieve transcript"
                     result["videos"].append(video_result)
                     result["status"]["failedCount"] += 1
                     continue
                 
-                # Get transcript segments - adapt to different response formats
-                if isinstance(raw_transcript_data, dict) and 'transcript' in raw_transcript_data:
-                    # If it's a dictionary with transcript key (from existing get_video_transcript method)
-                    segments = raw_transcript_data['transcript']
-                elif isinstance(raw_transcript_data, dict) and 'text' in raw_transcript_data:
-                    # If the get_video_transcript method returned a formatted response with 'text'
-                    # This is a fallback case
-                    segments = []
-                    video_result["error"] = "Transcript format not supported"
-                    result["videos"].append(video_result)
-                    result["status"]["failedCount"] += 1
-                    continue
-                elif isinstance(raw_transcript_data, list):
-                    # If it returned a list directly (might happen in some cases)
-                    segments = []
-                    for item in raw_transcript_data:
-                        segments.append({
-                            'text': item.get('text', ''),
-                            'start': item.get('start', 0),
-                            'duration': item.get('duration', 0),
-                            'timestamp': self.format_time(int(item.get('start', 0) * 1000))
-                        })
-                else:
-                    # This handles the FetchedTranscript objects from YouTubeTranscriptApi
-                    # that don't have a .get() method
-                    segments = []
-                    for segment in raw_transcript_data:
-                        text = getattr(segment, 'text', '')
-                        start = getattr(segment, 'start', 0)
-                        duration = getattr(segment, 'duration', 0)
-                        
-                        segments.append({
-                            'text': text,
-                            'start': start,
-                            'duration': duration,
-                            'timestamp': self.format_time(int(start * 1000))
-                        })
+                view = transcript.view()
                 
                 # Apply time range filter if specified
                 if time_range:
-                    start_time = time_range.get('start')
-                    end_time = time_range.get('end')
-                    
-                    if start_time is not None:
-                        segments = [s for s in segments if (s['start'] + s['duration']) >= start_time]
-                    
-                    if end_time is not None:
-                        segments = [s for s in segments if s['start'] <= end_time]
+                    view = view.time_range(time_range.get('start'), time_range.get('end'))
                 
                 # Apply search filter if specified
-                if search_filter and segments:
-                    query = search_filter.get('query', '')
-                    case_sensitive = search_filter.get('caseSensitive', False)
-                    context_lines = search_filter.get('contextLines', 0)
-                    
-                    if query:
-                        # Search in segments
-                        matched_indices = []
-                        search_query = query if case_sensitive else query.lower()
-                        
-                        for i, segment in enumerate(segments):
-                            text = segment['text'] if case_sensitive else segment['text'].lower()
-                            if search_query in text:
-                                matched_indices.append(i)
-                        
-                        # Include context lines
-                        if context_lines > 0:
-                            expanded_indices = set()
-                            for idx in matched_indices:
-                                # Add the context lines before and after
-                                for i in range(max(0, idx - context_lines), min(len(segments), idx + context_lines + 1)):
-                                    expanded_indices.add(i)
-                            
-                            matched_indices = sorted(expanded_indices)
-                        
-                        # Filter segments by matched indices
-                        segments = [segments[i] for i in matched_indices]
+                if search_filter and view:
+                    view = view.search(
+                        search_filter.get('query', ''),
+                        search_filter.get('caseSensitive', False),
+                        search_filter.get('contextLines', 0)
+                    )
                 
                 # Apply segmentation if specified
-                if segment_options and segments:
+                if segment_options and view:
                     method = segment_options.get('method', 'equal')
                     count = segment_options.get('count', 1)
                     
+                    bounds = None
                     if method == 'equal' and count > 1:
                         # Divide into equal parts
-                        segment_size = len(segments) // count
-                        segmented_transcript = []
-                        
-                        for i in range(count):
-                            start_idx = i * segment_size
-                            end_idx = start_idx + segment_size if i < count - 1 else len(segments)
-                            
-                            segment_chunks = segments[start_idx:end_idx]
-                            if segment_chunks:  # Only add non-empty segments
-                                segmented_transcript.append({
-                                    "index": i,
-                                    "segments": segment_chunks,
-                                    "text": " ".join([s['text'] for s in segment_chunks])
-                                })
-                        
-                        video_result["segments"] = segmented_transcript
+                        bounds = view.split_equal(count)
                     elif method == 'smart' and count > 1:
-                        # Use a smarter segmentation approach
-                        # For simplicity, we'll use a basic approach dividing by total character count
-                        total_text = " ".join([s['text'] for s in segments])
-                        total_chars = len(total_text)
-                        chars_per_segment = total_chars // count
-                        
-                        segmented_transcript = []
-                        current_segment = []
-                        current_chars = 0
-                        segment_idx = 0
-                        
-                        for s in segments:
-                            current_segment.append(s)
-                            current_chars += len(s['text'])
-                            
-                            if current_chars >= chars_per_segment and segment_idx < count - 1:
-                                segmented_transcript.append({
-                                    "index": segment_idx,
-                                    "segments": current_segment,
-                                    "text": " ".join([seg['text'] for seg in current_segment])
-                                })
-                                segment_idx += 1
-                                current_segment = []
-                                current_chars = 0
-                        
-                        # Add the last segment if not empty
-                        if current_segment:
-                            segmented_transcript.append({
-                                "index": segment_idx,
-                                "segments": current_segment,
-                                "text": " ".join([seg['text'] for seg in current_segment])
-                            })
-                        
-                        video_result["segments"] = segmented_transcript
+                        # Divide at topic shifts (lexical cohesion), with chapter titles and keywords
+                        chapters = self.get_chapters(transcript, view, count)
+                        video_result["segments"] = []
+                        for chapter in chapters:
+                            group = self._segment_group(chapter["index"], view, chapter["startIndex"], chapter["endIndex"], columnar)
+                            group.update({"title": chapter["title"], "keywords": chapter["keywords"]})
+                            video_result["segments"].append(group)
+                    
+                    if bounds:
+                        video_result["segments"] = [
+                            self._segment_group(index, view, start, end, columnar)
+                            for index, (start, end) in enumerate(bounds)
+                            if end > start  # Only add non-empty segments
+                        ]
+                
+                # Select the requested page of segments
+                page_start, page_end, next_page_token = page_bounds(len(view), page_token, page_size)
+                page = view[page_start:page_end]
+                if page_size:
+                    video_result["page"] = {"startIndex": page_start, "endIndex": page_end, "totalSegments": len(view)}
+                    video_result["nextPageToken"] = next_page_token
                 
                 # Format transcript based on format type
-                if format_type == 'raw':
-                    video_result["transcript"] = segments
+                if columnar:
+                    video_result["transcript"] = page.to_columnar()
+                elif format_type == 'raw':
+                    video_result["transcript"] = page.to_segments()
                 elif format_type == 'timestamped':
-                    video_result["transcript"] = [
-                        f"[{s['timestamp']}] {s['text']}" for s in segments
-                    ]
+                    video_result["transcript"] = page.timestamped_lines()
                 elif format_type == 'merged':
-                    video_result["transcript"] = " ".join([s['text'] for s in segments])
+                    video_result["transcript"] = page.full_text()
                 
                 # Store statistics
                 video_result["statistics"] = {
-                    "segmentCount": len(segments),
-                    "totalDuration": sum([s['duration'] for s in segments]),
-                    "averageSegmentLength": sum([len(s['text']) for s in segments]) / len(segments) if segments else 0
+                    "segmentCount": len(view),
+                    "totalDuration": view.total_duration(),
+                    "averageSegmentLength": view.average_length()
                 }
                 
                 result["videos"].append(video_result)
@@ -665,8 +909,61 @@ class YouTubeService:
         
         return result
 
+    def _segment_group(self, index: int, view: TranscriptView, start: int, end: int, columnar: bool = False) -> Dict[str, Any]:
+        """
+        Build one segmentation group. Columnar groups reference segment indices instead of repeating the segments.
+        """
+        chunk = view[start:end]
+        if columnar:
+            return {
+                "index": index,
+                "startIndex": start,
+                "endIndex": end,
+                "start": chunk.start_time(),
+                "end": chunk.end_time()
+            }
+        return {
+            "index": index,
+            "segments": chunk.to_segments(),
+            "text": chunk.full_text()
+        }
+
 # Initialize YouTube service
 youtube_service = YouTubeService()
+# Keeps the trending charts of PREFETCH_REGIONS warm in the response cache (started with the server)
+prefetcher = Prefetcher(youtube_service, PREFETCH_REGIONS, PREFETCH_INTERVAL)
+dataset = Dataset() if DATASET_CAPTURE else None
+# Detects new uploads on watched channels from their public feeds
+watchlist_monitor = WatchlistMonitor(youtube_service)
+# Multi-page, multi-query search collection under a quota budget
+harvester = Harvester(youtube_service)
+# Chunk notes for the transcript_summary prompt, cached by content hash
+summarizer = Summarizer()
+
+def capture(table: str, rows: List[Dict[str, Any]]) -> None:
+    """
+    Append rows fetched by a tool to the local dataset; a failed write is logged, never returned to the caller
+    """
+    if dataset is None or not rows:
+        return
+    try:
+        dataset.append(table, rows)
+    except Exception as e:
+        logger.warning(f"Could not record {table} rows in the dataset: {e}")
+
+def request_fields(schema: Dict[str, Any], names: List[str], record: tuple = (), required: tuple = ()) -> str:
+    """
+    Data API field mask for a tool's projection plus the paths the tool itself needs, widened to the
+    paths the dataset records when capture is on
+    """
+    return projection.mask(projection.paths(schema, names) + list(required) +
+                           (list(record) if dataset is not None else []))
+
+def capture_videos(items: List[Dict[str, Any]]) -> None:
+    observed_at = now_iso()
+    rows = [video_rows(item, observed_at) for item in items]
+    capture('videos', [video for video, _ in rows])
+    capture('stats', [stats for _, stats in rows])
 
 # Define resource
 @mcp.resource(
@@ -684,12 +981,32 @@ async def get_available_youtube_tools() -> List[Dict[str, str]]:
         {"name": "get_video_transcript", "description": "Get transcript/captions for a YouTube video"},
         {"name": "get_related_videos", "description": "Get videos related to a specific YouTube video"},
         {"name": "get_trending_videos", "description": "Get trending videos on YouTube by region"},
-        {"name": "get_video_enhanced_transcript", "description": "Advanced transcript extraction tool with filtering, search, and multi-video capabilities. Provides rich transcript data for detailed analysis and processing. Features: 1) Extract transcripts from multiple videos; 2) Filter by time ranges; 3) Search within transcripts; 4) Segment transcripts; 5) Format output in different ways; 6) Include video metadata."}
+        {"name": "get_video_enhanced_transcript", "description": "Advanced transcript extraction tool with filtering, search, and multi-video capabilities. Provides rich transcript data for detailed analysis and processing. Features: 1) Extract transcripts from multiple videos; 2) Filter by time ranges; 3) Search within transcripts; 4) Segment transcripts; 5) Format output in different ways; 6) Include video metadata."},
+        {"name": "get_video_chapters", "description": "Split a video transcript into topic chapters with titles and keywords, and optionally return the text of one chapter"},
+        {"name": "get_transcript_digest", "description": "Key sentences with timestamps and key phrases of a video transcript, extracted locally in milliseconds without an LLM"},
+        {"name": "harvest_search_videos", "description": "Collect hundreds of ranked search results in one call across result pages and query variants, within a quota budget"},
+        {"name": "check_watchlist_uploads", "description": "Detect new uploads on watched channels from their public feeds, using quota only to fetch details of new videos"},
+        {"name": "analyze_dataset", "description": "Run analytical queries (top videos by views/day, views by title length, upload cadence, outlier title keywords) over the locally collected dataset without using API quota"}
     ]
     
     logger.info(f"Resource 'get_available_youtube_tools' called. Returning {len(available_tools)} tools.")
     return available_tools
 
+@mcp.resource(
+    uri='youtube://metrics',
+    name="metrics",
+    description="Per-tool latency (p50/p95), upstream calls, quota units, cache hit ratios, retries, circuit breaker states, coalesced requests, quota per API key, background prefetch runs and HTTP transport traffic since the server started"
+)
+async def get_metrics_resource() -> Dict[str, Any]:
+    """Returns a snapshot of the server's performance metrics."""
+    coalesced = {
+        name: {'calls': flights.calls, 'shared': flights.shared}
+        for name, flights in (('api', youtube_service._api_flights), ('transcript', youtube_service._transcript_flights))
+    }
+    return {**metrics.snapshot(), 'resilience': resilience_snapshot(), 'coalesced': coalesced,
+            'apiKeys': youtube_service.key_pool.snapshot(), 'prefetch': prefetcher.snapshot(),
+            'transport': youtube_service.transport.snapshot()}
+
 @mcp.resource(
     uri='youtube://video/{video_id}',
     name="video",
@@ -707,7 +1024,7 @@ async def get_video_resource(video_id: str) -> str:
     """
 
     try:
-        video_data = youtube_service.get_video_details(video_id)
+        video_data = await asyncio.to_thread(youtube_service.get_video_details, video_id, projection.VIDEO_RECORD_MASK)
         
         if not video_data.get('items'):
             return {
@@ -764,7 +1081,9 @@ async def get_channel_resource(channel_id: str) -> Dict[str, Any]:
         Dict[str, Any]: Channel details resource
     """
     try:
-        channel_data = youtube_service.get_channel_details(channel_id)
+        channel_data = await asyncio.to_thread(
+            youtube_service.get_channel_details, channel_id,
+            request_fields(projection.CHANNEL_FIELDS, projection.CHANNEL_DEFAULT, projection.CHANNEL_RECORD))
         
         if not channel_data.get('items'):
             return {
@@ -820,7 +1139,7 @@ async def get_video_transcript_resource(video_id: str, language: Optional[str] =
     """
     try:
         # Get video details for metadata
-        video_data = youtube_service.get_video_details(video_id)
+        video_data = await asyncio.to_thread(youtube_service.get_video_details, video_id, projection.VIDEO_RECORD_MASK)
         
         if not video_data.get('items'):
             return {
@@ -834,22 +1153,7 @@ async def get_video_transcript_resource(video_id: str, language: Optional[str] =
         
         try:
             # Get transcript
-            transcript_data = youtube_service.get_video_transcript(video_id, language)
-            
-            # Format transcript with timestamps
-            formatted_transcript = []
-            for segment in transcript_data:
-                # FetchedTranscriptSnippet 객체에서 속성으로 접근
-                text = getattr(segment, 'text', '')
-                start = getattr(segment, 'start', 0)
-                duration = getattr(segment, 'duration', 0)
-                
-                formatted_transcript.append({
-                    'text': text,
-                    'start': start,
-                    'duration': duration,
-                    'timestamp': youtube_service.format_time(int(start * 1000))
-                })
+            transcript = await asyncio.to_thread(youtube_service.get_video_transcript, video_id, language)
             
             # Create metadata
             metadata = {
@@ -857,14 +1161,11 @@ async def get_video_transcript_resource(video_id: str, language: Optional[str] =
                 'title': video.get('snippet', {}).get('title'),
                 'channelTitle': video.get('snippet', {}).get('channelTitle'),
                 'language': language or 'default',
-                'segmentCount': len(transcript_data)
+                'segmentCount': len(transcript)
             }
             
             # Create timestamped text version
-            timestamped_text = "\n".join([
-                f"[{item['timestamp']}] {item['text']}" 
-                for item in formatted_transcript
-            ])
+            timestamped_text = "\n".join(transcript.view().timestamped_lines())
             
             return {
                 "contents": [{
@@ -894,6 +1195,7 @@ async def get_video_transcript_resource(video_id: str, language: Optional[str] =
     name="search_videos",
     description="Search for YouTube videos with advanced filtering options",
 )
+@metrics.timed('tool')
 async def search_videos(
     query: str, 
     max_results: Optional[int] = 10, 
@@ -904,7 +1206,8 @@ async def search_videos(
     published_before: Optional[str] = None,
     video_caption: Optional[str] = None,
     video_definition: Optional[str] = None,
-    region_code: Optional[str] = None
+    region_code: Optional[str] = None,
+    fields: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Search for YouTube videos with advanced filtering options
@@ -920,11 +1223,14 @@ async def search_videos(
         video_caption (str, optional): Filter by caption availability
         video_definition (str, optional): Filter by quality (standard/high)
         region_code (str, optional): Filter by country (ISO country code)
+        fields (List[str], optional): Fields per result (default: videoId, title, channelTitle, publishedAt, url;
+            also description, channelId, thumbnail, thumbnails; ["*"] for all)
     
     Returns:
         Dict[str, Any]: Search results
     """
     try:
+        names = projection.select(fields, projection.SEARCH_FIELDS, projection.SEARCH_DEFAULT)
         options = {
             'channelId': channel_id,
             'order': order,
@@ -936,23 +1242,15 @@ async def search_videos(
             'regionCode': region_code
         }
         
-        search_results = youtube_service.search_videos(query, max_results, **options)
+        search_results = await asyncio.to_thread(
+            youtube_service.search_videos, query, max_results, request_fields(projection.SEARCH_FIELDS, names, projection.SEARCH_RECORD), **options)
+        capture('search_results', search_rows(query, search_results, now_iso()))
         
         # Format the response
-        formatted_results = []
-        for item in search_results.get('items', []):
-            video_id = item.get('id', {}).get('videoId')
-            
-            formatted_results.append({
-                'videoId': video_id,
-                'title': item.get('snippet', {}).get('title'),
-                'channelId': item.get('snippet', {}).get('channelId'),
-                'channelTitle': item.get('snippet', {}).get('channelTitle'),
-                'publishedAt': item.get('snippet', {}).get('publishedAt'),
-                'description': item.get('snippet', {}).get('description'),
-                'thumbnails': item.get('snippet', {}).get('thumbnails'),
-                'url': f"https://www.youtube.com/watch?v={video_id}"
-            })
+        formatted_results = [
+            projection.project(item, projection.SEARCH_FIELDS, names)
+            for item in search_results.get('items', [])
+        ]
             
         return {
             'items': formatted_results,
@@ -963,46 +1261,116 @@ async def search_videos(
         logger.exception(f"Error in search_videos: {e}")
         return {'error': str(e)}
 
+@mcp.tool(
+    name="harvest_search_videos",
+    description="Collect many search results in one call: follows result pages of one or more query variants until max_results unique videos or the quota_budget (search.list costs 100 units per page of 50 results), removes duplicates across pages and queries, fetches statistics for every hit (1 unit per 50 videos) and returns compact results ranked by rank_by: 'views_per_day' (default), 'views', 'engagement' (likes and comments per view) or 'relevance' (matched by most query variants, then best search position). Use this instead of paging search_videos over several turns when research needs more than 50 candidates.",
+)
+@metrics.timed('tool')
+async def harvest_search_videos(
+    queries: List[str],
+    max_results: Optional[int] = 200,
+    quota_budget: Optional[int] = 1000,
+    rank_by: Optional[str] = 'views_per_day',
+    channel_id: Optional[str] = None,
+    order: Optional[str] = None,
+    video_duration: Optional[str] = None,
+    published_after: Optional[str] = None,
+    published_before: Optional[str] = None,
+    region_code: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Harvest, deduplicate, hydrate and rank search results across pages and query variants
+    
+    Args:
+        queries (List[str]): Search terms; variants of one topic widen the candidate pool
+        max_results (int): Unique videos to collect and return (default: 200)
+        quota_budget (int): Maximum quota units to spend, search pages and statistics included (default: 1000)
+        rank_by (str): views_per_day, views, engagement or relevance
+        channel_id, order, video_duration, published_after, published_before, region_code: search_videos filters
+        fields (List[str], optional): Fields per video (default: id, title, channelTitle, publishedAt, duration,
+            viewCount, url; any get_video_details field; ["*"] for all)
+    
+    Returns:
+        Dict[str, Any]: Ranked videos with their score and matched queries, per-query page counts, quota units spent
+    """
+    try:
+        names = projection.select(fields, projection.VIDEO_FIELDS, projection.HARVEST_DEFAULT)
+        options = {
+            'channelId': channel_id,
+            'order': order,
+            'videoDuration': video_duration,
+            'publishedAfter': published_after,
+            'publishedBefore': published_before,
+            'regionCode': region_code
+        }
+        # Search pages only need the video IDs (plus what the dataset records); hydration brings the rest
+        search_fields = projection.mask(['id.videoId'] + (list(projection.SEARCH_RECORD) if dataset is not None else []))
+        observed_at = now_iso()
+        
+        def record_page(query: str, page: Dict[str, Any], offset: int) -> None:
+            rows = search_rows(query, page, observed_at)
+            for row in rows:
+                row['rank'] += offset
+            capture('search_results', rows)
+        
+        result = await asyncio.to_thread(
+            harvester.harvest, queries, max_results or 200, quota_budget or 1000, rank_by or 'views_per_day',
+            {key: value for key, value in options.items() if value}, search_fields,
+            request_fields(projection.VIDEO_FIELDS, names, projection.VIDEO_RECORD, HYDRATE_PATHS), record_page)
+        capture_videos(result['videos'])
+        
+        items = [
+            {
+                'rank': rank,
+                **projection.project(video, projection.VIDEO_FIELDS, names),
+                'score': round(video['harvest']['score'], 4),
+                'matchedQueries': video['harvest']['queries'],
+            }
+            for rank, video in enumerate(result['videos'], 1)
+        ]
+        
+        return {
+            'items': items,
+            'totalResults': len(items),
+            'rankBy': rank_by or 'views_per_day',
+            **{key: value for key, value in result.items() if key != 'videos'}
+        }
+    except Exception as e:
+        logger.exception(f"Error in harvest_search_videos: {e}")
+        return {'error': str(e)}
+
 @mcp.tool(
     name="get_video_details",
     description="Get detailed information about a YouTube video",
 )
-async def get_video_details(video_id: str) -> Dict[str, Any]:
+@metrics.timed('tool')
+async def get_video_details(video_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Get detailed information about a YouTube video
     
     Args:
         video_id (str): YouTube video ID
+        fields (List[str], optional): Fields to return (default: id, title, description, publishedAt, channelId,
+            channelTitle, tags, duration, viewCount, likeCount, commentCount, url; also categoryId, thumbnail,
+            thumbnails, dimension, definition, caption; ["*"] for all)
     
     Returns:
         Dict[str, Any]: Video details
     """
     try:
-        video_data = youtube_service.get_video_details(video_id)
+        names = projection.select(fields, projection.VIDEO_FIELDS, projection.VIDEO_DEFAULT)
+        video_data = await asyncio.to_thread(
+            youtube_service.get_video_details, video_id, request_fields(projection.VIDEO_FIELDS, names, projection.VIDEO_RECORD))
         
         if not video_data.get('items'):
             return {'error': f"Video with ID {video_id} not found"}
             
         video = video_data['items'][0]
+        capture_videos([video])
         
         # Format the response
-        details = {
-            'id': video.get('id'),
-            'title': video.get('snippet', {}).get('title'),
-            'description': video.get('snippet', {}).get('description'),
-            'publishedAt': video.get('snippet', {}).get('publishedAt'),
-            'channelId': video.get('snippet', {}).get('channelId'),
-            'channelTitle': video.get('snippet', {}).get('channelTitle'),
-            'tags': video.get('snippet', {}).get('tags', []),
-            'viewCount': video.get('statistics', {}).get('viewCount'),
-            'likeCount': video.get('statistics', {}).get('likeCount'),
-            'commentCount': video.get('statistics', {}).get('commentCount'),
-            'duration': video.get('contentDetails', {}).get('duration'),
-            'dimension': video.get('contentDetails', {}).get('dimension'),
-            'definition': video.get('contentDetails', {}).get('definition'),
-            'thumbnails': video.get('snippet', {}).get('thumbnails'),
-            'url': f"https://www.youtube.com/watch?v={video_id}"
-        }
+        details = projection.project(video, projection.VIDEO_FIELDS, names)
         
         return details
     except Exception as e:
@@ -1013,37 +1381,32 @@ async def get_video_details(video_id: str) -> Dict[str, Any]:
     name="get_channel_details",
     description="Get detailed information about a YouTube channel",
 )
-async def get_channel_details(channel_id: str) -> Dict[str, Any]:
+@metrics.timed('tool')
+async def get_channel_details(channel_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Get detailed information about a YouTube channel
     
     Args:
         channel_id (str): YouTube channel ID
+        fields (List[str], optional): Fields to return (default: id, title, description, publishedAt, customUrl,
+            subscriberCount, videoCount, viewCount, url; also country, thumbnail, thumbnails; ["*"] for all)
     
     Returns:
         Dict[str, Any]: Channel details
     """
     try:
-        channel_data = youtube_service.get_channel_details(channel_id)
+        names = projection.select(fields, projection.CHANNEL_FIELDS, projection.CHANNEL_DEFAULT)
+        channel_data = await asyncio.to_thread(
+            youtube_service.get_channel_details, channel_id, request_fields(projection.CHANNEL_FIELDS, names, projection.CHANNEL_RECORD))
         
         if not channel_data.get('items'):
             return {'error': f"Channel with ID {channel_id} not found"}
             
         channel = channel_data['items'][0]
+        capture('channels', [channel_row(channel, now_iso())])
         
         # Format the response
-        details = {
-            'id': channel.get('id'),
-            'title': channel.get('snippet', {}).get('title'),
-            'description': channel.get('snippet', {}).get('description'),
-            'publishedAt': channel.get('snippet', {}).get('publishedAt'),
-            'customUrl': channel.get('snippet', {}).get('customUrl'),
-            'thumbnails': channel.get('snippet', {}).get('thumbnails'),
-            'subscriberCount': channel.get('statistics', {}).get('subscriberCount'),
-            'videoCount': channel.get('statistics', {}).get('videoCount'),
-            'viewCount': channel.get('statistics', {}).get('viewCount'),
-            'url': f"https://www.youtube.com/channel/{channel_id}"
-        }
+        details = projection.project(channel, projection.CHANNEL_FIELDS, names)
         
         return details
     except Exception as e:
@@ -1054,12 +1417,14 @@ async def get_channel_details(channel_id: str) -> Dict[str, Any]:
     name="get_video_comments",
     description="Get comments for a YouTube video",
 )
+@metrics.timed('tool')
 async def get_video_comments(
     video_id: str, 
     max_results: Optional[int] = 20, 
     order: Optional[str] = "relevance", 
     include_replies: bool = False,
-    page_token: Optional[str] = None
+    page_token: Optional[str] = None,
+    fields: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Get comments for a YouTube video
@@ -1070,11 +1435,20 @@ async def get_video_comments(
         order (str): Order by 'relevance' (default) or 'time'
         include_replies (bool): Whether to include replies to comments
         page_token (str, optional): Token for paginated results
+        fields (List[str], optional): Fields per comment and reply (default: id, text, author, likeCount, publishedAt,
+            replyCount; also authorProfileImageUrl, updatedAt; ["*"] for all)
     
     Returns:
         Dict[str, Any]: Comments data
     """
     try:
+        names = projection.select(fields, projection.COMMENT_FIELDS, projection.COMMENT_DEFAULT)
+        reply_names = [name for name in names if name in projection.REPLY_FIELDS]
+        item_paths = projection.paths(projection.COMMENT_FIELDS, names)
+        if include_replies:
+            item_paths += projection.paths(projection.REPLY_FIELDS, reply_names, prefix='replies.comments.')
+        if dataset is not None:
+            item_paths += projection.COMMENT_RECORD
         options = {
             'order': order,
             'includeReplies': include_replies,
@@ -1083,40 +1457,21 @@ async def get_video_comments(
         if page_token:
             options['pageToken'] = page_token
             
-        comments_data = youtube_service.get_video_comments(video_id, max_results, **options)
+        comments_data = await asyncio.to_thread(
+            youtube_service.get_video_comments, video_id, max_results, projection.mask(item_paths), **options)
+        capture('comments', comment_rows(youtube_service.parse_url(video_id), comments_data, now_iso()))
         
         # Format the response
         formatted_comments = []
         for item in comments_data.get('items', []):
-            comment = item.get('snippet', {}).get('topLevelComment', {}).get('snippet', {})
-            
-            formatted_comment = {
-                'id': item.get('id'),
-                'text': comment.get('textDisplay'),
-                'author': comment.get('authorDisplayName'),
-                'authorProfileImageUrl': comment.get('authorProfileImageUrl'),
-                'likeCount': comment.get('likeCount'),
-                'publishedAt': comment.get('publishedAt'),
-                'updatedAt': comment.get('updatedAt'),
-                'replyCount': item.get('snippet', {}).get('totalReplyCount', 0)
-            }
+            formatted_comment = projection.project(item, projection.COMMENT_FIELDS, names)
             
             # Include replies if requested and available
             if include_replies and 'replies' in item:
-                reply_comments = []
-                for reply in item.get('replies', {}).get('comments', []):
-                    reply_snippet = reply.get('snippet', {})
-                    reply_comments.append({
-                        'id': reply.get('id'),
-                        'text': reply_snippet.get('textDisplay'),
-                        'author': reply_snippet.get('authorDisplayName'),
-                        'authorProfileImageUrl': reply_snippet.get('authorProfileImageUrl'),
-                        'likeCount': reply_snippet.get('likeCount'),
-                        'publishedAt': reply_snippet.get('publishedAt'),
-                        'updatedAt': reply_snippet.get('updatedAt')
-                    })
-                
-                formatted_comment['replies'] = reply_comments
+                formatted_comment['replies'] = [
+                    projection.project(reply, projection.REPLY_FIELDS, reply_names)
+                    for reply in item.get('replies', {}).get('comments', [])
+                ]
                 
             formatted_comments.append(formatted_comment)
             
@@ -1133,20 +1488,30 @@ async def get_video_comments(
     name="get_video_transcript",
     description="Get transcript/captions for a YouTube video",
 )
-async def get_video_transcript(video_id: str, language: Optional[str] = 'ko') -> Dict[str, Any]:
+@metrics.timed('tool')
+async def get_video_transcript(
+    video_id: str,
+    language: Optional[str] = 'ko',
+    encoding: Optional[str] = "segments",
+    page_token: Optional[str] = None,
+    page_size: Optional[int] = None
+) -> Dict[str, Any]:
     """
     Get transcript/captions for a YouTube video
     
     Args:
         video_id (str): YouTube video ID
         language (str, optional): Language code (e.g., 'en', 'ko', 'fr')
+        encoding (str, optional): "segments" (dict per segment plus timestamped text) or "columnar" (parallel start/duration/text arrays)
+        page_token (str, optional): Token for the next page of segments
+        page_size (int, optional): Number of segments per page (default: all)
     
     Returns:
         Dict[str, Any]: Transcript data
     """
     try:
         # Get video details for metadata
-        video_data = youtube_service.get_video_details(video_id)
+        video_data = await asyncio.to_thread(youtube_service.get_video_details, video_id, projection.VIDEO_RECORD_MASK)
         
         if not video_data.get('items'):
             return {'error': f"Video with ID {video_id} not found"}
@@ -1155,21 +1520,9 @@ async def get_video_transcript(video_id: str, language: Optional[str] = 'ko') ->
         
         # Get transcript
         try:
-            transcript_data = youtube_service.get_video_transcript(video_id, language)
-            
-            # Format transcript with timestamps
-            formatted_transcript = []
-            for segment in transcript_data:
-                text = getattr(segment, 'text', '')
-                start = getattr(segment, 'start', 0)
-                duration = getattr(segment, 'duration', 0)
-                
-                formatted_transcript.append({
-                    'text': text,
-                    'start': start,
-                    'duration': duration,
-                    'timestamp': youtube_service.format_time(int(start * 1000))
-                })
+            transcript = await asyncio.to_thread(youtube_service.get_video_transcript, video_id, language)
+            page_start, page_end, next_page_token = page_bounds(len(transcript), page_token, page_size)
+            page = transcript.view()[page_start:page_end]
             
             # Create metadata
             metadata = {
@@ -1177,21 +1530,27 @@ async def get_video_transcript(video_id: str, language: Optional[str] = 'ko') ->
                 'title': video.get('snippet', {}).get('title'),
                 'channelTitle': video.get('snippet', {}).get('channelTitle'),
                 'language': language or 'default',
-                'segmentCount': len(transcript_data)
+                'segmentCount': len(transcript)
             }
             
-            # Create timestamped text version
-            timestamped_text = "\n".join([
-                f"[{item['timestamp']}] {item['text']}" 
-                for item in formatted_transcript
-            ])
-            
-            return {
+            result = {
                 'metadata': metadata,
-                'transcript': formatted_transcript,
-                'text': timestamped_text,
                 'channelId': video.get('snippet', {}).get('channelId')
             }
+            
+            if page_size:
+                result['page'] = {'startIndex': page_start, 'endIndex': page_end}
+                result['nextPageToken'] = next_page_token
+            
+            if encoding == 'columnar':
+                result['transcript'] = page.to_columnar()
+                return result
+            
+            # Segments with timestamps plus a timestamped text version
+            result['transcript'] = page.to_segments()
+            result['text'] = "\n".join(page.timestamped_lines())
+            
+            return result
         except Exception as e:
             return {
                 'error': f"Could not retrieve transcript: {str(e)}",
@@ -1207,34 +1566,32 @@ async def get_video_transcript(video_id: str, language: Optional[str] = 'ko') ->
     name="get_related_videos",
     description="Get videos related to a specific YouTube video",
 )
-async def get_related_videos(video_id: str, max_results: Optional[int] = 10) -> Dict[str, Any]:
+@metrics.timed('tool')
+async def get_related_videos(video_id: str, max_results: Optional[int] = 10,
+                             fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Get videos related to a specific YouTube video
     
     Args:
         video_id (str): YouTube video ID
         max_results (int): Maximum number of related videos to return (default: 10)
+        fields (List[str], optional): Fields per video (default: videoId, title, channelTitle, publishedAt, url;
+            also description, channelId, thumbnail, thumbnails; ["*"] for all)
     
     Returns:
         Dict[str, Any]: Related videos data
     """
     try:
-        related_data = youtube_service.get_related_videos(video_id, max_results)
+        names = projection.select(fields, projection.SEARCH_FIELDS, projection.SEARCH_DEFAULT)
+        # The video ID is always requested: the original video is filtered out by it
+        related_data = await asyncio.to_thread(
+            youtube_service.get_related_videos, video_id, max_results, projection.mask(projection.paths(projection.SEARCH_FIELDS, names) + ['id.videoId']))
         
         # Format the response
-        formatted_videos = []
-        for item in related_data.get('items', []):
-            related_video_id = item.get('id', {}).get('videoId')
-            
-            formatted_videos.append({
-                'videoId': related_video_id,
-                'title': item.get('snippet', {}).get('title'),
-                'channelTitle': item.get('snippet', {}).get('channelTitle'),
-                'publishedAt': item.get('snippet', {}).get('publishedAt'),
-                'description': item.get('snippet', {}).get('description'),
-                'thumbnails': item.get('snippet', {}).get('thumbnails'),
-                'url': f"https://www.youtube.com/watch?v={related_video_id}"
-            })
+        formatted_videos = [
+            projection.project(item, projection.SEARCH_FIELDS, names)
+            for item in related_data.get('items', [])
+        ]
             
         return {
             'videos': formatted_videos,
@@ -1250,37 +1607,35 @@ async def get_related_videos(video_id: str, max_results: Optional[int] = 10) ->
     name="get_trending_videos",
     description="Get trending videos on YouTube by region",
 )
-async def get_trending_videos(region_code: str = None, max_results: int = 5) -> Dict[str, Any]:
+@metrics.timed('tool')
+async def get_trending_videos(region_code: str = None, max_results: int = 5,
+                              fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Get trending videos on YouTube by region
     
     Args:
         region_code (str): ISO country code (default: 'US')
         max_results (int): Maximum number of videos to return (default: 10)
+        fields (List[str], optional): Fields per video (default: id, title, publishedAt, channelTitle, viewCount,
+            likeCount, commentCount, url; any get_video_details field; ["*"] for all)
     
     Returns:
         Dict[str, Any]: Trending videos data
     """
     try:
+        names = projection.select(fields, projection.VIDEO_FIELDS, projection.TRENDING_DEFAULT)
         # 이제 region_code 처리는 YouTubeService 클래스 내부에서 처리합니다
-        trending_data = youtube_service.get_trending_videos(region_code, max_results)
+        # The chart is always requested with at least the recorded fields, so the prefetched copy serves any projection within them
+        item_paths = projection.paths(projection.VIDEO_FIELDS, names) + list(projection.VIDEO_RECORD)
+        trending_data = await asyncio.to_thread(
+            youtube_service.get_trending_videos, region_code, max_results, projection.mask(item_paths))
+        capture_videos(trending_data.get('items', []))
         
         # Format the response
-        formatted_videos = []
-        for video in trending_data.get('items', []):
-            formatted_videos.append({
-                'id': video.get('id'),
-                'title': video.get('snippet', {}).get('title'),
-                'description': video.get('snippet', {}).get('description'),
-                'publishedAt': video.get('snippet', {}).get('publishedAt'),
-                'channelId': video.get('snippet', {}).get('channelId'),
-                'channelTitle': video.get('snippet', {}).get('channelTitle'),
-                'viewCount': video.get('statistics', {}).get('viewCount'),
-                'likeCount': video.get('statistics', {}).get('likeCount'),
-                'commentCount': video.get('statistics', {}).get('commentCount'),
-                'thumbnails': video.get('snippet', {}).get('thumbnails'),
-                'url': f"https://www.youtube.com/watch?v={video.get('id')}"
-            })
+        formatted_videos = [
+            projection.project(video, projection.VIDEO_FIELDS, names)
+            for video in trending_data.get('items', [])
+        ]
             
         return {
             'videos': formatted_videos,
@@ -1295,6 +1650,7 @@ async def get_trending_videos(region_code: str = None, max_results: int = 5) ->
     name="get_video_enhanced_transcript",
     description="Advanced transcript extraction tool with filtering, search, and multi-video capabilities. Provides rich transcript data for detailed analysis and processing. Features: 1) Extract transcripts from multiple videos; 2) Filter by time ranges; 3) Search within transcripts; 4) Segment transcripts; 5) Format output in different ways; 6) Include video metadata.",
 )
+@metrics.timed('tool')
 async def get_video_enhanced_transcript(
     video_ids: List[str],
     language: Optional[str] = 'ko',
@@ -1306,6 +1662,9 @@ async def get_video_enhanced_transcript(
     segment_count: Optional[int] = 2,
     format: Optional[str] = "timestamped",
     include_metadata: Optional[bool] = False,
+    encoding: Optional[str] = "segments",
+    page_token: Optional[str] = None,
+    page_size: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Get enhanced transcript for one or more YouTube videos with advanced filtering and processing
@@ -1317,10 +1676,13 @@ async def get_video_enhanced_transcript(
         end_time (int, optional): End time in seconds
         query (str, optional): Search query
         case_sensitive (bool, optional): Whether to use case-sensitive search
-        segment_method (str, optional): Segment method ("equal" or "smart")
+        segment_method (str, optional): Segment method ("equal" or "smart" for topic-based chapters with titles and keywords)
         segment_count (int, optional): Number of segments
         format (str, optional): Output format ("raw", "timestamped", "merged")
         include_metadata (bool, optional): Whether to include video details
+        encoding (str, optional): "segments" or "columnar" (parallel start/duration/text arrays, overrides format)
+        page_token (str, optional): Token for the next page of segments (per video)
+        page_size (int, optional): Number of segments per page (default: all)
     
     Returns:
         Dict[str, Any]: Enhanced transcript data
@@ -1337,7 +1699,10 @@ async def get_video_enhanced_transcript(
         options = {
             'language': language,
             'format': format,
-            'includeMetadata': include_metadata
+            'includeMetadata': include_metadata,
+            'encoding': encoding,
+            'pageToken': page_token,
+            'pageSize': page_size
         }
         
         # Add time range filter if specified
@@ -1362,16 +1727,209 @@ async def get_video_enhanced_transcript(
         }
         
         # Call the enhanced transcript method
-        transcript = youtube_service.get_video_enhanced_transcript(video_ids, options)
+        transcript = await asyncio.to_thread(youtube_service.get_video_enhanced_transcript, video_ids, options)
         
         return transcript
     except Exception as e:
         logger.exception(f"Error in get_video_enhanced_transcript: {e}")
         return {'error': str(e)}
 
+@mcp.tool(
+    name="get_video_chapters",
+    description="Split a YouTube video's transcript into topic chapters (with timestamps, titles and keywords) and optionally return the text of only the relevant chapter. Use this instead of the full transcript for long videos.",
+)
+@metrics.timed('tool')
+async def get_video_chapters(
+    video_id: str,
+    language: Optional[str] = 'ko',
+    chapter_count: Optional[int] = None,
+    chapter_index: Optional[int] = None,
+    query: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Split a video transcript into topic chapters and optionally return one chapter's text
+    
+    Args:
+        video_id (str): YouTube video ID
+        language (str, optional): Language code for transcript
+        chapter_count (int, optional): Desired number of chapters (chosen automatically if omitted)
+        chapter_index (int, optional): Return the text of this chapter
+        query (str, optional): Return the text of the chapter that best matches this query
+    
+    Returns:
+        Dict[str, Any]: Chapters and the selected chapter's text
+    """
+    try:
+        transcript = await asyncio.to_thread(youtube_service.get_video_transcript, video_id, language)
+        if not transcript:
+            return {'error': f"No transcript available for video ID {video_id}"}
+        
+        view = transcript.view()
+        chapters = await asyncio.to_thread(youtube_service.get_chapters, transcript, view, chapter_count)
+        
+        result = {
+            'videoId': youtube_service.parse_url(video_id),
+            'language': language or 'default',
+            'chapters': [
+                {key: chapter[key] for key in ('index', 'timestamp', 'start', 'end', 'title', 'keywords')}
+                for chapter in chapters
+            ]
+        }
+        
+        # Pick the requested chapter by index or by query
+        selected = None
+        if chapter_index is not None:
+            if not 0 <= chapter_index < len(chapters):
+                return {'error': f"chapter_index must be between 0 and {len(chapters) - 1}"}
+            selected = chapters[chapter_index]
+        elif query:
+            selected = match_chapter(view, chapters, query)
+            if not selected:
+                result['message'] = f"No chapter matches query: {query}"
+        
+        if selected:
+            chunk = view[selected['startIndex']:selected['endIndex']]
+            result['selectedChapter'] = {
+                'index': selected['index'],
+                'title': selected['title'],
+                'transcript': chunk.timestamped_lines()
+            }
+        
+        return result
+    except Exception as e:
+        logger.exception(f"Error in get_video_chapters: {e}")
+        return {'error': str(e)}
+
+@mcp.tool(
+    name="get_transcript_digest",
+    description="Summarize a YouTube video's transcript locally, without an LLM: returns its most central sentences (TextRank over TF-IDF) with timestamps, in order, and its key phrases (RAKE), in milliseconds. Use it to skim a video, or as a compact stand-in for the full transcript before summarizing or analyzing it.",
+)
+@metrics.timed('tool')
+async def get_transcript_digest(
+    video_id: str,
+    language: Optional[str] = 'ko',
+    sentence_count: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+    keyword_count: Optional[int] = 10
+) -> Dict[str, Any]:
+    """
+    Extract the key sentences and key phrases of a video transcript
+    
+    Args:
+        video_id (str): YouTube video ID
+        language (str, optional): Language code for transcript
+        sentence_count (int, optional): Key sentences to return (default: about the square root of the sentence count, 3-15)
+        max_tokens (int, optional): Keep the digest under this many tokens (estimated) instead of a fixed count
+        keyword_count (int, optional): Key phrases to return (default: 10)
+    
+    Returns:
+        Dict[str, Any]: Key sentences with timestamps and scores, keywords, and the compression achieved
+    """
+    try:
+        transcript = await asyncio.to_thread(youtube_service.get_video_transcript, video_id, language)
+        if not transcript:
+            return {'error': f"No transcript available for video ID {video_id}"}
+        
+        start = time.perf_counter()
+        digest = await asyncio.to_thread(transcript_digest, transcript, sentence_count, max_tokens, keyword_count or 10)
+        transcript_tokens = estimate_tokens(transcript.view().full_text())
+        digest_tokens = sum(estimate_tokens(sentence['text']) for sentence in digest['sentences'])
+        
+        return {
+            'videoId': youtube_service.parse_url(video_id),
+            'language': language or 'default',
+            **digest,
+            'transcriptTokens': transcript_tokens,
+            'digestTokens': digest_tokens,
+            'compression': round(transcript_tokens / digest_tokens, 1) if digest_tokens else None,
+            'elapsedMs': round((time.perf_counter() - start) * 1000, 1)
+        }
+    except Exception as e:
+        logger.exception(f"Error in get_transcript_digest: {e}")
+        return {'error': str(e)}
+
+@mcp.tool(
+    name="check_watchlist_uploads",
+    description="Detect new uploads on a list of channels (e.g. competitors) since the last check. Polls each channel's public upload feed, which costs no API quota, and fetches details only for new videos (1 quota unit per 50). Use this instead of search_videos with channelId and order=date (100 units per channel). On the first check of a channel, uploads from the last max_age_days count as new.",
+)
+@metrics.timed('tool')
+async def check_watchlist_uploads(
+    channels: Optional[List[str]] = None,
+    max_age_days: Optional[int] = 7,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Report uploads on the watched channels that earlier checks have not seen
+    
+    Args:
+        channels (List[str], optional): Channel IDs, @handles or channel URLs (default: the YOUTUBE_WATCHLIST file)
+        max_age_days (int, optional): On a channel's first check, only uploads this recent count as new
+        fields (List[str], optional): Fields per upload (default: id, title, publishedAt, channelId, channelTitle,
+            duration, viewCount, likeCount, commentCount, url; any get_video_details field; ["*"] for all)
+    
+    Returns:
+        Dict[str, Any]: New uploads with statistics, plus feed and quota counts
+    """
+    try:
+        names = projection.select(fields, projection.VIDEO_FIELDS, projection.UPLOAD_DEFAULT)
+        if not channels:
+            if not YOUTUBE_WATCHLIST:
+                return {'error': "No channels given and YOUTUBE_WATCHLIST is not set"}
+            channels = read_watchlist(YOUTUBE_WATCHLIST)
+        
+        result = await watchlist_monitor.check(
+            channels, max_age_days or 7, request_fields(projection.VIDEO_FIELDS, names, projection.VIDEO_RECORD))
+        capture_videos(result['newUploads'])
+        
+        uploads = [projection.project(video, projection.VIDEO_FIELDS, names) for video in result['newUploads']]
+        
+        return {**result, 'newUploads': uploads, 'totalNew': len(uploads)}
+    except Exception as e:
+        logger.exception(f"Error in check_watchlist_uploads: {e}")
+        return {'error': str(e)}
+
+@mcp.tool(
+    name="analyze_dataset",
+    description="Run an analytical query over the locally collected YouTube dataset (videos and statistics gathered by the tools and batch.py) without using API quota. Analyses: 'top_videos' (top videos per channel by views per day), 'views_by_title_length' (median views per 10-character title length bucket), 'upload_cadence' (uploads per week, typical gap, weekday and hour per channel), 'outlier_keywords' (title words over-represented among videos with outlier_ratio times their channel's median views per day).",
+)
+@metrics.timed('tool')
+async def analyze_dataset(
+    analysis: str,
+    channel_id: Optional[str] = None,
+    days: Optional[int] = None,
+    limit: Optional[int] = 10,
+    outlier_ratio: Optional[float] = 3.0
+) -> Dict[str, Any]:
+    """
+    Run an aggregate query over the local dataset
+    
+    Args:
+        analysis (str): One of top_videos, views_by_title_length, upload_cadence, outlier_keywords
+        channel_id (str, optional): Only this channel's videos
+        days (int, optional): Only videos published within the last N days
+        limit (int, optional): Maximum rows (per channel for top_videos)
+        outlier_ratio (float, optional): Views per day over the channel median that makes a video an outlier
+    
+    Returns:
+        Dict[str, Any]: Aggregate rows, the data source per table and the query time
+    """
+    try:
+        return await asyncio.to_thread(analytics.analyze, analysis, channel_id=channel_id, days=days, limit=limit or 10,
+                                       outlier_ratio=outlier_ratio or 3.0,
+                                       dataset_dir=dataset.root if dataset else analytics.DATASET_DIR)
+    except Exception as e:
+        logger.exception(f"Error in analyze_dataset: {e}")
+        return {'error': str(e)}
+
 # Server start point
 if __name__ == "__main__":
     logger.info("Starting YouTube MCP server...")
+    if METRICS_PORT:
+        metrics.serve(int(METRICS_PORT))
+        logger.info(f"Prometheus metrics at http://127.0.0.1:{METRICS_PORT}/metrics")
+    if prefetcher.regions:
+        prefetcher.start()
+        logger.info(f"Prefetching trending charts for {', '.join(prefetcher.regions)} every {prefetcher.interval}s")
     try:
         mcp.run()
     except Exception as e:
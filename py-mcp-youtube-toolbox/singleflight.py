@@ -0,0 +1,90 @@
+# singleflight.py
+"""
+Request coalescing: concurrent calls with the same key share one in-flight call.
+
+When several threads ask for the same Notion database, trending chart or video at the
+same moment, only the first (the leader) calls upstream; the others wait for and
+receive its result, or its exception. Nothing is cached once the call completes.
+
+    flights = SingleFlight(clone=copy.deepcopy)
+    response = flights.do((request.method, request.uri, request.body), request.execute)
+
+Shared module: common/singleflight.py is the source and py-mcp-youtube-toolbox/singleflight.py
+an exact copy; tests/test_shared_modules.py fails while the two differ.
+"""
+import functools
+import threading
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Thread-safe single-flight group.
+
+    Args:
+        clone: applied to the shared result for every waiter (e.g. copy.deepcopy)
+            when callers may mutate what they get back
+    """
+
+    def __init__(self, clone=None):
+        self.clone = clone
+        self.calls = 0
+        self.shared = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Call fn(*args, **kwargs), or wait for the identical call already in flight.
+        """
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.waiters += 1
+                self.shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return self.clone(flight.result) if self.clone else flight.result
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                flight.error = e
+                del self._flights[key]
+            flight.done.set()
+            raise
+
+        with self._lock:
+            # Snapshot for the waiters before the leader's caller can modify the result
+            flight.result = self.clone(result) if self.clone and flight.waiters else result
+            del self._flights[key]
+        flight.done.set()
+        return result
+
+    def wrap(self, key_fn):
+        """
+        Decorator coalescing calls whose key_fn(*args, **kwargs) is equal.
+        """
+        def decorator(fn):
+            @functools.wraps(fn)
+            def coalesced(*args, **kwargs):
+                return self.do(key_fn(*args, **kwargs), fn, *args, **kwargs)
+            return coalesced
+        return decorator
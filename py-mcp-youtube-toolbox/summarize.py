@@ -0,0 +1,228 @@
+"""
+Map-reduce transcript summarization.
+
+A long transcript is split into chunks along its topic chapters (segmentation.py); a chapter
+longer than SUMMARY_CHUNK_TOKENS is cut into token windows, and short neighbouring chapters
+are merged. Each chunk is condensed into notes by the client's LLM through MCP sampling, in
+parallel, and the notes replace the transcript in the final (reduce) prompt.
+
+The note prompt does not depend on the requested summary length, and notes are cached by a
+hash of the prompt and the chunk text, so summarizing the same video again (at any length, or
+with keywords) reuses every chunk. When the notes themselves exceed SUMMARY_REDUCE_TOKENS,
+they are merged group by group (also cached) until they fit.
+"""
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from metrics import metrics
+from transcript import TranscriptView, format_time
+
+# Transcripts estimated at or below this many tokens go to the LLM whole
+SUMMARY_DIRECT_TOKENS = int(os.getenv("SUMMARY_DIRECT_TOKENS", "6000"))
+# Target size of a map chunk
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "3000"))
+# Notes larger than this are merged before the reduce prompt
+SUMMARY_REDUCE_TOKENS = int(os.getenv("SUMMARY_REDUCE_TOKENS", "8000"))
+# Chunks summarized at once
+SUMMARY_MAP_CONCURRENCY = int(os.getenv("SUMMARY_MAP_CONCURRENCY", "4"))
+# Chunk notes kept in memory
+SUMMARY_CACHE_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE", "1024"))
+
+NOTES_MAX_TOKENS = 500
+
+NOTES_SYSTEM_PROMPT = "You take faithful, compact notes on parts of YouTube video transcripts."
+
+# Independent of the summary length, so cached notes serve every length
+NOTES_PROMPT = """Write notes on this part of a YouTube video transcript ({start}-{end}).
+List, in order, every point made, with the facts, names, numbers, examples and arguments that support it.
+Use 4-12 short bullet points. No preamble, no conclusion.
+
+{text}"""
+
+MERGE_PROMPT = """Merge these consecutive notes on parts of a YouTube video transcript into one set of notes.
+Keep every distinct point, fact, name and number, in order; drop repetition. Use at most 15 short bullet points.
+
+{text}"""
+
+# async sample(prompt, system_prompt, max_tokens) -> completion text
+Sampler = Callable[[str, str, int], Awaitable[str]]
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count (about 4 characters per token for English)
+    """
+    return len(text) // 4 + 1
+
+def _windows(view: TranscriptView, budget: int) -> List[TranscriptView]:
+    """
+    Cut a view into the fewest consecutive pieces of at most ~budget tokens, of about equal size, on segment boundaries
+    """
+    texts = view.transcript.texts
+    sizes = [estimate_tokens(texts[i]) for i in view.indices]
+    target = sum(sizes) / max(1, -(-sum(sizes) // budget))
+    pieces, start, size = [], 0, 0
+    for position, tokens in enumerate(sizes):
+        if size and size + tokens / 2 > target:
+            pieces.append(view[start:position])
+            start, size = position, 0
+        size += tokens
+    if start < len(view):
+        pieces.append(view[start:])
+    return pieces
+
+def plan_chunks(view: TranscriptView, chapters: List[Dict[str, Any]], budget: int = SUMMARY_CHUNK_TOKENS) -> List[Dict[str, Any]]:
+    """
+    Map chunks of a transcript view: its chapters, split into token windows when too long and merged
+    with their neighbours when short
+
+    Returns:
+        List[Dict[str, Any]]: Chunks with start/end times, the titles of the chapters they cover and their text
+    """
+    parts = []
+    for chapter in chapters or [{'startIndex': 0, 'endIndex': len(view), 'title': None}]:
+        for piece in _windows(view[chapter['startIndex']:chapter['endIndex']], budget):
+            parts.append((piece, chapter['title']))
+
+    chunks: List[Dict[str, Any]] = []
+    for piece, title in parts:
+        text = piece.full_text()
+        tokens = estimate_tokens(text)
+        last = chunks[-1] if chunks else None
+        if last and last['tokens'] + tokens <= budget:
+            last['end'] = piece.end_time()
+            last['text'] += ' ' + text
+            last['tokens'] += tokens
+            if title and title not in last['titles']:
+                last['titles'].append(title)
+        else:
+            chunks.append({'start': piece.start_time(), 'end': piece.end_time(), 'titles': [title] if title else [],
+                           'text': text, 'tokens': tokens})
+    return chunks
+
+class NoteCache:
+    """
+    LRU cache of LLM notes keyed by a hash of the prompt that produced them
+    """
+
+    def __init__(self, size: int = SUMMARY_CACHE_SIZE):
+        self.size = size
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(system_prompt: str, prompt: str) -> str:
+        return hashlib.sha256(f"{system_prompt}\0{prompt}".encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            notes = self._entries.get(key)
+            if notes is not None:
+                self._entries.move_to_end(key)
+        if notes is None:
+            metrics.cache_miss('notes')
+        else:
+            metrics.cache_hit('notes')
+        return notes
+
+    def put(self, key: str, notes: str) -> None:
+        with self._lock:
+            self._entries[key] = notes
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+class Summarizer:
+    """
+    Condenses transcript chunks into notes with a sampler, caching the notes by content hash
+    """
+
+    def __init__(self, cache: Optional[NoteCache] = None, concurrency: int = SUMMARY_MAP_CONCURRENCY):
+        self.cache = cache or NoteCache()
+        self.concurrency = concurrency
+        # Notes being generated, so concurrent requests for the same chunk share one sampling call
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    async def _notes(self, sample: Sampler, prompt: str, semaphore: asyncio.Semaphore) -> str:
+        key = NoteCache.key(NOTES_SYSTEM_PROMPT, prompt)
+        notes = self.cache.get(key)
+        if notes is not None:
+            return notes
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            async with semaphore:
+                with metrics.span('upstream', 'sampling'):
+                    notes = (await sample(prompt, NOTES_SYSTEM_PROMPT, NOTES_MAX_TOKENS)).strip()
+            if not notes:
+                raise ValueError("The sampling response was empty")
+            self.cache.put(key, notes)
+            future.set_result(notes)
+            return notes
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters (if any) re-raise it; without waiters the exception would be reported as never retrieved
+            future.exception()
+            raise
+        finally:
+            del self._pending[key]
+
+    async def map(self, chunks: List[Dict[str, Any]], sample: Sampler) -> List[Dict[str, Any]]:
+        """
+        Notes for every chunk, sampled concurrently (at most `concurrency` at once) or served from the cache
+
+        Returns:
+            List[Dict[str, Any]]: One section per chunk with its start/end, chapter titles and notes
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        prompts = [NOTES_PROMPT.format(start=format_time(chunk['start']), end=format_time(chunk['end']),
+                                       text=chunk['text']) for chunk in chunks]
+        notes = await asyncio.gather(*(self._notes(sample, prompt, semaphore) for prompt in prompts))
+        return [{'start': chunk['start'], 'end': chunk['end'], 'titles': chunk['titles'], 'notes': chunk_notes}
+                for chunk, chunk_notes in zip(chunks, notes)]
+
+    async def collapse(self, sections: List[Dict[str, Any]], sample: Sampler,
+                       budget: int = SUMMARY_REDUCE_TOKENS) -> List[Dict[str, Any]]:
+        """
+        Merge consecutive sections until their notes fit the reduce budget
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        while len(sections) > 1 and sum(estimate_tokens(section['notes']) for section in sections) > budget:
+            # Groups of about half the budget, so each round at least halves the notes
+            groups, size = [[]], 0
+            for section in sections:
+                tokens = estimate_tokens(section['notes'])
+                if groups[-1] and size + tokens > budget // 2:
+                    groups.append([])
+                    size = 0
+                groups[-1].append(section)
+                size += tokens
+            if len(groups) == len(sections):
+                # Every section is already over half the budget; merge neighbours pairwise
+                groups = [sections[i:i + 2] for i in range(0, len(sections), 2)]
+            prompts = [MERGE_PROMPT.format(text='\n\n'.join(format_section(section) for section in group))
+                       for group in groups]
+            notes = await asyncio.gather(*(self._notes(sample, prompt, semaphore) for prompt in prompts))
+            sections = [{
+                'start': group[0]['start'],
+                'end': group[-1]['end'],
+                'titles': [title for section in group for title in section['titles']],
+                'notes': group_notes,
+            } for group, group_notes in zip(groups, notes)]
+        return sections
+
+def format_section(section: Dict[str, Any]) -> str:
+    header = f"[{format_time(section['start'])}-{format_time(section['end'])}]"
+    if section['titles']:
+        header += ' ' + ' / '.join(section['titles'])
+    return f"{header}\n{section['notes']}"
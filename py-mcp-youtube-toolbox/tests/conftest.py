@@ -0,0 +1,24 @@
+import random
+
+import pytest
+
+from transcript import Transcript
+
+TOPICS = [
+    ['kubernetes', 'cluster', 'container', 'deployment', 'pod', 'node', 'scaling', 'helm'],
+    ['sourdough', 'flour', 'starter', 'dough', 'oven', 'crust', 'yeast', 'baking'],
+    ['marathon', 'running', 'pace', 'training', 'shoes', 'mileage', 'recovery', 'race'],
+]
+
+
+@pytest.fixture
+def topical_transcript():
+    """
+    Three topics of 90 five-second caption segments each, without punctuation
+    """
+    rng = random.Random(3)
+    texts = []
+    for words in TOPICS:
+        for _ in range(90):
+            texts.append(' '.join(rng.choice(words) for _ in range(8)))
+    return Transcript([i * 5.0 for i in range(len(texts))], [5.0] * len(texts), texts, video_id='vid', language='en')
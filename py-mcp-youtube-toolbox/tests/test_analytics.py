@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip('duckdb')
+
+import analytics
+from dataset import Dataset
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+
+# channel, video, title, published days ago, views
+VIDEOS = [
+    ('UC1', 'a1', 'Kubernetes in 100 seconds', 10, 100_000),
+    ('UC1', 'a2', 'My morning routine', 20, 2_000),
+    ('UC1', 'a3', 'Weekly vlog', 30, 3_000),
+    ('UC1', 'a4', 'Kubernetes explained for beginners', 40, 300_000),
+    ('UC1', 'a5', 'Desk setup tour', 50, 5_000),
+    ('UC1', 'a6', 'Answering your questions', 60, 6_000),
+    ('UC2', 'b1', 'Sourdough starter guide', 5, 5_000),
+    ('UC2', 'b2', 'Baking bread at home', 200, 20_000),
+]
+
+
+def iso(days_ago):
+    return (NOW - timedelta(days=days_ago)).isoformat()
+
+
+@pytest.fixture
+def dataset_dir(tmp_path):
+    dataset = Dataset(str(tmp_path))
+    dataset.append('videos', [
+        {'video_id': video_id, 'channel_id': channel, 'channel_title': channel, 'title': title,
+         'published_at': iso(days), 'observed_at': iso(0)}
+        for channel, video_id, title, days, _ in VIDEOS
+    ])
+    # An older, lower observation per video; only the latest counts
+    dataset.append('stats', [
+        {'video_id': video_id, 'channel_id': channel, 'views': views // 10, 'observed_at': iso(1)}
+        for channel, video_id, _, _, views in VIDEOS
+    ] + [
+        {'video_id': video_id, 'channel_id': channel, 'views': views, 'observed_at': iso(0)}
+        for channel, video_id, _, _, views in VIDEOS
+    ])
+    return str(tmp_path)
+
+
+def test_top_videos_rank_by_views_per_day_per_channel(dataset_dir):
+    result = analytics.analyze('top_videos', limit=2, dataset_dir=dataset_dir)
+    assert [(row['channel_id'], row['video_id'], row['rank']) for row in result['rows']] == [
+        ('UC1', 'a1', 1), ('UC1', 'a4', 2), ('UC2', 'b1', 1), ('UC2', 'b2', 2),
+    ]
+    assert result['rows'][0]['views_per_day'] == 10_000
+    assert result['sources'] == {'videos': 'jsonl', 'stats': 'jsonl'}
+
+
+def test_filters_by_channel_and_publication_window(dataset_dir):
+    result = analytics.analyze('top_videos', channel_id='UC2', days=30, dataset_dir=dataset_dir)
+    assert [row['video_id'] for row in result['rows']] == ['b1']
+
+
+def test_upload_cadence(dataset_dir):
+    rows = analytics.analyze('upload_cadence', dataset_dir=dataset_dir)['rows']
+    assert [(row['channel_id'], row['uploads']) for row in rows] == [('UC1', 6), ('UC2', 2)]
+    assert rows[0]['median_days_between_uploads'] == 10.0
+
+
+def test_outlier_keywords(dataset_dir):
+    result = analytics.analyze('outlier_keywords', channel_id='UC1', outlier_ratio=3.0, dataset_dir=dataset_dir)
+    assert (result['videos'], result['outliers']) == (6, 2)
+    assert result['rows'][0]['keyword'] == 'kubernetes'
+    assert result['rows'][0]['lift'] == 3.0
+
+
+def test_empty_dataset_and_unknown_analysis(tmp_path):
+    assert analytics.analyze('top_videos', dataset_dir=str(tmp_path))['rows'] == []
+    with pytest.raises(ValueError):
+        analytics.analyze('most_liked', dataset_dir=str(tmp_path))
+
+
+def test_reads_a_fresh_columnar_copy(dataset_dir):
+    pytest.importorskip('pyarrow')
+    import columnar
+    dataset = Dataset(dataset_dir)
+    columnar.export(dataset, f"{dataset_dir}/columnar", tables=['videos', 'stats'])
+    result = analytics.analyze('top_videos', limit=1, dataset_dir=dataset_dir)
+    assert result['sources'] == {'videos': 'columnar', 'stats': 'columnar'}
+    assert [row['video_id'] for row in result['rows']] == ['a1', 'b1']
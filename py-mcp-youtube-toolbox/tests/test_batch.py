@@ -0,0 +1,95 @@
+from batch import BatchRun, read_video_csv
+from dataset import Dataset, parse_duration, video_rows
+from transcript import Transcript
+
+
+def video_item(video_id, views):
+    return {
+        'id': video_id,
+        'snippet': {'channelId': 'UC1', 'title': f"Video {video_id}", 'publishedAt': '2025-06-01T00:00:00Z'},
+        'statistics': {'viewCount': str(views)},
+        'contentDetails': {'duration': 'PT1H2M3S'},
+    }
+
+
+class FakeService:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+
+    def get_channel_uploads(self, reference, count):
+        self.calls.append(('channel', reference))
+        return {'channel': {'id': reference, 'snippet': {'title': reference}}, 'videoIds': ['v1', 'v2', 'v3']}
+
+    def get_videos(self, video_ids):
+        self.calls.append(('videos', tuple(video_ids)))
+        return [video_item(video_id, 10) for video_id in video_ids]
+
+    def get_video_transcript(self, video_id, language):
+        self.calls.append(('transcript', video_id))
+        if video_id in self.failing:
+            raise ConnectionError('connection reset')
+        if video_id == 'v3':
+            return None
+        return Transcript.from_raw([{'text': 'hello', 'start': 0.0, 'duration': 1.0}], video_id, language)
+
+
+def test_dataset_keeps_the_latest_row_and_skips_a_partial_line(tmp_path):
+    dataset = Dataset(str(tmp_path))
+    dataset.append('stats', [video_rows(video_item('v1', views), f"2025-06-0{day}")[1]
+                             for day, views in ((1, 10), (2, 25))])
+    with open(dataset.path('stats'), 'a', encoding='utf-8') as f:
+        f.write('{"video_id": "v1", "vie')
+
+    rows = list(dataset.rows('stats'))
+    assert [row['views'] for row in rows] == [10, 25]
+    assert dataset.latest('stats', 'video_id')['v1']['observed_at'] == '2025-06-02'
+    assert parse_duration('PT1H2M3S') == 3723 and parse_duration('P1D') == 86400 and parse_duration('') is None
+
+
+def test_checkpoint_survives_reopening(tmp_path):
+    dataset = Dataset(str(tmp_path))
+    dataset.mark('transcript:v1', 'done')
+    dataset.mark('transcript:v2', 'failed', 'timeout')
+    dataset.mark('comments:v3', 'skipped', 'comments disabled')
+
+    reopened = Dataset(str(tmp_path))
+    assert reopened.completed() == {'transcript:v1': 'done', 'comments:v3': 'skipped'}
+    assert not reopened.is_done('transcript:v2')
+
+
+def test_interrupted_run_resumes_only_unfinished_tasks(tmp_path):
+    service = FakeService(failing={'v2'})
+    run = BatchRun(service, Dataset(str(tmp_path)), 'run-1', workers=2, comments=0)
+    video_ids = run.collect_channels(['@one'], 3)
+    run.collect_details(video_ids)
+    run.collect_transcripts(video_ids)
+    assert video_ids == ['v1', 'v2', 'v3']
+    assert run.counts['transcripts'] == {'done': 1, 'skipped': 1, 'failed': 1, 'cached': 0, 'rows': 1}
+
+    service = FakeService()
+    run = BatchRun(service, Dataset(str(tmp_path)), 'run-1', workers=2, comments=0)
+    video_ids = run.collect_channels(['@one'], 3)
+    run.collect_details(video_ids)
+    run.collect_transcripts(video_ids)
+    # The upload list comes back from the checkpoint; only the failed transcript is fetched again
+    assert video_ids == ['v1', 'v2', 'v3']
+    assert service.calls == [('transcript', 'v2')]
+    assert {row['video_id'] for row in run.dataset.rows('transcript_segments')} == {'v1', 'v2'}
+
+
+def test_new_run_observes_statistics_again(tmp_path):
+    dataset = Dataset(str(tmp_path))
+    for name in ('run-1', 'run-2'):
+        BatchRun(FakeService(), dataset, name, comments=0).collect_details(['v1', 'v2'])
+    assert len(list(dataset.rows('stats'))) == 4
+    assert len(dataset.latest('videos', 'video_id')) == 2
+
+
+def test_read_video_csv(tmp_path):
+    with_header = tmp_path / 'videos.csv'
+    with_header.write_text('title,url\nFirst,https://youtu.be/abc\nSecond, def \n,\n', encoding='utf-8')
+    without_header = tmp_path / 'ids.csv'
+    without_header.write_text('abc\n\ndef\n', encoding='utf-8')
+    assert read_video_csv(str(with_header)) == ['https://youtu.be/abc', 'def']
+    assert read_video_csv(str(without_header)) == ['abc', 'def']
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+ds = pytest.importorskip('pyarrow.dataset')
+
+import columnar
+from dataset import Dataset
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    dataset = Dataset(str(tmp_path / 'data'))
+    dataset.append('videos', [
+        {'video_id': 'v1', 'channel_id': 'UC1', 'title': 'First', 'tags': ['a', 'b'],
+         'published_at': '2025-05-01T10:00:00+00:00', 'duration_seconds': 600, 'observed_at': '2025-06-01T00:00:00+00:00'},
+        {'video_id': 'v2', 'channel_id': 'UC2', 'title': 'Second', 'observed_at': '2025-06-02T00:00:00+00:00'},
+    ])
+    dataset.append('comments', [
+        {'comment_id': 'c1', 'video_id': 'v1', 'text': 'Nice', 'likes': 3, 'observed_at': '2025-06-01T00:00:00+00:00'},
+        {'comment_id': 'c2', 'video_id': 'v9', 'text': 'Orphan', 'observed_at': None},
+    ])
+    return dataset
+
+
+@pytest.mark.parametrize('format', sorted(columnar.FORMATS))
+def test_export_round_trips_typed_partitioned_rows(dataset, tmp_path, format):
+    root = str(tmp_path / 'columnar')
+    counts = columnar.export(dataset, root, format, tables=['videos', 'comments'])
+    assert counts == {'videos': 2, 'comments': 2}
+    assert os.path.isdir(os.path.join(root, 'videos', 'date=2025-06-01', 'channel_id=UC1'))
+
+    videos = columnar.open_table('videos', root).to_table().sort_by('video_id').to_pylist()
+    assert videos[0]['tags'] == ['a', 'b'] and videos[0]['duration_seconds'] == 600
+    assert videos[0]['published_at'].isoformat() == '2025-05-01T10:00:00+00:00'
+    assert [(row['date'], row['channel_id']) for row in videos] == [('2025-06-01', 'UC1'), ('2025-06-02', 'UC2')]
+
+    # Comments are partitioned by their video's channel
+    comments = columnar.open_table('comments', root).to_table(filter=ds.field('channel_id') == 'UC1')
+    assert comments.column('comment_id').to_pylist() == ['c1']
+    orphan = columnar.open_table('comments', root).to_table(filter=ds.field('comment_id') == 'c2').to_pylist()[0]
+    assert (orphan['date'], orphan['channel_id']) == (columnar.UNKNOWN, columnar.UNKNOWN)
+
+
+def test_export_replaces_the_previous_copy(dataset, tmp_path, monkeypatch):
+    root = str(tmp_path / 'columnar')
+    monkeypatch.setattr(columnar, 'CHUNK_ROWS', 1)
+    assert columnar.export_table(dataset, 'videos', root) == 2
+    assert columnar.export_table(Dataset(str(tmp_path / 'empty')), 'videos', root) == 0
+    assert columnar.open_table('videos', root).to_table().num_rows == 0
+    assert not os.path.exists(os.path.join(root, 'videos.tmp'))
+
+    assert columnar.export_table(dataset, 'videos', root) == 2
+    assert columnar.open_table('videos', root).count_rows() == 2
+
+
+def test_missing_table_opens_empty(tmp_path):
+    table = columnar.open_table('stats', str(tmp_path))
+    assert table.count_rows() == 0
+    assert table.schema.names[-2:] == ['date', 'channel_id']
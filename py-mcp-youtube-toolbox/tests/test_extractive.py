@@ -0,0 +1,63 @@
+from extractive import _candidate_phrases, key_sentences, keywords, split_sentences
+from transcript import Transcript
+
+from conftest import TOPICS
+
+
+def test_unpunctuated_captions_become_pseudo_sentences(topical_transcript):
+    sentences = split_sentences(topical_transcript.view())
+    assert all(len(sentence['text'].split()) <= 32 for sentence in sentences)
+    assert sentences[0]['start'] == 0.0
+
+
+def test_punctuated_transcript_splits_on_sentence_ends():
+    transcript = Transcript([0, 4, 8], [4, 4, 4], [
+        'Containers package an application with its dependencies. Kubernetes',
+        'schedules those containers across a cluster of nodes. Helm charts',
+        'describe a whole deployment in one place.'])
+    sentences = split_sentences(transcript.view())
+    assert [sentence['text'] for sentence in sentences] == [
+        'Containers package an application with its dependencies.',
+        'Kubernetes schedules those containers across a cluster of nodes.',
+        'Helm charts describe a whole deployment in one place.']
+    assert [sentence['start'] for sentence in sentences] == [0, 0, 4]
+
+
+def test_key_sentences_cover_topics_in_order(topical_transcript):
+    sentences = split_sentences(topical_transcript.view())
+    digest = key_sentences(sentences, count=6)
+    assert 3 <= len(digest) <= 6
+    # Near-repeats within a topic are skipped, so every topic is represented
+    for words in TOPICS:
+        assert any(set(item['text'].split()) & set(words) for item in digest)
+    assert [item['start'] for item in digest] == sorted(item['start'] for item in digest)
+    assert max(item['score'] for item in digest) == 1.0
+
+
+def test_key_sentences_respect_token_budget(topical_transcript):
+    sentences = split_sentences(topical_transcript.view())
+    digest = key_sentences(sentences, max_tokens=100)
+    assert digest and sum(len(item['text']) // 4 + 1 for item in digest) <= 100
+    assert key_sentences([]) == []
+
+
+def test_key_sentences_skip_near_repeats():
+    sentences = [{'start': i, 'text': text} for i, text in enumerate([
+        'the cluster scales pods across every node automatically',
+        'the cluster scales pods across every node automatically',
+        'sourdough starter needs flour water and patience',
+        'marathon training builds weekly mileage slowly'])]
+    texts = [item['text'] for item in key_sentences(sentences, count=3)]
+    assert len(texts) == len(set(texts)) == 3
+
+
+def test_keywords_prefer_repeated_phrases():
+    texts = ['we install the helm chart', 'the helm chart for our app', 'a chart of the numbers', 'helm is a tool']
+    result = keywords(texts, count=3)
+    assert result[0] == {'keyword': 'helm chart', 'score': 3.66, 'count': 2}
+    # Words of a listed phrase are not repeated on their own
+    assert all(item['keyword'] not in ('helm', 'chart') for item in result)
+
+
+def test_phrases_never_span_two_texts():
+    assert _candidate_phrases(['deploy helm', 'chart review']) == [('deploy', 'helm'), ('chart', 'review')]
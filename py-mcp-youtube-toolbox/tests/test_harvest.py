@@ -0,0 +1,131 @@
+import asyncio
+import os
+
+import pytest
+
+from harvest import PAGE_SIZE, Harvester, min_budget
+
+
+def parse_mask(mask):
+    """
+    Data API field mask as a tree ({'items': {'id': None, 'snippet': {'title': None}}, ...})
+    """
+    tree, stack, name = {}, [], ''
+    node = tree
+    for char in mask + ',':
+        if char == '(':
+            stack.append(node)
+            node = node.setdefault(name, {})
+            name = ''
+        elif char in ',)':
+            if name:
+                node[name] = None
+            name = ''
+            if char == ')':
+                node = stack.pop()
+        else:
+            name += char
+    return tree
+
+
+def apply_mask(item, tree):
+    if tree is None:
+        return item
+    if isinstance(item, list):
+        return [apply_mask(element, tree) for element in item]
+    return {key: apply_mask(item[key], sub) for key, sub in tree.items() if key in item}
+
+
+class FakeYouTube:
+    """
+    search.list and videos.list over a fixed catalogue, honouring field masks like the Data API
+    """
+
+    def __init__(self, results_per_query=300):
+        self.results_per_query = results_per_query
+        self.search_calls = 0
+        self.videos_calls = 0
+
+    def video(self, video_id):
+        number = int(video_id.split('-')[1])
+        return {
+            'id': video_id,
+            'snippet': {'title': f"Video {video_id}", 'publishedAt': '2026-01-01T00:00:00Z', 'channelTitle': 'Channel'},
+            'contentDetails': {'duration': 'PT10M'},
+            'statistics': {'viewCount': str(1000 * number), 'likeCount': str(number % 7 * 10), 'commentCount': '3'},
+        }
+
+    def search_videos(self, query, max_results=10, fields=None, **options):
+        self.search_calls += 1
+        offset = int(options.get('pageToken') or 0)
+        # Every query shares its first half of results with the others
+        ids = [f"{query if i % 2 else 'shared'}-{i}" for i in range(offset, min(offset + max_results, self.results_per_query))]
+        page = {'items': [{'id': {'videoId': video_id}, 'snippet': {'title': video_id}} for video_id in ids]}
+        if offset + max_results < self.results_per_query:
+            page['nextPageToken'] = str(offset + max_results)
+        return apply_mask(page, parse_mask(fields)) if fields else page
+
+    def get_videos(self, video_ids, fields=None):
+        self.videos_calls += -(-len(video_ids) // 50)
+        items = [self.video(video_id) for video_id in video_ids]
+        if not fields:
+            return items
+        return apply_mask(items, parse_mask(fields)['items'])
+
+
+def test_stays_within_quota_budget():
+    service = FakeYouTube()
+    result = Harvester(service).harvest(['ai', 'ml'], max_results=500, quota_budget=450)
+    assert result['quotaUnits'] <= 450
+    assert result['quotaUnits'] == service.search_calls * 100 + service.videos_calls
+    assert result['stoppedBy'] == 'budget'
+    assert len(result['videos']) == len(set(video['id'] for video in result['videos']))
+
+
+def test_stops_at_target_and_dedupes_across_queries():
+    service = FakeYouTube()
+    result = Harvester(service).harvest(['ai', 'ml'], max_results=120, quota_budget=1000)
+    assert result['stoppedBy'] == 'target'
+    assert len(result['videos']) == 120
+    shared = [video for video in result['videos'] if len(video['harvest']['queries']) == 2]
+    assert shared and all(video['id'].startswith('shared-') for video in shared)
+
+
+def test_stops_when_results_run_out():
+    result = Harvester(FakeYouTube(results_per_query=60)).harvest(['ai'], max_results=200, quota_budget=1000)
+    assert result['stoppedBy'] == 'exhausted'
+    assert result['queries']['ai']['pages'] == 2
+    assert result['candidates'] == 60
+
+
+def test_ranks_by_views():
+    result = Harvester(FakeYouTube()).harvest(['ai'], max_results=PAGE_SIZE, quota_budget=200, rank_by='views')
+    views = [int(video['statistics']['viewCount']) for video in result['videos']]
+    assert views == sorted(views, reverse=True)
+
+
+def test_rejects_bad_arguments():
+    harvester = Harvester(FakeYouTube())
+    with pytest.raises(ValueError):
+        harvester.harvest([' '])
+    with pytest.raises(ValueError):
+        harvester.harvest(['ai'], rank_by='likes')
+    with pytest.raises(ValueError):
+        harvester.harvest(['ai'], quota_budget=min_budget() - 1)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    os.environ.setdefault('YOUTUBE_API_KEY', 'test-key')
+    import server
+    monkeypatch.setattr(server, 'dataset', None)
+    monkeypatch.setattr(server, 'harvester', Harvester(FakeYouTube()))
+    return server
+
+
+def test_tool_hydrates_scoring_fields_for_narrow_projection(server):
+    result = asyncio.run(server.harvest_search_videos(['ai'], max_results=50, quota_budget=200,
+                                                      rank_by='engagement', fields=['title']))
+    assert 'error' not in result
+    assert set(result['items'][0]) == {'rank', 'title', 'score', 'matchedQueries'}
+    assert any(item['score'] > 0 for item in result['items'])
@@ -0,0 +1,28 @@
+from key_pool import KeyPool
+
+
+def make_pool(quota=100):
+    return KeyPool(['aaaa1111', 'bbbb2222'], lambda api_key: f"client-{api_key}", daily_quota=quota)
+
+
+def test_routes_to_key_with_most_remaining_quota():
+    pool = make_pool()
+    first = pool.choose(10)
+    pool.charge(first, 60)
+    second = pool.choose(10)
+    assert second is not first
+    pool.charge(second, 30)
+    assert pool.choose(10) is second
+    # Neither can afford 80 units; the one with more headroom is still tried
+    assert pool.choose(80) is second
+
+
+def test_exhausted_and_excluded_keys_are_skipped():
+    pool = make_pool()
+    first, second = pool.keys
+    pool.exhaust(first)
+    assert pool.choose(1) is second
+    assert pool.choose(1, exclude=[second]) is None
+    assert pool.snapshot()['remainingTotal'] == 100
+    pool.reset()
+    assert pool.snapshot()['remainingTotal'] == 200
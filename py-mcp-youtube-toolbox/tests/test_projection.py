@@ -0,0 +1,40 @@
+import pytest
+
+import projection
+
+
+def test_select():
+    assert projection.select(None, projection.VIDEO_FIELDS, ('id', 'title')) == ['id', 'title']
+    assert projection.select(['*'], projection.VIDEO_FIELDS, ()) == list(projection.VIDEO_FIELDS)
+    assert projection.select(['title', 'title', 'url'], projection.VIDEO_FIELDS, ()) == ['title', 'url']
+    with pytest.raises(ValueError, match='Unknown fields: likes'):
+        projection.select(['likes'], projection.VIDEO_FIELDS, ())
+
+
+def test_mask_is_canonical():
+    first = projection.mask(['snippet.title', 'id', 'statistics.viewCount'])
+    second = projection.mask(['statistics.viewCount', 'snippet.title', 'id', 'id'])
+    assert first == second == 'etag,items(id,snippet(title),statistics(viewCount)),nextPageToken,pageInfo'
+
+
+def test_mask_keeps_whole_parent():
+    assert projection.mask(['snippet', 'snippet.title']) == 'etag,items(snippet),nextPageToken,pageInfo'
+    assert projection.mask(['snippet.thumbnails', 'snippet.thumbnails.medium.url']) == \
+        'etag,items(snippet(thumbnails)),nextPageToken,pageInfo'
+
+
+def test_paths_and_project():
+    names = ['id', 'title', 'viewCount', 'url']
+    assert projection.paths(projection.VIDEO_FIELDS, names) == ['id', 'snippet.title', 'statistics.viewCount', 'id']
+    item = {'id': 'abc', 'snippet': {'title': 'Title'}, 'statistics': {}}
+    assert projection.project(item, projection.VIDEO_FIELDS, names) == {
+        'id': 'abc', 'title': 'Title', 'viewCount': None, 'url': 'https://www.youtube.com/watch?v=abc'}
+
+
+def test_defaults_are_known_fields():
+    for schema, default in [(projection.VIDEO_FIELDS, projection.VIDEO_DEFAULT),
+                            (projection.VIDEO_FIELDS, projection.HARVEST_DEFAULT),
+                            (projection.SEARCH_FIELDS, projection.SEARCH_DEFAULT),
+                            (projection.CHANNEL_FIELDS, projection.CHANNEL_DEFAULT),
+                            (projection.COMMENT_FIELDS, projection.COMMENT_DEFAULT)]:
+        assert set(default) <= set(schema)
@@ -0,0 +1,21 @@
+from segmentation import match_chapter, segment_topics
+
+
+def test_finds_topic_boundaries(topical_transcript):
+    view = topical_transcript.view()
+    chapters = segment_topics(view)
+    assert len(chapters) == 3
+    # Boundaries land within a few segments of the planted ones (90 and 180)
+    assert abs(chapters[1]['startIndex'] - 90) <= 5
+    assert abs(chapters[2]['startIndex'] - 180) <= 5
+    assert chapters[0]['startIndex'] == 0 and chapters[-1]['endIndex'] == len(view)
+    assert 'sourdough' in chapters[1]['keywords'] or 'dough' in chapters[1]['keywords']
+
+
+def test_requested_count_and_matching(topical_transcript):
+    view = topical_transcript.view()
+    assert len(segment_topics(view, 1)) == 1
+    chapters = segment_topics(view, 3)
+    assert match_chapter(view, chapters, 'marathon training pace') is chapters[2]
+    assert match_chapter(view, chapters, 'quantum') is None
+    assert segment_topics(view[:0]) == []
@@ -0,0 +1,49 @@
+import asyncio
+
+from summarize import NoteCache, Summarizer, estimate_tokens, plan_chunks
+from segmentation import segment_topics
+
+
+def test_chunks_follow_chapters_within_budget(topical_transcript):
+    view = topical_transcript.view()
+    chapters = segment_topics(view, 3)
+    chunks = plan_chunks(view, chapters, budget=800)
+    assert all(chunk['tokens'] <= 800 for chunk in chunks)
+    assert chunks[0]['start'] == 0 and chunks[-1]['end'] == view.end_time()
+    assert ' '.join(chunk['text'] for chunk in chunks) == view.full_text()
+    # Small budgets split chapters, large ones merge them
+    assert len(plan_chunks(view, chapters, budget=100_000)) == 1
+    assert len(plan_chunks(view, chapters, budget=200)) > len(chapters)
+
+
+def test_notes_are_cached_and_shared(topical_transcript):
+    calls = []
+
+    async def sample(prompt, system_prompt, max_tokens):
+        calls.append(prompt)
+        await asyncio.sleep(0.01)
+        return f"- note {len(calls)}"
+
+    view = topical_transcript.view()
+    chunks = plan_chunks(view, segment_topics(view, 3), budget=800)
+    summarizer = Summarizer(NoteCache(size=100), concurrency=2)
+
+    async def twice():
+        # Concurrent requests for the same chunks share one sampling call each
+        return await asyncio.gather(summarizer.map(chunks, sample), summarizer.map(chunks, sample))
+
+    first, second = asyncio.run(twice())
+    assert len(calls) == len(chunks)
+    assert [section['notes'] for section in first] == [section['notes'] for section in second]
+    asyncio.run(summarizer.map(chunks, sample))
+    assert len(calls) == len(chunks)
+
+
+def test_collapse_fits_reduce_budget():
+    async def sample(prompt, system_prompt, max_tokens):
+        return 'merged ' * 20
+
+    sections = [{'start': i, 'end': i + 1, 'titles': [f"Part {i}"], 'notes': 'x' * 400} for i in range(12)]
+    collapsed = asyncio.run(Summarizer(NoteCache()).collapse(sections, sample, budget=600))
+    assert sum(estimate_tokens(section['notes']) for section in collapsed) <= 600
+    assert collapsed[0]['start'] == 0 and collapsed[-1]['end'] == 12
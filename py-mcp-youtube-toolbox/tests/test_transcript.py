@@ -0,0 +1,54 @@
+import pytest
+
+from transcript import Transcript, format_time, page_bounds
+
+
+def test_page_bounds():
+    assert page_bounds(10) == (0, 10, None)
+    assert page_bounds(10, None, 4) == (0, 4, '4')
+    assert page_bounds(10, '4', 4) == (4, 8, '8')
+    assert page_bounds(10, '8', 4) == (8, 10, None)
+    assert page_bounds(10, '-3', 4) == (0, 4, '4')
+    assert page_bounds(10, '2', 0) == (2, 10, None)
+    with pytest.raises(ValueError):
+        page_bounds(10, 'abc', 4)
+
+
+def test_format_time():
+    assert format_time(59.9) == '00:59'
+    assert format_time(3725) == '01:02:05'
+
+
+def test_from_raw_accepts_dicts_and_objects():
+    class Snippet:
+        def __init__(self, text, start, duration):
+            self.text, self.start, self.duration = text, start, duration
+
+    from_dicts = Transcript.from_raw({'transcript': [{'text': 'a', 'start': 0, 'duration': 2}]})
+    from_objects = Transcript.from_raw([Snippet('a', 0, 2)])
+    assert from_dicts.view().to_segments() == from_objects.view().to_segments()
+    assert not Transcript.from_raw(None)
+
+
+def test_time_range_includes_overlapping_segments():
+    transcript = Transcript([0, 5, 10, 15], [6, 5, 5, 5], ['a', 'b', 'c', 'd'])
+    view = transcript.view()
+    assert view.time_range(5.5, 12).full_text() == 'a b c'
+    # Non-contiguous views take the slow path with the same result
+    assert view.search('').time_range(5.5, 12).full_text() == 'a b c'
+    sparse = transcript.view()[::2]
+    assert sparse.time_range(1, 20).full_text() == 'a c'
+
+
+def test_search_with_context():
+    transcript = Transcript(range(6), [1] * 6, ['one', 'two', 'Match', 'four', 'five', 'match'])
+    assert transcript.view().search('match').full_text() == 'Match match'
+    assert transcript.view().search('Match', case_sensitive=True).full_text() == 'Match'
+    assert transcript.view().search('match', context_lines=1).full_text() == 'two Match four five match'
+
+
+def test_split_equal_and_columnar():
+    view = Transcript(range(7), [1] * 7, list('abcdefg')).view()
+    assert view.split_equal(3) == [(0, 2), (2, 4), (4, 7)]
+    assert view[5:].to_columnar() == {'start': [5.0, 6.0], 'duration': [1.0, 1.0], 'text': ['f', 'g']}
+    assert view[2:4].end_time() == 4.0
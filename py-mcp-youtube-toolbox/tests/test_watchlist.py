@@ -0,0 +1,87 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import feeds
+from watchlist import WatchlistMonitor
+
+CHANNEL = 'UC' + 'b' * 22
+
+
+def feed_xml(uploads):
+    entries = ''.join(f"""
+  <entry>
+    <yt:videoId>{video_id}</yt:videoId>
+    <yt:channelId>{CHANNEL}</yt:channelId>
+    <title>Video {video_id}</title>
+    <published>{published.isoformat()}</published>
+  </entry>""" for video_id, published in uploads)
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns="http://www.w3.org/2005/Atom">{entries}
+</feed>"""
+
+
+@pytest.fixture
+def uploads(monkeypatch):
+    now = datetime.now(timezone.utc)
+    uploads = [('recent', now - timedelta(days=1)), ('old', now - timedelta(days=60))]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            etag = f'"{len(uploads)}"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = feed_xml(uploads).encode()
+            self.send_response(200)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(feeds, 'FEEDS_BASE_URL', f"http://127.0.0.1:{server.server_port}/feeds/videos.xml")
+    yield uploads
+    server.shutdown()
+
+
+class FakeService:
+    def get_videos(self, video_ids, fields=None):
+        return [{'id': video_id, 'snippet': {'publishedAt': ''}} for video_id in video_ids]
+
+
+def new_ids(result):
+    return [video['id'] for video in result['newUploads']]
+
+
+def test_reports_each_upload_once(uploads, tmp_path):
+    monitor = WatchlistMonitor(FakeService(), str(tmp_path / 'feeds.json'))
+    first = asyncio.run(monitor.check([CHANNEL]))
+    assert new_ids(first) == ['recent'] and first['quotaUnits'] == 1
+    second = asyncio.run(monitor.check([CHANNEL]))
+    assert new_ids(second) == [] and second['feeds']['not_modified'] == 1
+
+
+def test_upload_fetched_by_another_reader_is_still_reported(uploads, tmp_path):
+    state_file = str(tmp_path / 'feeds.json')
+    monitor = WatchlistMonitor(FakeService(), state_file)
+    asyncio.run(monitor.check([CHANNEL]))
+
+    uploads.insert(0, ('latest', datetime.now(timezone.utc)))
+    # The agency's prefetch polls the same feed first and stores the new validators and entries
+    store = feeds.FeedStore(state_file)
+    channels, handles = store.load()
+    feeds.fetch_feeds([CHANNEL], channels)
+    store.save(channels, handles)
+
+    result = asyncio.run(monitor.check([CHANNEL]))
+    assert result['feeds']['not_modified'] == 1
+    assert new_ids(result) == ['latest']
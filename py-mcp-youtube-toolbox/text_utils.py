@@ -0,0 +1,29 @@
+import re
+from typing import List
+
+WORD_PATTERN = re.compile(r"\w+(?:'\w+)?", re.UNICODE)
+
+# English stopwords plus common spoken-transcript fillers
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are aren't as at be because been before being
+below between both but by can can't could couldn't did didn't do does doesn't doing don't down during each
+few for from further get gets getting go goes going gonna got had hasn't has have haven't having he he's her
+here here's hers herself him himself his how how's i i'd i'll i'm i've if in into is isn't it it's its itself
+just kind know let let's like lot make me more most much my myself need no nor not now of off ok okay on once
+one only or other our ours ourselves out over own really right same say says see she should so some something
+such sure than that that's the their theirs them themselves then there there's these they they're thing things
+think this those through to too uh um under until up us very want was wasn't way we we'll we're we've well were
+weren't what what's when where which while who why will with won't would wouldn't yeah yes you you'll you're
+you've your yours yourself yourselves
+""".split())
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase and split text into content words, dropping stopwords, digits and 1-letter tokens
+    """
+    if not text:
+        return []
+    return [
+        word for word in WORD_PATTERN.findall(text.lower())
+        if len(word) > 1 and not word.isdigit() and word not in STOPWORDS
+    ]
@@ -0,0 +1,215 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Optional, Iterable, Sequence
+
+def format_time(seconds: float) -> str:
+    """
+    Format seconds into MM:SS or HH:MM:SS
+    """
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, remaining_seconds = divmod(remainder, 60)
+
+    if hours > 0:
+        return f"{hours:02d}:{minutes:02d}:{remaining_seconds:02d}"
+    return f"{minutes:02d}:{remaining_seconds:02d}"
+
+def page_bounds(total: int, page_token: Optional[str] = None, page_size: Optional[int] = None) -> tuple:
+    """
+    Resolve a segment page from an opaque page token (segment offset) and page size
+
+    Returns:
+        tuple: (start index, end index, next page token or None)
+    """
+    try:
+        start = max(int(page_token), 0) if page_token else 0
+    except ValueError:
+        raise ValueError(f"Invalid page token: {page_token}") from None
+
+    if not page_size or page_size <= 0:
+        return start, total, None
+
+    end = min(start + page_size, total)
+    return start, end, (str(end) if end < total else None)
+
+class Transcript:
+    """
+    Normalized transcript: start/duration arrays plus a text list, built once per fetch.
+    Filters never copy segments; they return TranscriptView objects holding segment indices.
+    """
+    __slots__ = ('video_id', 'language', 'starts', 'durations', 'texts', 'chapters')
+
+    def __init__(self, starts: Iterable[float] = (), durations: Iterable[float] = (), texts: Iterable[str] = (),
+                 video_id: Optional[str] = None, language: Optional[str] = None):
+        self.video_id = video_id
+        self.language = language
+        self.starts = array('d', starts)
+        self.durations = array('d', durations)
+        self.texts = list(texts)
+        # Topic chapters computed for this transcript, keyed by requested chapter count (0 = automatic)
+        self.chapters = {}
+
+    @classmethod
+    def from_raw(cls, raw: Any, video_id: Optional[str] = None, language: Optional[str] = None) -> "Transcript":
+        """
+        Normalize any transcript shape (FetchedTranscript, list of snippet objects or dicts,
+        or a dict with a 'transcript' key) in a single pass
+        """
+        transcript = cls(video_id=video_id, language=language or getattr(raw, 'language_code', None))
+        if not raw:
+            return transcript
+
+        if isinstance(raw, dict):
+            raw = raw.get('transcript', [])
+
+        starts, durations, texts = transcript.starts, transcript.durations, transcript.texts
+        for item in raw:
+            if isinstance(item, dict):
+                starts.append(float(item.get('start', 0) or 0))
+                durations.append(float(item.get('duration', 0) or 0))
+                texts.append(item.get('text', '') or '')
+            else:
+                starts.append(float(getattr(item, 'start', 0) or 0))
+                durations.append(float(getattr(item, 'duration', 0) or 0))
+                texts.append(getattr(item, 'text', '') or '')
+        return transcript
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __bool__(self) -> bool:
+        return bool(self.texts)
+
+    def view(self) -> "TranscriptView":
+        """
+        View over all segments
+        """
+        return TranscriptView(self, range(len(self.texts)))
+
+class TranscriptView:
+    """
+    An index-based selection of transcript segments
+    """
+    __slots__ = ('transcript', 'indices')
+
+    def __init__(self, transcript: Transcript, indices: Sequence[int]):
+        self.transcript = transcript
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __bool__(self) -> bool:
+        return len(self.indices) > 0
+
+    def __getitem__(self, item: slice) -> "TranscriptView":
+        return TranscriptView(self.transcript, self.indices[item])
+
+    def time_range(self, start_time: Optional[float] = None, end_time: Optional[float] = None) -> "TranscriptView":
+        """
+        Keep segments overlapping [start_time, end_time] using binary search on start times
+        """
+        starts, durations = self.transcript.starts, self.transcript.durations
+
+        if isinstance(self.indices, range) and self.indices.step == 1:
+            lo, hi = self.indices.start, self.indices.stop
+            if end_time is not None:
+                hi = bisect_right(starts, end_time, lo, hi)
+            if start_time is not None:
+                first = bisect_left(starts, start_time, lo, hi)
+                # Earlier segments still count if they run past start_time
+                while first > lo and starts[first - 1] + durations[first - 1] >= start_time:
+                    first -= 1
+                lo = first
+            return TranscriptView(self.transcript, range(lo, max(lo, hi)))
+
+        return TranscriptView(self.transcript, [
+            i for i in self.indices
+            if (start_time is None or starts[i] + durations[i] >= start_time)
+            and (end_time is None or starts[i] <= end_time)
+        ])
+
+    def search(self, query: str, case_sensitive: bool = False, context_lines: int = 0) -> "TranscriptView":
+        """
+        Keep segments containing the query, plus context_lines segments around each match
+        """
+        if not query:
+            return self
+
+        texts = self.transcript.texts
+        needle = query if case_sensitive else query.lower()
+        matched = [
+            position for position, i in enumerate(self.indices)
+            if needle in (texts[i] if case_sensitive else texts[i].lower())
+        ]
+
+        if context_lines > 0:
+            expanded = set()
+            for position in matched:
+                expanded.update(range(max(0, position - context_lines), min(len(self.indices), position + context_lines + 1)))
+            matched = sorted(expanded)
+
+        return TranscriptView(self.transcript, [self.indices[position] for position in matched])
+
+    def split_equal(self, count: int) -> List[tuple]:
+        """
+        Split into `count` parts with an equal number of segments
+
+        Returns:
+            List[tuple]: (start position, end position) pairs within this view
+        """
+        size = len(self) // count
+        bounds = []
+        for i in range(count):
+            start = i * size
+            end = start + size if i < count - 1 else len(self)
+            bounds.append((start, end))
+        return bounds
+
+    def start_time(self) -> float:
+        return self.transcript.starts[self.indices[0]] if self else 0.0
+
+    def end_time(self) -> float:
+        if not self:
+            return 0.0
+        last = self.indices[-1]
+        return self.transcript.starts[last] + self.transcript.durations[last]
+
+    def total_duration(self) -> float:
+        durations = self.transcript.durations
+        return sum(durations[i] for i in self.indices)
+
+    def average_length(self) -> float:
+        texts = self.transcript.texts
+        return sum(len(texts[i]) for i in self.indices) / len(self) if self else 0
+
+    def full_text(self) -> str:
+        texts = self.transcript.texts
+        return " ".join(texts[i] for i in self.indices)
+
+    def timestamped_lines(self) -> List[str]:
+        starts, texts = self.transcript.starts, self.transcript.texts
+        return [f"[{format_time(starts[i])}] {texts[i]}" for i in self.indices]
+
+    def to_segments(self) -> List[Dict[str, Any]]:
+        """
+        Materialize as one dict per segment
+        """
+        starts, durations, texts = self.transcript.starts, self.transcript.durations, self.transcript.texts
+        return [{
+            'text': texts[i],
+            'start': starts[i],
+            'duration': durations[i],
+            'timestamp': format_time(starts[i])
+        } for i in self.indices]
+
+    def to_columnar(self) -> Dict[str, List[Any]]:
+        """
+        Encode as parallel arrays, which is much smaller on the wire than a dict per segment
+        """
+        starts, durations, texts = self.transcript.starts, self.transcript.durations, self.transcript.texts
+        return {
+            'start': [round(starts[i], 2) for i in self.indices],
+            'duration': [round(durations[i], 2) for i in self.indices],
+            'text': [texts[i] for i in self.indices]
+        }
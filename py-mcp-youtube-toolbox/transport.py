@@ -0,0 +1,129 @@
+"""
+HTTP transports for the googleapiclient clients.
+
+googleapiclient sends every request through an httplib2.Http-like object:
+`request(uri, method, body=None, headers=None)` returning `(response, content)`.
+httplib2.Http is not thread-safe and keeps one connection per host, so it can
+only be used with a client (or an Http) per thread.
+
+HttpxTransport implements the same interface over one httpx.Client, which is
+thread-safe and keeps a pool of keep-alive connections (HTTP/2 when the h2
+package is installed). One transport is shared by every thread and every API
+key's client, so concurrent requests reuse warm connections. googleapiclient
+asks for gzip responses; httpx decompresses them.
+
+Set YOUTUBE_HTTP_TRANSPORT=httplib2 to use one httplib2.Http per thread instead.
+"""
+import importlib.util
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httplib2
+import httpx
+from googleapiclient.http import build_http
+
+# "httpx" (shared connection pool) or "httplib2" (one connection per thread)
+HTTP_TRANSPORT = os.getenv("YOUTUBE_HTTP_TRANSPORT", "httpx")
+
+# Connections kept open to the API, shared by all threads
+HTTP_POOL_SIZE = int(os.getenv("YOUTUBE_HTTP_POOL_SIZE", "20"))
+HTTP_TIMEOUT = float(os.getenv("YOUTUBE_HTTP_TIMEOUT", "60"))
+
+# httpx logs every request at INFO
+logging.getLogger('httpx').setLevel(logging.WARNING)
+
+# Hop-by-hop and encoding headers that no longer describe the decoded content
+_DROPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+class HttpxTransport:
+    """
+    Thread-safe httplib2.Http stand-in over a pooled httpx.Client
+    """
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE, timeout: float = HTTP_TIMEOUT):
+        self.http2 = importlib.util.find_spec('h2') is not None
+        self.client = httpx.Client(
+            http2=self.http2,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            follow_redirects=True,
+        )
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.wire_bytes = 0
+        self.content_bytes = 0
+
+    def request(self, uri: str, method: str = 'GET', body: Any = None, headers: Optional[Dict[str, str]] = None,
+                **kwargs) -> Tuple[httplib2.Response, bytes]:
+        try:
+            response = self.client.request(method, uri, content=body, headers=headers)
+        except httpx.TimeoutException as e:
+            # googleapiclient and the retry guard treat the built-in network errors as transient
+            raise TimeoutError(str(e)) from e
+        except httpx.TransportError as e:
+            raise ConnectionError(str(e)) from e
+        content = response.content
+        with self._lock:
+            self.requests += 1
+            self.wire_bytes += response.num_bytes_downloaded
+            self.content_bytes += len(content)
+        info = {key: value for key, value in response.headers.items() if key.lower() not in _DROPPED_HEADERS}
+        info['status'] = str(response.status_code)
+        resp = httplib2.Response(info)
+        resp.reason = response.reason_phrase
+        resp.version = 20 if response.http_version == 'HTTP/2' else 11
+        return resp, content
+
+    def close(self) -> None:
+        self.client.close()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'transport': 'httpx',
+                'http2': self.http2,
+                'requests': self.requests,
+                'wireBytes': self.wire_bytes,
+                'contentBytes': self.content_bytes,
+                'compressionRatio': round(self.content_bytes / self.wire_bytes, 2) if self.wire_bytes else None,
+            }
+
+class ThreadLocalHttp:
+    """
+    One httplib2.Http per thread behind the same interface
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.connections = 0
+
+    def _http(self) -> httplib2.Http:
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = build_http()
+            with self._lock:
+                self.connections += 1
+        return http
+
+    def request(self, uri: str, method: str = 'GET', body: Any = None, headers: Optional[Dict[str, str]] = None,
+                **kwargs) -> Tuple[httplib2.Response, bytes]:
+        return self._http().request(uri, method, body=body, headers=headers, **kwargs)
+
+    def close(self) -> None:
+        pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {'transport': 'httplib2', 'threads': self.connections}
+
+def build_transport(kind: str = HTTP_TRANSPORT) -> Any:
+    """
+    The HTTP object shared by the API clients
+    """
+    if kind == 'httplib2':
+        return ThreadLocalHttp()
+    if kind == 'httpx':
+        return HttpxTransport()
+    raise ValueError(f"Unknown YOUTUBE_HTTP_TRANSPORT '{kind}' (use httpx or httplib2)")
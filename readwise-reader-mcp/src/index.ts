@@ -8,6 +8,8 @@ import {
 } from '@modelcontextprotocol/sdk/types.js';
 import { tools } from './tools/tool-definitions.js';
 import { handleToolCall } from './handlers/index.js';
+import { initializeClient } from './utils/client-init.js';
+import { prefetchConfigFromEnv } from './utils/prefetch.js';
 
 const server = new Server(
   {
@@ -46,6 +48,12 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
 async function main() {
   const transport = new StdioServerTransport();
   await server.connect(transport);
+
+  // Warm the feeds the agents read first (READWISE_PREFETCH, e.g. "later:email")
+  const { feeds, intervalMs } = prefetchConfigFromEnv();
+  if (feeds.length > 0 && process.env.READWISE_TOKEN) {
+    initializeClient().startPrefetch(feeds, intervalMs);
+  }
 }
 
 main().catch((error) => {
@@ -9,14 +9,21 @@ import {
   APIResponse,
   APIMessage
 } from './types.js';
+import { setInterval } from 'node:timers';
+import { PrefetchedFeed } from './utils/prefetch.js';
 
 export class ReadwiseClient {
-  private readonly baseUrl = 'https://readwise.io/api/v3';
-  private readonly authUrl = 'https://readwise.io/api/v2/auth/';
+  private readonly baseUrl: string;
+  private readonly authUrl: string;
   private readonly token: string;
+  private prefetched: PrefetchedFeed[] = [];
 
   constructor(config: ReadwiseConfig) {
     this.token = config.token;
+    // READWISE_BASE_URL overrides the API root (e.g. the benchmark stand-in server)
+    const root = (config.baseUrl || 'https://readwise.io').replace(/\/+$/, '');
+    this.baseUrl = `${root}/api/v3`;
+    this.authUrl = `${root}/api/v2/auth/`;
   }
 
   private async makeRequest<T>(
@@ -60,6 +67,34 @@ export class ReadwiseClient {
     return { type: 'error', content };
   }
 
+  /**
+   * Keep local copies of the given feeds, re-synced every intervalMs; matching list calls are served from them.
+   */
+  startPrefetch(feeds: PrefetchedFeed[], intervalMs: number): void {
+    this.prefetched = feeds;
+    const sync = async () => {
+      for (const feed of feeds) {
+        try {
+          const count = await feed.sync(params => {
+            const searchParams = new URLSearchParams();
+            Object.entries(params).forEach(([key, value]) => {
+              if (value !== undefined) {
+                searchParams.append(key, String(value));
+              }
+            });
+            return this.makeRequest<ListDocumentsResponse>(`/list/?${searchParams.toString()}`);
+          });
+          console.error(`Prefetched ${count} Readwise documents (${feed.name})`);
+        } catch (error) {
+          console.error(`Readwise prefetch of ${feed.name} failed: ${error instanceof Error ? error.message : String(error)}`);
+        }
+      }
+    };
+    void sync();
+    // Do not keep the process alive once the MCP client disconnects
+    setInterval(sync, intervalMs).unref();
+  }
+
   async validateAuth(): Promise<APIResponse<{ detail: string }>> {
     try {
       const result = await this.makeRequest<{ detail: string }>(this.authUrl);
@@ -90,6 +125,15 @@ export class ReadwiseClient {
   }
 
   async listDocuments(params: ListDocumentsParams = {}): Promise<APIResponse<ListDocumentsResponse>> {
+    for (const feed of this.prefetched) {
+      const prefetched = feed.answer(params);
+      if (prefetched) {
+        return this.createResponse(prefetched, [
+          this.createInfoMessage(`Served from the prefetched ${feed.name} feed (synced ${feed.syncedAtIso()}).`)
+        ]);
+      }
+    }
+
     try {
       // If withFullContent is requested, first check the document count
       if (params.withFullContent) {
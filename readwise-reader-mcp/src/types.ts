@@ -69,6 +69,7 @@ export interface ReadwiseTag {
 
 export interface ReadwiseConfig {
   token: string;
+  baseUrl?: string;
 }
 
 export interface APIMessage {
@@ -13,6 +13,6 @@ export function initializeClient(): ReadwiseClient {
     throw new Error('Readwise access token not provided. Please set READWISE_TOKEN in your MCP configuration or environment variables. You can get your token from https://readwise.io/access_token');
   }
   
-  readwiseClient = new ReadwiseClient({ token });
+  readwiseClient = new ReadwiseClient({ token, baseUrl: process.env.READWISE_BASE_URL });
   return readwiseClient;
 } 
\ No newline at end of file
@@ -0,0 +1,98 @@
+import { ListDocumentsParams, ListDocumentsResponse, ReadwiseDocument } from '../types.js';
+
+type Location = NonNullable<ListDocumentsParams['location']>;
+type Category = NonNullable<ListDocumentsParams['category']>;
+
+// List parameters a prefetched feed can answer locally; anything else goes to the API
+const SERVABLE_PARAMS = new Set(['location', 'category', 'updatedAfter', 'withFullContent', 'withHtmlContent']);
+
+/**
+ * A local copy of one location/category feed (e.g. "later:email"), re-synced on a schedule.
+ *
+ * A list call for the same feed whose updatedAfter lies inside the synced window is
+ * answered from the copy instead of paging through the API.
+ */
+export class PrefetchedFeed {
+  readonly location?: Location;
+  readonly category?: Category;
+  private documents: ReadwiseDocument[] = [];
+  private coveredSince: number | null = null;
+  private syncedAt: number | null = null;
+
+  constructor(spec: string, private readonly windowMs: number, private readonly maxAgeMs: number) {
+    const [location, category] = spec.split(':').map(part => part.trim());
+    this.location = (location || undefined) as Location | undefined;
+    this.category = (category || undefined) as Category | undefined;
+  }
+
+  get name(): string {
+    return `${this.location ?? '*'}:${this.category ?? '*'}`;
+  }
+
+  async sync(fetchPage: (params: ListDocumentsParams) => Promise<ListDocumentsResponse>): Promise<number> {
+    const startedAt = Date.now();
+    const since = startedAt - this.windowMs;
+    const documents: ReadwiseDocument[] = [];
+    let pageCursor: string | undefined;
+
+    do {
+      const page = await fetchPage({
+        location: this.location,
+        category: this.category,
+        updatedAfter: new Date(since).toISOString(),
+        pageCursor,
+      });
+      documents.push(...page.results);
+      pageCursor = page.nextPageCursor;
+    } while (pageCursor);
+
+    this.documents = documents;
+    this.coveredSince = since;
+    this.syncedAt = startedAt;
+    return documents.length;
+  }
+
+  answer(params: ListDocumentsParams): ListDocumentsResponse | null {
+    if (this.syncedAt === null || this.coveredSince === null || Date.now() - this.syncedAt > this.maxAgeMs) {
+      return null;
+    }
+    if (Object.entries(params).some(([key, value]) => value !== undefined && !SERVABLE_PARAMS.has(key))) {
+      return null;
+    }
+    if (params.withFullContent || params.withHtmlContent || !params.updatedAfter) {
+      return null;
+    }
+    if (params.location !== this.location || params.category !== this.category) {
+      return null;
+    }
+
+    const after = Date.parse(params.updatedAfter);
+    if (Number.isNaN(after) || after < this.coveredSince) {
+      return null;
+    }
+
+    const results = this.documents.filter(doc => Date.parse(doc.updated_at) > after);
+    return { count: results.length, results };
+  }
+
+  syncedAtIso(): string | null {
+    return this.syncedAt === null ? null : new Date(this.syncedAt).toISOString();
+  }
+}
+
+/**
+ * Feeds to prefetch from READWISE_PREFETCH (comma-separated location:category pairs, e.g. "later:email").
+ * READWISE_PREFETCH_INTERVAL sets the seconds between syncs (default 600) and
+ * READWISE_PREFETCH_DAYS how far back each sync reaches (default 14).
+ */
+export function prefetchConfigFromEnv(): { feeds: PrefetchedFeed[]; intervalMs: number } {
+  const intervalMs = Number(process.env.READWISE_PREFETCH_INTERVAL || 600) * 1000;
+  const windowMs = Number(process.env.READWISE_PREFETCH_DAYS || 14) * 24 * 60 * 60 * 1000;
+  const feeds = (process.env.READWISE_PREFETCH || '')
+    .split(',')
+    .map(spec => spec.trim())
+    .filter(spec => spec)
+    // A copy older than two intervals means syncs are failing; fall back to the API
+    .map(spec => new PrefetchedFeed(spec, windowMs, 2 * intervalMs));
+  return { feeds, intervalMs };
+}
@@ -0,0 +1,484 @@
+# style_profile.py
+"""
+Offline "style profile" for Arseny's script corpus in Notion.
+
+The profile is built once from the Notion database (structure stats, hook patterns,
+section lengths and excerpt chunks) and cached on disk. Only pages whose
+`last_edited_time` changed are re-downloaded on rebuild. At serve time a compact,
+topic-targeted example pack is rendered from the cached profile.
+
+Build or refresh the profile manually with:
+    python -m script_writer_agent.style_profile [--force]
+"""
+import os
+import re
+import statistics
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+
+from common import BM25Index, load_json, save_json
+from common.notion import get_notion_client
+from common.singleflight import SingleFlight
+
+load_dotenv()
+
+# Notion Database ID for script examples (formatted with dashes)
+DATABASE_ID = "fa2a7c11-17aa-4366-bdca-049568653c14"
+
+PROFILE_CACHE_FILE = "script_style_profile.json"
+PROFILE_VERSION = 1
+
+# Maximum number of scripts kept in the profile
+MAX_SCRIPTS = 10
+
+# Skip the (cheap) Notion change check if the profile was validated this recently
+CHECK_INTERVAL_SECONDS = int(os.getenv("STYLE_PROFILE_CHECK_INTERVAL", "900"))
+
+# Target size of excerpt chunks in words
+EXCERPT_WORDS = 160
+
+EXCLUDE_KEYWORDS = ["description", "thumbnail", "idea", "tags"]
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+# Concurrent tool calls share one in-flight Notion request per database / page
+_flights = SingleFlight()
+
+
+# ---------------------------------------------------------------------------
+# Notion access
+# ---------------------------------------------------------------------------
+
+def page_title(page, default=""):
+    """
+    Extract the plain title of a Notion page.
+    """
+    title_prop = page.get("properties", {}).get("Name", {})
+    try:
+        return " ".join([
+            t.get("text", {}).get("content", "")
+            for t in title_prop.get("title") or []
+            if t.get("type") == "text" and t.get("text", {}).get("content")
+        ]) or default
+    except Exception:
+        return default
+
+
+@_flights.wrap(lambda notion: ("script_pages", DATABASE_ID))
+def list_script_pages(notion):
+    """
+    Query the database for the most recently edited script pages.
+    Excludes pages with "Description", "Thumbnail", etc. in the title.
+    """
+    # Retrieve database to get data source ID (required for querying in newer API)
+    database = notion.databases.retrieve(DATABASE_ID)
+    data_sources = database.get("data_sources", [])
+    if not data_sources:
+        raise ValueError("Database has no data sources. Cannot query database.")
+
+    data_source_id = data_sources[0]["id"]
+
+    # Fetch more than needed and filter client-side to ensure quality
+    response = notion.data_sources.query(
+        data_source_id,
+        page_size=50,
+        filter={"property": "Name", "title": {"contains": "Script"}},
+        sorts=[{"timestamp": "last_edited_time", "direction": "descending"}],
+    )
+
+    pages = []
+    for page in response.get("results", []):
+        title = page_title(page).lower()
+        if "script" in title and not any(keyword in title for keyword in EXCLUDE_KEYWORDS):
+            pages.append(page)
+            if len(pages) >= MAX_SCRIPTS:
+                break
+    return pages
+
+
+@_flights.wrap(lambda notion, page_id: ("blocks", page_id))
+def fetch_page_blocks(notion, page_id):
+    """
+    Fetch all top-level blocks of a page, following pagination.
+    """
+    blocks = []
+    block_cursor = None
+    while True:
+        block_params = {"block_id": page_id, "page_size": 100}
+        if block_cursor:
+            block_params["start_cursor"] = block_cursor
+
+        block_response = notion.blocks.children.list(**block_params)
+        blocks.extend(block_response.get("results", []))
+
+        if not block_response.get("has_more", False):
+            break
+        block_cursor = block_response.get("next_cursor")
+    return blocks
+
+
+# ---------------------------------------------------------------------------
+# Block conversion
+# ---------------------------------------------------------------------------
+
+def extract_rich_text(rich_text_array):
+    """
+    Extract plain text from Notion rich text array, preserving formatting.
+    """
+    if not rich_text_array:
+        return ""
+
+    text_parts = []
+    for text_obj in rich_text_array:
+        if text_obj.get("type") == "text":
+            content = text_obj.get("text", {}).get("content", "")
+            annotations = text_obj.get("annotations", {})
+
+            # Apply markdown formatting based on annotations
+            if annotations.get("bold"):
+                content = f"**{content}**"
+            if annotations.get("italic"):
+                content = f"*{content}*"
+            if annotations.get("code"):
+                content = f"`{content}`"
+            if annotations.get("strikethrough"):
+                content = f"~~{content}~~"
+
+            text_parts.append(content)
+
+    return "".join(text_parts)
+
+
+MARKDOWN_PREFIXES = {
+    "paragraph": "",
+    "heading_1": "# ",
+    "heading_2": "## ",
+    "heading_3": "### ",
+    "bulleted_list_item": "- ",
+    "numbered_list_item": "1. ",
+    "quote": "> ",
+    "callout": "💡 ",
+}
+
+
+def blocks_to_markdown(blocks):
+    """
+    Convert Notion blocks to markdown format.
+    """
+    markdown_lines = []
+
+    for block in blocks:
+        block_type = block.get("type")
+
+        if block_type in MARKDOWN_PREFIXES:
+            text = extract_rich_text(block.get(block_type, {}).get("rich_text", []))
+            if text:
+                markdown_lines.append(f"{MARKDOWN_PREFIXES[block_type]}{text}\n")
+
+        elif block_type == "code":
+            code_block = block.get("code", {})
+            text = extract_rich_text(code_block.get("rich_text", []))
+            language = code_block.get("language", "")
+            if text:
+                markdown_lines.append(f"```{language}\n{text}\n```\n")
+
+        elif block_type == "divider":
+            markdown_lines.append("---\n")
+
+    return "\n".join(markdown_lines)
+
+
+# ---------------------------------------------------------------------------
+# Analysis
+# ---------------------------------------------------------------------------
+
+def _strip_markdown(text):
+    return re.sub(r"[*_`~>#]+", "", text).strip()
+
+
+def classify_hook(sentence):
+    """
+    Roughly classify the opening sentence of a script.
+    """
+    lowered = sentence.lower()
+    if sentence.rstrip().endswith("?"):
+        return "question"
+    if re.search(r"\d", sentence):
+        return "number/result"
+    if lowered.startswith(("i ", "i'm", "i've", "last ", "yesterday", "when i", "a few")):
+        return "personal story"
+    if lowered.startswith(("in this video", "today", "this video")):
+        return "direct promise"
+    if " you" in f" {lowered}":
+        return "viewer address"
+    return "bold statement"
+
+
+def analyze_script(title, markdown):
+    """
+    Compute structure stats, hook, call-to-action and excerpt chunks for one script.
+    """
+    lines = [line.strip() for line in markdown.split("\n") if line.strip()]
+    headings = [line for line in lines if line.startswith("#")]
+    paragraphs = [_strip_markdown(line) for line in lines
+                  if not line.startswith(("#", "```", "---"))]
+    paragraphs = [p for p in paragraphs if p]
+
+    # Section lengths in words (content between headings)
+    section_lengths = []
+    current = 0
+    for line in lines:
+        if line.startswith("#"):
+            if current:
+                section_lengths.append(current)
+            current = 0
+        else:
+            current += len(line.split())
+    if current:
+        section_lengths.append(current)
+
+    words = sum(len(p.split()) for p in paragraphs)
+    sentences = [s for p in paragraphs for s in SENTENCE_SPLIT.split(p) if s.strip()]
+    sentence_lengths = [len(s.split()) for s in sentences]
+    first_sentence = sentences[0] if sentences else ""
+
+    # Sentence openers ("Alright,", "Now", "So") capture his conversational transitions
+    openers = Counter()
+    for sentence in sentences:
+        opener = re.split(r"[\s,]", sentence.strip(), maxsplit=1)[0].lower().strip("\"'")
+        if opener:
+            openers[opener] += 1
+
+    # Group paragraphs into ~EXCERPT_WORDS chunks, remembering the current heading
+    excerpts = []
+    chunk, chunk_words, section = [], 0, ""
+    for line in lines:
+        if line.startswith("#"):
+            if chunk:
+                excerpts.append({"section": section, "text": " ".join(chunk)})
+                chunk, chunk_words = [], 0
+            section = _strip_markdown(line)
+            continue
+        if line.startswith(("```", "---")):
+            continue
+        text = _strip_markdown(line)
+        chunk.append(text)
+        chunk_words += len(text.split())
+        if chunk_words >= EXCERPT_WORDS:
+            excerpts.append({"section": section, "text": " ".join(chunk)})
+            chunk, chunk_words = [], 0
+    if chunk:
+        excerpts.append({"section": section, "text": " ".join(chunk)})
+
+    return {
+        "title": title,
+        "word_count": words,
+        "section_count": len(headings),
+        "section_lengths": section_lengths,
+        "avg_sentence_words": round(statistics.mean(sentence_lengths), 1) if sentence_lengths else 0,
+        "question_ratio": round(sum(s.rstrip().endswith("?") for s in sentences) / len(sentences), 3) if sentences else 0,
+        "hook": " ".join(paragraphs[:2])[:600],
+        "hook_type": classify_hook(first_sentence),
+        "cta": paragraphs[-1][:400] if paragraphs else "",
+        "openers": dict(openers.most_common(15)),
+        "excerpts": excerpts,
+    }
+
+
+def summarize_corpus(scripts):
+    """
+    Aggregate per-script stats into corpus-level style statistics.
+    """
+    if not scripts:
+        return {}
+
+    word_counts = [s["word_count"] for s in scripts]
+    section_counts = [s["section_count"] for s in scripts]
+    section_lengths = [n for s in scripts for n in s["section_lengths"]]
+    openers = Counter()
+    for s in scripts:
+        openers.update(s["openers"])
+
+    return {
+        "script_count": len(scripts),
+        "median_word_count": int(statistics.median(word_counts)),
+        "word_count_range": [min(word_counts), max(word_counts)],
+        "median_section_count": statistics.median(section_counts),
+        "median_section_words": int(statistics.median(section_lengths)) if section_lengths else 0,
+        "avg_sentence_words": round(statistics.mean(s["avg_sentence_words"] for s in scripts), 1),
+        "question_ratio": round(statistics.mean(s["question_ratio"] for s in scripts), 3),
+        "hook_types": dict(Counter(s["hook_type"] for s in scripts).most_common()),
+        "top_openers": [word for word, _ in openers.most_common(12)],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Build / load
+# ---------------------------------------------------------------------------
+
+def load_profile():
+    """
+    Load the cached profile, or None if it has not been built yet.
+    """
+    profile = load_json(PROFILE_CACHE_FILE)
+    if not profile or profile.get("version") != PROFILE_VERSION:
+        return None
+    return profile
+
+
+def build_profile(notion, force=False):
+    """
+    Build or incrementally refresh the style profile.
+
+    Lists the script pages (one Notion query) and only downloads blocks for pages
+    that are new or whose last_edited_time changed since the cached profile.
+
+    Returns:
+        tuple: (profile dict, number of pages re-fetched)
+    """
+    cached = None if force else load_profile()
+    cached_scripts = {s["page_id"]: s for s in (cached or {}).get("scripts", [])}
+
+    pages = list_script_pages(notion)
+    scripts = []
+    refetched = 0
+
+    for idx, page in enumerate(pages, 1):
+        page_id = page.get("id")
+        edited = page.get("last_edited_time")
+        previous = cached_scripts.get(page_id)
+
+        if previous and previous.get("last_edited_time") == edited:
+            scripts.append(previous)
+            continue
+
+        markdown = blocks_to_markdown(fetch_page_blocks(notion, page_id))
+        script = analyze_script(page_title(page, f"Script {idx}"), markdown)
+        script.update({"page_id": page_id, "last_edited_time": edited})
+        scripts.append(script)
+        refetched += 1
+
+    profile = {
+        "version": PROFILE_VERSION,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "checked_at": time.time(),
+        "fingerprint": {s["page_id"]: s["last_edited_time"] for s in scripts},
+        "summary": summarize_corpus(scripts),
+        "scripts": scripts,
+    }
+
+    save_json(PROFILE_CACHE_FILE, profile)
+    return profile, refetched
+
+
+def get_profile(notion):
+    """
+    Return an up-to-date profile, checking Notion for changes at most every CHECK_INTERVAL_SECONDS.
+    """
+    profile = load_profile()
+    if profile and time.time() - profile.get("checked_at", 0) < CHECK_INTERVAL_SECONDS:
+        return profile
+
+    profile, _ = build_profile(notion)
+    return profile
+
+
+def prefetch():
+    """
+    Prefetch job: pick up script changes in the background so tool calls within
+    CHECK_INTERVAL_SECONDS of a run are served from the cached profile.
+    """
+    notion = get_notion_client()
+    if notion:
+        build_profile(notion)
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def render_example_pack(profile, topic="", max_excerpts=4, max_hooks=3):
+    """
+    Render a compact markdown example pack: style stats, hook patterns and the
+    excerpts most similar to the requested topic (at most one per script).
+    """
+    summary = profile.get("summary", {})
+    scripts = profile.get("scripts", [])
+
+    lines = ["# 📜 Script Style Profile: Arseny Shatokhin\n"]
+
+    # Step 1: Structure stats
+    if summary:
+        lines.append("## Structure")
+        lines.append(f"- Scripts analyzed: {summary['script_count']}")
+        lines.append(f"- Typical length: ~{summary['median_word_count']} words "
+                     f"(range {summary['word_count_range'][0]}–{summary['word_count_range'][1]})")
+        lines.append(f"- Sections per script: ~{summary['median_section_count']}, "
+                     f"~{summary['median_section_words']} words each")
+        lines.append(f"- Average sentence length: {summary['avg_sentence_words']} words; "
+                     f"{round(summary['question_ratio'] * 100)}% of sentences are questions")
+        lines.append(f"- Favourite sentence openers: {', '.join(summary['top_openers'])}")
+        lines.append("")
+
+    # Step 2: Rank excerpts by similarity to the topic
+    candidates = [(s, e) for s in scripts for e in s.get("excerpts", [])]
+    selected = []
+    if candidates:
+        if topic:
+            index = BM25Index([f"{s['title']} {e['section']} {e['text']}" for s, e in candidates])
+            ranked = [i for i, score in index.top_k(topic, len(candidates)) if score > 0]
+        else:
+            ranked = []
+        # Fall back to the opening excerpt of the most recent scripts
+        ranked += [i for i, (s, e) in enumerate(candidates) if e is s["excerpts"][0] and i not in ranked]
+
+        used_scripts = set()
+        for i in ranked:
+            script, excerpt = candidates[i]
+            if script["page_id"] in used_scripts:
+                continue
+            used_scripts.add(script["page_id"])
+            selected.append((script, excerpt))
+            if len(selected) >= max_excerpts:
+                break
+
+    # Step 3: Hooks from the same scripts as the selected excerpts
+    hook_scripts = [s for s, _ in selected][:max_hooks] or scripts[:max_hooks]
+    if hook_scripts:
+        lines.append("## Hook Patterns")
+        if summary.get("hook_types"):
+            lines.append("Hook types used: " + ", ".join(f"{k} ({v})" for k, v in summary["hook_types"].items()))
+        for script in hook_scripts:
+            lines.append(f"- **{script['title']}** ({script['hook_type']}): {script['hook']}")
+        lines.append("")
+
+    if selected:
+        lines.append(f"## Relevant Excerpts{f' for: {topic}' if topic else ''}")
+        for script, excerpt in selected:
+            heading = f"{script['title']}" + (f" › {excerpt['section']}" if excerpt["section"] else "")
+            lines.append(f"### {heading}")
+            lines.append(excerpt["text"] + "\n")
+
+    # Step 4: One call-to-action example
+    if hook_scripts and hook_scripts[0].get("cta"):
+        lines.append("## Call-to-Action Example")
+        lines.append(hook_scripts[0]["cta"] + "\n")
+
+    lines.append(f"_Profile built {profile.get('built_at', 'unknown')}. "
+                 "Request full_scripts=True only if you need complete scripts._")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    notion = get_notion_client()
+    if not notion:
+        print("❌ Error: NOTION_API_KEY environment variable not found.")
+        sys.exit(1)
+
+    profile, refetched = build_profile(notion, force="--force" in sys.argv)
+    print(f"✅ Style profile built: {len(profile['scripts'])} scripts ({refetched} re-fetched)")
+    print(render_example_pack(profile, topic=" ".join(a for a in sys.argv[1:] if a != "--force")))
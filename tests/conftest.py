@@ -0,0 +1,12 @@
+import pytest
+
+from common import cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """
+    Keep every test's cache files out of the repository's .cache directory.
+    """
+    monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
@@ -0,0 +1,57 @@
+from common.dedup import cluster, jaccard, merge_stories, normalize_url, shingles
+
+NEWSLETTER = "The Batch: AI agents news, a new release of agent frameworks and what it means for AI builders"
+TWEET = "How to build AI agents with the new agent SDK release"
+
+
+def test_near_miss_pairs_stay_apart():
+    assert jaccard(shingles(NEWSLETTER), shingles(TWEET)) < 0.5
+    assert cluster([NEWSLETTER, TWEET]) == [[0], [1]]
+
+
+def test_common_words_do_not_chain_unrelated_items():
+    texts = [
+        "OpenAI releases new AI agents SDK for developers",
+        "New AI agents release from Google for developers",
+        "Google releases Gemini update for AI agents developers",
+        "Anthropic ships new Claude model for coding agents",
+        "New AI agents news this week: releases from every lab",
+    ]
+    assert all(len(group) == 1 for group in cluster(texts))
+
+
+def test_reworded_story_is_merged():
+    texts = [
+        "OpenAI launches Sora 2 video generation model with synchronized audio",
+        "Breaking: OpenAI launches Sora 2, a video generation model with synchronized audio",
+        "Weekly roundup of robotics funding rounds",
+    ]
+    assert cluster(texts) == [[0, 1], [2]]
+
+
+def test_shared_url_merges_unrelated_text():
+    texts = ["Huge news today", "Read the full announcement"]
+    urls = [["https://www.example.com/post/?utm_source=x"], ["http://example.com/post"]]
+    assert cluster(texts, urls) == [[0, 1]]
+
+
+def test_normalize_url():
+    assert normalize_url("https://x.com/someone/status/123?s=20") == "x:123"
+    assert normalize_url("https://twitter.com/i/web/status/123") == "x:123"
+    assert normalize_url("https://www.Example.com/a/?ref=feed&id=7#top") == "example.com/a?id=7"
+    assert normalize_url("not a url") is None
+
+
+def test_merge_stories_counts_sources():
+    items = [
+        {"source": "x", "title": None, "summary": "OpenAI launches Sora 2 video generation model with synchronized audio",
+         "url": "https://x.com/a/status/1", "score": 50, "published_at": "2026-10-01T10:00:00Z"},
+        {"source": "readwise", "title": "OpenAI launches Sora 2 video generation model with synchronized audio",
+         "summary": None, "url": "https://news.example.com/sora", "published_at": "2026-10-01T12:00:00Z"},
+        {"source": "x", "title": None, "summary": "Robotics startup raises a seed round", "url": "https://x.com/b/status/2"},
+    ]
+    stories = merge_stories(items)
+    assert stories[0]["source_counts"] == {"x": 1, "readwise": 1}
+    assert stories[0]["title"].startswith("OpenAI launches Sora 2")
+    assert stories[0]["first_published_at"] == "2026-10-01T10:00:00Z"
+    assert len(stories) == 2
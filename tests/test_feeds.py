@@ -0,0 +1,109 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from common import feeds, transcripts
+
+CHANNEL = "UC" + "a" * 22
+
+
+def feed_xml(uploads):
+    entries = "".join(f"""
+  <entry>
+    <yt:videoId>{video_id}</yt:videoId>
+    <yt:channelId>{CHANNEL}</yt:channelId>
+    <title>Video {video_id}</title>
+    <author><name>Channel</name></author>
+    <published>{published.isoformat()}</published>
+  </entry>""" for video_id, published in uploads)
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns="http://www.w3.org/2005/Atom">{entries}
+</feed>"""
+
+
+@pytest.fixture
+def feed_server(monkeypatch):
+    now = datetime.now(timezone.utc)
+    state = {"uploads": [("new1", now - timedelta(days=1)), ("old1", now - timedelta(days=30))], "requests": []}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            etag = f'"{len(state["uploads"])}"'
+            state["requests"].append(self.path)
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = feed_xml(state["uploads"]).encode()
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(feeds, "FEEDS_BASE_URL", f"http://127.0.0.1:{server.server_port}/feeds/videos.xml")
+    yield state
+    server.shutdown()
+
+
+def test_channel_reference():
+    assert feeds.channel_reference(CHANNEL) == ("id", CHANNEL)
+    assert feeds.channel_reference(f"https://www.youtube.com/channel/{CHANNEL}") == ("id", CHANNEL)
+    assert feeds.channel_reference("https://www.youtube.com/@Some.Channel") == ("handle", "@Some.Channel")
+    with pytest.raises(ValueError):
+        feeds.channel_reference("not a channel")
+
+
+def test_read_watchlist(tmp_path):
+    path = tmp_path / "watchlist.txt"
+    path.write_text(f"# competitors\n{CHANNEL}  # main\n\n@handle\n", encoding="utf-8")
+    assert feeds.read_watchlist(path) == [CHANNEL, "@handle"]
+
+
+def test_unchanged_feed_returns_stored_entries(feed_server):
+    state = {}
+    first, = feeds.fetch_feeds([CHANNEL], state)
+    second, = feeds.fetch_feeds([CHANNEL], state)
+    assert first["status"] == "changed" and second["status"] == "not_modified"
+    assert [entry["videoId"] for entry in second["entries"]] == ["new1", "old1"]
+
+
+def test_store_merges_keys_of_both_sides(tmp_path):
+    store = feeds.FeedStore(str(tmp_path / "feeds.json"))
+    store.save({CHANNEL: {"seen": ["a"]}}, {"@one": CHANNEL})
+    store.save({CHANNEL: {"etag": '"1"', "entries": []}}, {})
+    channels, handles = store.load()
+    assert channels[CHANNEL] == {"seen": ["a"], "etag": '"1"', "entries": []}
+    assert handles == {"@one": CHANNEL}
+
+
+def test_prefetch_reads_feeds_without_quota(feed_server, tmp_path, monkeypatch):
+    watchlist = tmp_path / "watchlist.txt"
+    watchlist.write_text(CHANNEL + "\n", encoding="utf-8")
+    monkeypatch.setattr(transcripts, "WATCHLIST_FILE", str(watchlist))
+    monkeypatch.setattr(transcripts, "WATCHLIST_FEEDS_FILE", str(tmp_path / "watchlist_feeds.json"))
+    monkeypatch.delenv("YOUTUBE_API_KEY", raising=False)
+    fetched = []
+
+    def fetch(video_id, languages=("en",)):
+        fetched.append(video_id)
+        return SimpleNamespace(language_code=languages[0], snippets=[])
+
+    monkeypatch.setattr(transcripts, "transcript_api", lambda: SimpleNamespace(fetch=fetch))
+
+    transcripts.prefetch_watchlist_transcripts()
+    assert fetched == ["new1"]
+    # The next run gets a 304, serves the stored entries and finds the transcript cached
+    transcripts.prefetch_watchlist_transcripts()
+    assert fetched == ["new1"]
+    assert len(feed_server["requests"]) == 2
+    channels, _ = feeds.FeedStore(str(tmp_path / "watchlist_feeds.json")).load()
+    assert channels[CHANNEL]["etag"] == '"2"'
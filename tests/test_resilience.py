@@ -0,0 +1,113 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from common.resilience import CircuitBreaker, CircuitOpenError, Guard, Policy, classify
+
+
+class HttpError(Exception):
+    def __init__(self, status, content=b""):
+        super().__init__(f"HTTP {status}")
+        self.resp = SimpleNamespace(status=status)
+        self.content = content
+
+
+def fail(status, content=b""):
+    def call():
+        raise HttpError(status, content)
+    return call
+
+
+def make_guard(**overrides):
+    policy = dict(rate=0, failure_threshold=2, cooldown=0.05, max_attempts=1, base_delay=0)
+    policy.update(overrides)
+    return Guard("test", Policy(**policy))
+
+
+def test_breaker_opens_after_threshold_and_closes_after_probe():
+    breaker = CircuitBreaker(threshold=2, cooldown=0.05)
+    breaker.failure("500")
+    assert breaker.state() == "closed"
+    breaker.failure("500")
+    assert breaker.state() == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call("test")
+
+    time.sleep(0.06)
+    assert breaker.state() == "half-open"
+    breaker.before_call("test")
+    # Only one probe at a time
+    with pytest.raises(CircuitOpenError, match="probe in flight"):
+        breaker.before_call("test")
+    breaker.success()
+    assert breaker.state() == "closed"
+    breaker.before_call("test")
+
+
+def test_failed_probe_reopens_breaker():
+    breaker = CircuitBreaker(threshold=2, cooldown=0.05)
+    breaker.trip(0.05, "quota")
+    time.sleep(0.06)
+    breaker.before_call("test")
+    breaker.failure("500")
+    assert breaker.state() == "open"
+
+
+def test_probe_answered_with_non_counting_error_closes_breaker():
+    guard = make_guard()
+    for _ in range(2):
+        with pytest.raises(HttpError):
+            guard.call(fail(500))
+    assert guard.breaker.state() == "open"
+    with pytest.raises(CircuitOpenError):
+        guard.call(lambda: "ok")
+
+    time.sleep(0.06)
+    # The probe gets a 404: the service answered, so the breaker must not stay half-open forever
+    with pytest.raises(HttpError):
+        guard.call(fail(404))
+    assert guard.breaker.state() == "closed"
+    assert guard.call(lambda: "ok") == "ok"
+    assert guard.call(lambda: "again") == "again"
+
+
+def test_non_counting_errors_do_not_reset_failure_streak():
+    guard = make_guard(failure_threshold=3)
+    for call in (fail(500), fail(404), fail(500), fail(500)):
+        with pytest.raises(HttpError):
+            guard.call(call)
+    assert guard.breaker.state() == "open"
+
+
+def test_quota_exceeded_trips_until_reset():
+    guard = make_guard()
+    with pytest.raises(HttpError):
+        guard.call(fail(403, b'{"error": {"errors": [{"reason": "quotaExceeded"}]}}'))
+    assert guard.breaker.state() == "open"
+    assert guard.breaker.open_until - time.monotonic() > 1
+
+
+def test_retries_transient_errors():
+    guard = make_guard(max_attempts=3)
+    responses = iter([HttpError(503), HttpError(429), "ok"])
+
+    def flaky():
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    assert guard.call(flaky) == "ok"
+    assert guard.retries == 2
+    assert guard.breaker.state() == "closed"
+
+
+def test_classify():
+    assert classify(HttpError(404)).counts is False
+    assert classify(HttpError(503)).retryable is True
+    assert classify(HttpError(429)).throttled is True
+    assert classify(HttpError(403, b'"reason": "rateLimitExceeded"')).retryable is True
+    assert classify(HttpError(403, b'"reason": "commentsDisabled"')).counts is False
+    assert classify(TimeoutError()).retryable is True
+    assert classify(ValueError()).counts is False
@@ -0,0 +1,17 @@
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The YouTube toolbox deploys on its own, so it keeps copies of these agency modules
+SHARED_MODULES = ["resilience.py", "singleflight.py", "feeds.py"]
+
+
+@pytest.mark.parametrize("name", SHARED_MODULES)
+def test_toolbox_copy_matches_source(name):
+    with open(os.path.join(ROOT, "common", name), "rb") as f:
+        source = f.read()
+    with open(os.path.join(ROOT, "py-mcp-youtube-toolbox", name), "rb") as f:
+        copy = f.read()
+    assert copy == source, f"py-mcp-youtube-toolbox/{name} differs from common/{name}; copy the source over"
@@ -0,0 +1,40 @@
+import copy
+import threading
+import time
+
+import pytest
+
+from common.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_upstream_call():
+    flights = SingleFlight(clone=copy.deepcopy)
+    calls = []
+    started = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return {"items": [1, 2]}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flights.do("chart", fetch))) for _ in range(5)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1 and flights.shared == 4
+    assert all(result == {"items": [1, 2]} for result in results)
+    # Waiters get their own copies
+    assert len({id(result) for result in results}) == 5
+
+
+def test_errors_are_raised_and_not_cached():
+    flights = SingleFlight()
+    with pytest.raises(RuntimeError):
+        flights.do("key", lambda: (_ for _ in ()).throw(RuntimeError("down")))
+    assert flights.do("key", lambda: "up") == "up"
@@ -0,0 +1,29 @@
+import pytest
+
+from common import tracing
+
+
+@pytest.fixture(autouse=True)
+def prices(monkeypatch):
+    monkeypatch.setattr(tracing, "MODEL_PRICES", dict(tracing.MODEL_PRICES))
+
+
+def test_price_overrides(monkeypatch):
+    monkeypatch.setenv("AGENCY_MODEL_PRICES", '{"gpt-test": [1, 0.5, 4]}')
+    tracing.load_model_prices()
+    assert tracing.MODEL_PRICES["gpt-test"] == (1.0, 0.5, 4.0)
+    assert tracing.estimate_cost("gpt-test-2026", 1_000_000, 0, 1_000_000) == 5.0
+
+
+@pytest.mark.parametrize("value", ["{not json", "[1, 2, 3]", '{"gpt-test": [1, 2]}', '{"gpt-test": ["a", 1, 2]}',
+                                   '{"gpt-test": 3}'])
+def test_malformed_price_overrides_keep_defaults(monkeypatch, value):
+    defaults = dict(tracing.MODEL_PRICES)
+    monkeypatch.setenv("AGENCY_MODEL_PRICES", value)
+    tracing.load_model_prices()
+    assert tracing.MODEL_PRICES == defaults
+
+
+def test_estimate_cost():
+    assert tracing.estimate_cost("gpt-5-mini", 1_000_000, 500_000, 0) == pytest.approx(0.125 + 0.0125)
+    assert tracing.estimate_cost("unknown-model", 1000, 0, 1000) == 0.0
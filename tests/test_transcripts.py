@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import pytest
+from youtube_transcript_api import NoTranscriptFound
+
+from common import resilience, transcripts
+
+
+class RateLimited(Exception):
+    def __init__(self):
+        super().__init__("429 Too Many Requests")
+        self.resp = SimpleNamespace(status=429)
+
+
+class FakeApi:
+    def __init__(self, failure=None):
+        self.failure = failure
+        self.calls = []
+
+    def fetch(self, video_id, languages=("en",)):
+        self.calls.append(list(languages))
+        if languages != ("en",) and self.failure:
+            raise self.failure
+        return SimpleNamespace(language_code=languages[0],
+                               snippets=[SimpleNamespace(text="hello", start=0.0, duration=1.5)])
+
+
+@pytest.fixture(autouse=True)
+def guards(monkeypatch):
+    monkeypatch.setitem(resilience.POLICIES, "transcript",
+                        resilience.Policy(rate=0, max_attempts=1, base_delay=0))
+    resilience.reset()
+    yield
+    resilience.reset()
+
+
+def test_fetch_caches_requested_language():
+    api = FakeApi()
+    transcript = transcripts.fetch_transcript(api, "vid", "ko")
+    assert transcript["language_code"] == "ko" and transcript["fallback"] is False
+    assert transcripts.fetch_transcript(api, "vid", "ko")["snippets"] == [["hello", 0.0, 1.5]]
+    assert len(api.calls) == 1
+
+
+def test_falls_back_when_language_has_no_transcript():
+    api = FakeApi(NoTranscriptFound("vid", ["ko"], None))
+    transcript = transcripts.fetch_transcript(api, "vid", "ko")
+    assert transcript["fallback"] is True and transcript["language_code"] == "en"
+    assert transcripts.load_transcript("vid", "ko")["fallback"] is True
+
+
+def test_transient_error_does_not_cache_fallback():
+    api = FakeApi(RateLimited())
+    with pytest.raises(RateLimited):
+        transcripts.fetch_transcript(api, "vid", "ko")
+    assert api.calls == [["ko"]]
+    assert transcripts.load_transcript("vid", "ko") is None
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from common.trends import TrendTracker, ngrams
+
+NOW = 1_790_000_000.0
+HOUR = 3600
+
+FILLER = ["python", "tutorial", "startup", "marketing", "design", "database", "cloud", "finance", "robotics",
+          "education", "gaming", "fitness", "travel", "music", "camera", "security", "blockchain", "crypto"]
+
+
+def items(seed=7):
+    rng = random.Random(seed)
+    generated = []
+    for i in range(1200):
+        age = rng.uniform(0, 15 * 24 * HOUR)
+        words = ["ai"] + rng.sample(FILLER, 3)
+        # The planted topic: a handful of mentions in the baseline, many in the last day
+        if age < 24 * HOUR and rng.random() < 0.3 or age >= 24 * HOUR and rng.random() < 0.005:
+            words += ["sora", "video"]
+        generated.append({"source": rng.choice(["x", "readwise"]), "id": str(i), "text": " ".join(words),
+                          "published_at": NOW - age})
+    return generated
+
+
+@pytest.fixture
+def tracker():
+    tracker = TrendTracker(bucket_hours=6, retention_days=30)
+    tracker.observe(items(), youtube_dataset=False, now=NOW)
+    return tracker
+
+
+def test_ngrams_drop_urls_and_handles():
+    assert ngrams("Sora video demo https://example.com/x by @someone") >= {"sora", "sora video", "video demo"}
+    assert not any("example" in term or "someone" in term for term in ngrams("see https://example.com @someone"))
+
+
+def test_observe_counts_each_item_once(tracker):
+    assert tracker.observe(items(), youtube_dataset=False, now=NOW) == {}
+
+
+def test_zscore_finds_planted_phrase_not_common_words(tracker):
+    result = tracker.bursts(window_hours=24, baseline_days=14, now=NOW)
+    terms = [burst["term"] for burst in result["bursts"]]
+    assert terms[0] == "sora video"
+    assert "ai" not in terms
+    assert result["bursts"][0]["lift"] > 10
+    assert set(result["bursts"][0]["sources"]) <= {"x", "readwise"}
+
+
+def test_kleinberg_reports_ongoing_burst(tracker):
+    result = tracker.bursts(method="kleinberg", now=NOW)
+    burst = result["bursts"][0]
+    assert burst["term"] == "sora video"
+    assert burst["burst"]["active"] and burst["burst"]["since"]
+
+
+def test_min_count_and_unknown_method(tracker):
+    assert tracker.bursts(min_count=10_000, now=NOW)["bursts"] == []
+    with pytest.raises(ValueError):
+        tracker.bursts(method="ewma", now=NOW)
+
+
+def test_empty_window():
+    result = TrendTracker().bursts(now=NOW)
+    assert result["bursts"] == [] and result["window"]["items"] == 0
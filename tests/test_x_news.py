@@ -0,0 +1,150 @@
+import threading
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from grok_news_agent import x_news
+
+NOW = time.time()
+
+
+def post(url="", text="", **fields):
+    return x_news._normalize_post({"url": url, "text": text, **fields}, NOW)
+
+
+def test_posts_without_url_are_not_merged_into_each_other():
+    store = {}
+    added = x_news.dedupe(store, [
+        post(text="OpenAI ships a new agents SDK with built-in tracing and handoffs"),
+        post(text="Google DeepMind releases Gemini 3 with a one million token context window"),
+        post("https://x.com/someone/status/1", "Anthropic publishes a guide to building effective agents"),
+        post(text="Meta open-sources a robotics foundation model trained on household video"),
+    ])
+    assert len(added) == 4
+    assert all(post_id for post_id in store)
+    assert all(not stored["duplicate_urls"] for stored in store.values())
+
+
+def test_post_without_url_matches_its_own_text_only():
+    store = {}
+    x_news.dedupe(store, [post(text="OpenAI ships a new agents SDK")])
+    assert x_news.dedupe(store, [post(text="RT @openai: OpenAI  ships a new Agents SDK")]) == []
+    assert len(store) == 1
+
+
+def test_search_runs_without_holding_the_store_lock(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_search(query, from_date, max_results):
+        started.set()
+        release.wait(5)
+        return [{"url": "https://x.com/a/status/1", "text": "OpenAI ships a new agents SDK"}]
+
+    monkeypatch.setattr(x_news, "search_x", slow_search)
+    search = threading.Thread(target=x_news.collect, args=("AI agents",))
+    search.start()
+    try:
+        assert started.wait(5)
+        assert x_news._lock.acquire(timeout=1)
+        x_news._lock.release()
+        assert x_news.recent_posts() == []
+    finally:
+        release.set()
+        search.join(5)
+    assert [stored["url"] for stored in x_news.recent_posts()] == ["https://x.com/a/status/1"]
+
+
+class FakeSearch:
+    def __init__(self, posts=()):
+        self.posts = list(posts)
+        self.calls = []
+
+    def __call__(self, query, from_date, max_results):
+        self.calls.append((from_date, max_results))
+        return self.posts
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=NOW)
+    monkeypatch.setattr(x_news, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def day(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d")
+
+
+def test_repeated_search_fetches_only_since_the_last_fetch(monkeypatch, clock):
+    search = FakeSearch([{"url": "https://x.com/a/status/1", "text": "OpenAI ships a new agents SDK"}])
+    monkeypatch.setattr(x_news, "search_x", search)
+
+    first = x_news.collect("AI agents", days=3)
+    assert first["fetched"] and first["new_posts"] == 1
+    assert search.calls == [(day(NOW - 3 * 86400), x_news.FULL_SEARCH_RESULTS)]
+
+    # Within NEWS_MIN_REFRESH_SECONDS the store answers without calling Grok
+    clock.now += 60
+    second = x_news.collect("AI agents", days=3)
+    assert not second["fetched"] and len(search.calls) == 1
+    assert [post["new"] for post in second["posts"]] == [False]
+
+    clock.now += x_news.NEWS_MIN_REFRESH_SECONDS
+    third = x_news.collect("AI agents", days=3)
+    assert search.calls[-1] == (day(NOW), x_news.INCREMENTAL_SEARCH_RESULTS)
+    assert third["new_posts"] == 0 and len(third["posts"]) == 1
+
+
+def test_longer_window_than_covered_fetches_the_whole_window(monkeypatch, clock):
+    search = FakeSearch()
+    monkeypatch.setattr(x_news, "search_x", search)
+
+    x_news.collect("AI agents", days=3)
+    clock.now += 60
+    x_news.collect("AI agents", days=7)
+    assert search.calls[-1] == (day(clock.now - 7 * 86400), x_news.FULL_SEARCH_RESULTS)
+    state = x_news.load_json(x_news.NEWS_CACHE_FILE)["queries"]["ai agents"]
+    assert state["covered_from"] == clock.now - 7 * 86400
+
+    # The 3-day window is now covered, so only the last fetch's gap is asked for
+    clock.now += x_news.NEWS_MIN_REFRESH_SECONDS
+    x_news.collect("AI agents", days=3)
+    assert search.calls[-1][1] == x_news.INCREMENTAL_SEARCH_RESULTS
+
+
+def test_old_posts_and_queries_are_pruned(monkeypatch, clock):
+    old = datetime.fromtimestamp(NOW - (x_news.NEWS_RETENTION_DAYS + 1) * 86400, timezone.utc).isoformat()
+    monkeypatch.setattr(x_news, "search_x", FakeSearch([
+        {"url": "https://x.com/a/status/1", "text": "An announcement from last month", "posted_at": old},
+        {"url": "https://x.com/a/status/2", "text": "OpenAI ships a new agents SDK"},
+    ]))
+    x_news.collect("old news", days=30)
+    assert list(x_news.load_json(x_news.NEWS_CACHE_FILE)["posts"]) == ["2"]
+
+    monkeypatch.setattr(x_news, "search_x", FakeSearch())
+    clock.now += (x_news.NEWS_RETENTION_DAYS + 1) * 86400
+    x_news.collect("AI agents")
+    cache = x_news.load_json(x_news.NEWS_CACHE_FILE)
+    assert list(cache["queries"]) == ["ai agents"]
+    assert cache["posts"] == {}
+
+
+def test_reposts_and_near_duplicates_are_folded():
+    announcement = ("OpenAI ships a new agents SDK with built-in tracing, guardrails and handoffs "
+                    "between agents, available today in Python and TypeScript")
+    store = {}
+    added = x_news.dedupe(store, [
+        post("https://x.com/openai/status/1", announcement, likes=100, views=5000),
+        post("https://twitter.com/openai/status/1?s=20", announcement, likes=120),
+        post("https://x.com/fan/status/2", "RT @openai: " + announcement, views=9000),
+        post("https://x.com/other/status/3", announcement + " 🚀 Docs", likes=7),
+        post("https://x.com/other/status/4", "Google DeepMind releases Gemini 3 with a larger context window"),
+    ])
+    assert added == ["1", "4"]
+    kept = store["1"]
+    assert kept["duplicate_urls"] == [
+        "https://twitter.com/openai/status/1?s=20", "https://x.com/fan/status/2", "https://x.com/other/status/3",
+    ]
+    assert (kept["likes"], kept["views"]) == (120, 9000)
@@ -0,0 +1,185 @@
+# frameworks_index.py
+"""
+Local retrieval index over the YouTube Title Frameworks database in Notion.
+
+Frameworks are fetched once and cached on disk (refreshed after FRAMEWORKS_TTL_SECONDS).
+Queries are ranked with BM25 over the framework text, example titles and OG title,
+weighted by the framework's outlier score.
+
+Refresh the cache manually with:
+    python -m title_generation_agent.frameworks_index [query]
+"""
+import math
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+
+from common import BM25Index, load_json, save_json
+from common.notion import get_notion_client
+from common.scheduler import PREFETCH_INTERVAL
+from common.singleflight import SingleFlight
+
+load_dotenv()
+
+# YouTube Title Frameworks Database ID
+DATABASE_ID = "2065bd4b16a680dfb365ed6f0e3fbd79"
+
+FRAMEWORKS_CACHE_FILE = "title_frameworks.json"
+
+# Frameworks change rarely; refetch from Notion at most this often
+FRAMEWORKS_TTL_SECONDS = int(os.getenv("TITLE_FRAMEWORKS_TTL", "21600"))
+
+# How strongly the outlier score boosts similarity (0 disables the boost)
+OUTLIER_WEIGHT = 0.5
+
+# Concurrent tool calls share one in-flight Notion fetch
+_flights = SingleFlight()
+
+
+def extract_text(prop):
+    """
+    Extract text from various Notion property types.
+    """
+    if not prop:
+        return ""
+
+    prop_type = prop.get("type", "")
+
+    if prop_type == "title" and prop.get("title"):
+        return " ".join([t["text"]["content"] for t in prop["title"] if t.get("text")])
+    elif prop_type == "rich_text" and prop.get("rich_text"):
+        return " ".join([t["text"]["content"] for t in prop["rich_text"] if t.get("text")])
+    elif prop_type == "select" and prop.get("select"):
+        return prop["select"]["name"]
+    elif prop_type == "multi_select" and prop.get("multi_select"):
+        return ", ".join([s["name"] for s in prop["multi_select"]])
+    elif prop_type == "url" and prop.get("url"):
+        return prop["url"]
+
+    return ""
+
+
+@_flights.wrap(lambda notion: ("frameworks", DATABASE_ID))
+def fetch_frameworks(notion):
+    """
+    Fetch ALL frameworks from the database (handles pagination) as flat records.
+    """
+    # Retrieve database to get data source ID (required for querying in newer API)
+    database = notion.databases.retrieve(DATABASE_ID)
+    data_sources = database.get("data_sources", [])
+    if not data_sources:
+        raise ValueError("Database has no data sources. Cannot query database.")
+
+    data_source_id = data_sources[0]["id"]
+
+    all_results = []
+    start_cursor = None
+    while True:
+        query_params = {"page_size": 100}
+        if start_cursor:
+            query_params["start_cursor"] = start_cursor
+
+        response = notion.data_sources.query(data_source_id, **query_params)
+        all_results.extend(response.get("results", []))
+
+        if not response.get("has_more", False):
+            break
+        start_cursor = response.get("next_cursor")
+
+    frameworks = []
+    for idx, page in enumerate(all_results, 1):
+        properties = page.get("properties", {})
+        title_framework = extract_text(properties.get("Title Framework"))
+        frameworks.append({
+            "id": page.get("id"),
+            "framework": title_framework or f"Framework #{idx}",
+            "example_1": extract_text(properties.get("Example Title 1")),
+            "example_2": extract_text(properties.get("Example Title 2")),
+            "og_title": extract_text(properties.get("OG title")),
+            "outlier": (properties.get("Outlier") or {}).get("number"),
+            "yt_link": extract_text(properties.get("YT video link")),
+        })
+    return frameworks
+
+
+def load_frameworks(notion, refresh=False):
+    """
+    Return cached frameworks, refetching from Notion when the cache is missing or expired.
+    """
+    cached = load_json(FRAMEWORKS_CACHE_FILE)
+    if cached and not refresh and time.time() - cached.get("fetched_at", 0) < FRAMEWORKS_TTL_SECONDS:
+        return cached["frameworks"]
+
+    frameworks = fetch_frameworks(notion)
+    save_json(FRAMEWORKS_CACHE_FILE, {
+        "fetched_at": time.time(),
+        "fetched_at_iso": datetime.now(timezone.utc).isoformat(),
+        "frameworks": frameworks,
+    })
+    return frameworks
+
+
+def prefetch():
+    """
+    Prefetch job: refresh the cached frameworks before they expire, so tool calls never wait on Notion.
+    """
+    notion = get_notion_client()
+    if not notion:
+        return
+    cached = load_json(FRAMEWORKS_CACHE_FILE)
+    # Refresh once the cache would expire before the next run
+    if cached and time.time() - cached.get("fetched_at", 0) < FRAMEWORKS_TTL_SECONDS - PREFETCH_INTERVAL:
+        return
+    load_frameworks(notion, refresh=True)
+
+
+def framework_document(framework):
+    """
+    Text that a framework is indexed by.
+    """
+    return " ".join(filter(None, [
+        framework["framework"], framework["example_1"], framework["example_2"], framework["og_title"],
+    ]))
+
+
+def rank_frameworks(frameworks, query, top_k):
+    """
+    Rank frameworks by BM25 similarity to the query, weighted by outlier score.
+    Falls back to the highest outlier frameworks if nothing matches lexically.
+
+    Returns:
+        list: (framework, score) pairs, best first
+    """
+    index = BM25Index([framework_document(f) for f in frameworks])
+    similarities = index.scores(query)
+    best = max(similarities, default=0) or 1.0
+
+    scored = []
+    for framework, similarity in zip(frameworks, similarities):
+        boost = 1 + OUTLIER_WEIGHT * math.log1p(max(framework.get("outlier") or 0, 0))
+        scored.append((framework, (similarity / best) * boost))
+
+    matches = sorted([pair for pair in scored if pair[1] > 0], key=lambda pair: pair[1], reverse=True)
+    if len(matches) < top_k:
+        seen = {id(f) for f, _ in matches}
+        rest = sorted([pair for pair in scored if id(pair[0]) not in seen],
+                      key=lambda pair: pair[0].get("outlier") or 0, reverse=True)
+        matches += [(f, 0.0) for f, _ in rest]
+    return matches[:top_k]
+
+
+if __name__ == "__main__":
+    notion = get_notion_client()
+    if not notion:
+        print("❌ Error: NOTION_API_KEY environment variable not found.")
+        sys.exit(1)
+
+    frameworks = load_frameworks(notion, refresh=True)
+    print(f"✅ Cached {len(frameworks)} title frameworks")
+    query = " ".join(sys.argv[1:])
+    if query:
+        for framework, score in rank_frameworks(frameworks, query, 10):
+            print(f"{score:.3f}  {framework['framework']}")
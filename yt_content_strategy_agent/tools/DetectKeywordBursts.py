@@ -0,0 +1,96 @@
+# DetectKeywordBursts.py
+import json
+from typing import Literal
+
+from agency_swarm.tools import BaseTool
+from pydantic import Field
+
+from common.readwise import list_documents
+from common.trends import TrendTracker
+from grok_news_agent.x_news import recent_posts
+
+
+class DetectKeywordBursts(BaseTool):
+    """
+    Surfaces emerging keywords: words and two-word phrases that suddenly appear in far more items than usual
+    across YouTube (titles and tags of the trending charts and search results fetched through the YouTube
+    Toolbox), X posts collected by GrokNewsAgent and Readwise Reader newsletters. Counts are kept locally
+    over time, so the result is instant and uses no API quota. Each burst reports its z-score against the
+    baseline, how many times more often it appears (lift), per-source counts and whether it is in an ongoing
+    Kleinberg burst. Use it to spot rising topics before reading the trending lists and news in full.
+    """
+
+    window_hours: int = Field(
+        default=24,
+        ge=6,
+        le=168,
+        description="Recent window whose keywords are compared with the baseline, in hours.",
+    )
+
+    baseline_days: int = Field(
+        default=14,
+        ge=1,
+        le=28,
+        description="Days before the window that define each keyword's usual frequency.",
+    )
+
+    method: Literal["zscore", "kleinberg"] = Field(
+        default="zscore",
+        description="'zscore' ranks by how far the window count exceeds the baseline rate; "
+                    "'kleinberg' lists only keywords in an ongoing burst, ranked by burst weight.",
+    )
+
+    min_count: int = Field(
+        default=3,
+        ge=1,
+        description="Minimum number of items in the window mentioning a keyword.",
+    )
+
+    max_results: int = Field(
+        default=20,
+        ge=1,
+        le=100,
+        description="Maximum number of keywords to return.",
+    )
+
+    def run(self):
+        """
+        Count the items collected since the last call, then rank the keyword bursts and return them as JSON.
+        """
+        tracker = TrendTracker()
+        days = self.baseline_days + -(-self.window_hours // 24)
+        try:
+            items = [
+                {"source": "x", "id": post["id"], "text": post["text"], "published_at": post["posted_at"] or post["first_seen"]}
+                for post in recent_posts(days)
+            ]
+            items += [
+                {
+                    "source": "readwise",
+                    "id": document["id"],
+                    "text": f"{document['title'] or ''} {document['summary'] or ''}",
+                    "published_at": document["published_at"],
+                }
+                for document in list_documents(days)
+            ]
+            added = tracker.observe(items)
+        except Exception as e:
+            return f"❌ Error collecting items: {str(e)}"
+
+        try:
+            result = tracker.bursts(self.window_hours, self.baseline_days, self.method,
+                                    min_count=self.min_count, max_results=self.max_results)
+        except Exception as e:
+            return f"❌ Error detecting bursts: {str(e)}"
+
+        if not result["window"]["items"]:
+            return ("📝 No items in the window yet. Fetch trending videos or search results through the YouTube "
+                    "Toolbox, or ask GrokNewsAgent and NewsletterAgent for news first.")
+        return json.dumps({"new_items": added, **result}, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    # Test the tool (run from the repository root: python -m yt_content_strategy_agent.tools.DetectKeywordBursts)
+    print("🧪 Testing DetectKeywordBursts:")
+    print("-" * 50)
+    print(DetectKeywordBursts().run())
@@ -0,0 +1,83 @@
+# MergeNewsStories.py
+import json
+
+from agency_swarm.tools import BaseTool
+from pydantic import Field
+
+from common.dedup import merge_stories
+from common.readwise import list_documents
+from grok_news_agent.x_news import recent_posts
+
+
+class MergeNewsStories(BaseTool):
+    """
+    Merges the recent news from both news sources into one deduplicated story list: X posts collected by
+    GrokNewsAgent's searches and Readwise Reader newsletters (later/email). Near-duplicate items (the same
+    release reported by several posts and newsletters) are clustered locally and returned as one canonical
+    story with per-source counts and all source URLs, most widely reported first.
+    Use it after consulting GrokNewsAgent and NewsletterAgent instead of reconciling their overlapping items yourself.
+    """
+
+    days: int = Field(
+        default=7,
+        ge=1,
+        le=14,
+        description="Include items published in the last this many days.",
+    )
+
+    max_stories: int = Field(
+        default=30,
+        ge=1,
+        le=200,
+        description="Maximum number of stories to return.",
+    )
+
+    def run(self):
+        """
+        Collect items from both sources, merge near-duplicates and return the stories as JSON.
+        """
+        try:
+            items = [
+                {
+                    "source": "x",
+                    "title": None,
+                    "summary": post["text"],
+                    "url": post["url"],
+                    "links": post["external_links"] + post["duplicate_urls"],
+                    "published_at": post["posted_at"],
+                    "score": post["views"] or post["likes"] or 0,
+                }
+                for post in recent_posts(self.days)
+            ]
+            documents = list_documents(self.days)
+            items += [
+                {
+                    "source": "readwise",
+                    "title": document["title"],
+                    "summary": document["summary"],
+                    "url": document["url"],
+                    "links": [document["source_url"]] if document["source_url"] else [],
+                    "published_at": document["published_at"],
+                }
+                for document in documents
+            ]
+        except Exception as e:
+            return f"❌ Error collecting news items: {str(e)}"
+
+        if not items:
+            return "📝 No news items found. Ask GrokNewsAgent to search X first, and check that READWISE_TOKEN is set."
+
+        stories = merge_stories(items)
+        return json.dumps({
+            "items": len(items),
+            "stories": len(stories),
+            "cross_source_stories": sum(len(story["source_counts"]) > 1 for story in stories),
+            "results": stories[:self.max_stories],
+        }, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    # Test the tool (run from the repository root: python -m yt_content_strategy_agent.tools.MergeNewsStories)
+    print("🧪 Testing MergeNewsStories:")
+    print("-" * 50)
+    print(MergeNewsStories(days=7).run())
@@ -6,6 +6,8 @@ from dotenv import load_dotenv
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api.proxies import WebshareProxyConfig
 
+from common.transcripts import fetch_transcript
+
 load_dotenv()
 
 class YouTubeTranscriptTool(BaseTool):
@@ -59,32 +61,29 @@ class YouTubeTranscriptTool(BaseTool):
                 api = YouTubeTranscriptApi()
                 print("No proxy credentials found. Using direct connection to YouTube API")
             
-            # Step 3: Fetch the transcript
+            # Step 3: Fetch the transcript (served from the local cache when prefetched or fetched before;
+            # otherwise rate limited and retried on transient failures, falling back to any available language)
             try:
-                # First try to get transcript in the specified language
-                fetched_transcript = api.fetch(video_id, languages=[self.language])
-            except Exception:
-                # If the specified language is not available, try to get any available transcript
-                try:
-                    fetched_transcript = api.fetch(video_id)
-                    print(f"Warning: Transcript in '{self.language}' not available. Using available transcript.")
-                except Exception as inner_e:
-                    return f"Error: Could not fetch transcript for video ID {video_id}. Error: {str(inner_e)}"
+                fetched_transcript = fetch_transcript(api, video_id, self.language)
+            except Exception as e:
+                return f"Error: Could not fetch transcript for video ID {video_id}. Error: {str(e)}"
+            if fetched_transcript["fallback"]:
+                print(f"Warning: Transcript in '{self.language}' not available. Using available transcript.")
             
             # Step 4: Format the transcript
-            transcript_snippets = fetched_transcript.snippets
+            transcript_snippets = fetched_transcript["snippets"]
             
             if self.include_timestamps:
                 formatted_transcript = "\n".join([
-                    f"[{self._format_timestamp(snippet.start)}] {snippet.text}"
-                    for snippet in transcript_snippets
+                    f"[{self._format_timestamp(start)}] {text}"
+                    for text, start, _ in transcript_snippets
                 ])
             else:
-                formatted_transcript = " ".join([snippet.text for snippet in transcript_snippets])
+                formatted_transcript = " ".join([text for text, _, _ in transcript_snippets])
             
             # Step 5: Return the formatted transcript with metadata
             result = f"YouTube Video Transcript (Video ID: {video_id})\n"
-            result += f"Language: {fetched_transcript.language_code}\n"
+            result += f"Language: {fetched_transcript['language_code']}\n"
             result += f"Total segments: {len(transcript_snippets)}\n"
             result += "=" * 50 + "\n\n"
             result += formatted_transcript
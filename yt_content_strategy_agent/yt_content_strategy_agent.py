@@ -9,6 +9,8 @@ import asyncio
 from dotenv import load_dotenv
 load_dotenv()
 
+from common.scheduler import prefetch_enabled
+
 path_to_stdio_mcp_server = os.path.join(os.path.dirname(__file__), "../py-mcp-youtube-toolbox")
 
 youtube_toolbox_server = MCPServerStdio(
@@ -22,7 +24,9 @@ youtube_toolbox_server = MCPServerStdio(
             "server.py"
         ],
         "env": {
-            "YOUTUBE_API_KEY": os.getenv("YOUTUBE_API_KEY", "your_youtube_api_key")
+            "YOUTUBE_API_KEY": os.getenv("YOUTUBE_API_KEY", "your_youtube_api_key"),
+            # Trending charts the toolbox keeps warm in the background (e.g. "US,KR")
+            "PREFETCH_REGIONS": os.getenv("PREFETCH_REGIONS", "") if prefetch_enabled() else "",
         }
     },
     cache_tools_list=True,